@@ -12,9 +12,20 @@ import fixate.config
 import ruamel.yaml
 from fixate.config import ASYNC_TASKS, RESOURCES
 from fixate.config.local_config import save_local_config
+from fixate.core import events
+from fixate.core.budget import TimeBudget
+from fixate.core.estimator import DurationEstimator
 from fixate.core.exceptions import SequenceAbort
+from fixate.core.limits import LimitsTable
+from fixate.core.ordering import FailureHistory
+from fixate.core.retry import RetryStatistics
+from fixate.core.sampling import SamplingHistory
+from fixate.core.selection import TestSelection
+from fixate.core.spc import SpcMonitor
 from fixate.core.ui import user_ok, user_input, user_serial
-from fixate.reporting import register_csv, unregister_csv
+from fixate.reporting import register_csv, unregister_csv, register_checkpoint, unregister_checkpoint, \
+    resume_sequence, register_profile, unregister_profile
+from fixate.sequencer import MultiSlotSequencer, Sequencer
 from fixate.ui_cmdline import register_cmd_line, unregister_cmd_line
 
 try:
@@ -55,8 +66,10 @@ parser.add_argument('-c', '--config',
                     default=[]
                     )
 parser.add_argument('-n', '--n_loops', '--n-loops',
-                    help="""Loop the test. Use -1 for infinite loops""",
-                    action="store")
+                    help="""Loop the test. Use -1 for infinite loops. The loaded tests, instruments and report are
+                    reused for every loop and the results are summarised after each loop""",
+                    type=int,
+                    default=1)
 parser.add_argument('-a', '--abort_force', '--abort-force',
                     help="""Forces an abort instead of prompting the user for retry abort fail""",
                     action="store_true")
@@ -85,7 +98,62 @@ parser.add_argument('--script-params',
                     action='append',
                     default=[])
 parser.add_argument('--serial_number', '--serial-number',
-                    help=("Serial number of the DUT."))
+                    help=("Serial number of the DUT. When running multiple slots, provide a comma separated list "
+                          "with a serial number for each slot"))
+parser.add_argument('-s', '--slots',
+                    help="""Number of DUTs in the fixture to test concurrently. Each slot runs its own copy of the
+                    sequence and produces its own report""",
+                    type=int,
+                    default=1)
+parser.add_argument('--select',
+                    help="""Only run the selected tests. Selectors are level paths eg. 2.3 or 2.3.*, test class names,
+                    or tags as tag:<name>. Test lists with no selected tests are not entered""",
+                    nargs='+',
+                    default=[])
+parser.add_argument('--exclude',
+                    help="""Don't run these tests. Uses the same selectors as --select""",
+                    nargs='+',
+                    default=[])
+parser.add_argument('--order_history', '--order-history',
+                    help="""Run the order independent tests most likely to fail first, based on the results in these
+                    csv reports or a json failure history saved by fixate.core.ordering.FailureHistory""",
+                    nargs='+',
+                    default=[])
+parser.add_argument('--retry_history', '--retry-history',
+                    help="""Json file of how often retries have made each test pass. Loaded at startup if it exists and
+                    saved when the program finishes. Used by retry policies with a min_recovery_rate""")
+parser.add_argument('--sampling_history', '--sampling-history',
+                    help="""Json file of the results of tests with a sampling policy on this station. Loaded at
+                    startup if it exists and saved when the program finishes""")
+parser.add_argument('--spc_history', '--spc-history',
+                    help="""Json file of the running statistics and Cpk of every check on this station. Loaded at
+                    startup if it exists and saved when the program finishes. SPC_Drift is sent when a check drifts
+                    towards its limits""")
+parser.add_argument('--duration_history', '--duration-history',
+                    help="""Estimate the time remaining from the test durations in these csv reports or json failure
+                    histories. The estimate is sent with the Sequence_Estimate message and shown on the progress bar""",
+                    nargs='+',
+                    default=[])
+parser.add_argument('--budget',
+                    help="""Time in seconds the sequence should complete within. Low priority tests are skipped when
+                    the remaining tests are not expected to fit. Durations are measured by earlier loops or estimated
+                    from --duration_history""",
+                    type=float)
+parser.add_argument('--plan',
+                    help="""Print the tests that would run for the --index variant and the expected duration of each
+                    from --duration_history, then exit. No tests are run""",
+                    action="store_true")
+parser.add_argument('--limits',
+                    help="""Yaml or csv file of the limits used by chk_limits, keyed by test level and check description.
+                    The version of the file is recorded in the report""")
+parser.add_argument('--defer_check_failures', '--defer-check-failures',
+                    help="""Run every test to the end when a check fails so that all of its failed checks are reported.
+                    The test fails once it is complete""",
+                    action="store_true")
+parser.add_argument('--resume',
+                    help="""Resume an interrupted sequence from the first incomplete test recorded in the checkpoint
+                    journal. Results are appended to the report of the interrupted sequence""",
+                    action="store_true")
 
 
 def load_test_suite(script_path, zip_path, zip_selector):
@@ -142,6 +210,8 @@ class FixateSupervisor:
         self.test_script_path = test_script_path
         self.args = args
         self.loop = asyncio.get_event_loop()
+        if self.args.slots > 1:
+            RESOURCES["SEQUENCER"] = MultiSlotSequencer(self.args.slots)
         self.sequencer = RESOURCES["SEQUENCER"]
 
         # Environment specific setup
@@ -225,6 +295,9 @@ class FixateWorker:
         asyncio.set_event_loop(self.loop)
         serial_number = None
         test_selector = None
+        spc = None
+        retry_stats = None
+        sampling_history = None
         self.start = True
 
         try:
@@ -236,7 +309,17 @@ class FixateWorker:
                 self.args.index = test_selector[1]
                 if test_selector == "ABORT_FORCE":
                     return
-            if self.args.serial_number is None:
+            if isinstance(self.sequencer, MultiSlotSequencer):
+                serial_numbers = self.args.serial_number.split(",") if self.args.serial_number else []
+                for slot in self.sequencer.slots[len(serial_numbers):]:
+                    serial_number = user_serial("Please enter serial number for slot {}".format(slot.slot))
+                    if serial_number == "ABORT_FORCE":
+                        return
+                    serial_numbers.append(serial_number[1])
+                for slot, slot_serial_number in zip(self.sequencer.slots, serial_numbers):
+                    slot.context_data["serial_number"] = slot_serial_number
+                    slot.context_data["slot"] = slot.slot
+            elif self.args.serial_number is None:
                 serial_number = user_serial("Please enter serial number")
                 self.sequencer.context_data["serial_number"] = serial_number[1]
                 if serial_number == "ABORT_FORCE":
@@ -254,7 +337,45 @@ class FixateWorker:
             # Load test suite
             test_suite = load_test_suite(self.args.path, self.args.zip, self.args.zip_selector)
             test_data = retrieve_test_data(test_suite, self.args.index)
+            if self.args.order_history:
+                history = load_failure_history(self.args.order_history)
+                for sequencer in getattr(self.sequencer, "slots", [self.sequencer]):
+                    sequencer.history = history
+            if self.args.retry_history:
+                retry_stats = RetryStatistics()
+                if os.path.exists(self.args.retry_history):
+                    retry_stats.add_json(self.args.retry_history)
+                for sequencer in getattr(self.sequencer, "slots", [self.sequencer]):
+                    sequencer.retry_stats = retry_stats
+            if self.args.sampling_history:
+                sampling_history = SamplingHistory()
+                if os.path.exists(self.args.sampling_history):
+                    sampling_history.add_json(self.args.sampling_history)
+                for sequencer in getattr(self.sequencer, "slots", [self.sequencer]):
+                    sequencer.sampling_history = sampling_history
+            if self.args.spc_history:
+                spc = SpcMonitor()
+                if os.path.exists(self.args.spc_history):
+                    spc.add_json(self.args.spc_history)
+            limits = LimitsTable.load(self.args.limits) if self.args.limits else None
+            estimator = None
+            if self.args.duration_history:
+                estimator = DurationEstimator(load_failure_history(self.args.duration_history))
+            for sequencer in getattr(self.sequencer, "slots", [self.sequencer]):
+                sequencer.estimator = estimator
+                sequencer.defer_check_failures = self.args.defer_check_failures
+                sequencer.limits = limits
+                if self.args.budget is not None:
+                    sequencer.budget = TimeBudget(self.args.budget, estimator)
+            if self.args.select or self.args.exclude:
+                for sequencer in getattr(self.sequencer, "slots", [self.sequencer]):
+                    sequencer.selection = TestSelection(self.args.select, self.args.exclude)
             self.sequencer.load(test_data)
+            # Async tests are awaited on the loop that is running while the sequence executes
+            for sequencer in getattr(self.sequencer, "slots", [self.sequencer]):
+                sequencer.loop = self.loop
+                if self.args.resume:
+                    resume_sequence(sequencer)
 
             if self.args.local_log:
                 try:
@@ -262,6 +383,12 @@ class FixateWorker:
                 except (AttributeError, KeyError):
                     pass
             register_csv()
+            register_checkpoint()
+            register_profile()
+            if spc is not None:
+                spc.register()
+            # Deliver reporting and display events off the test thread
+            events.start()
             self.sequencer.status = 'Running'
 
             def init_tasks():
@@ -276,7 +403,11 @@ class FixateWorker:
                 self.loop.call_later(1, self.loop.stop)  # Max 1 second to clean up tasks before aborting
 
             init_tasks()
-            self.loop.run_in_executor(None, self.sequencer.run_sequence).add_done_callback(finished_test_run)
+            if self.args.n_loops == 1:
+                run = self.sequencer.run_sequence
+            else:
+                run = partial(self.sequencer.run_loops, self.args.n_loops)
+            self.loop.run_in_executor(None, run).add_done_callback(finished_test_run)
 
             try:
                 self.loop.run_forever()
@@ -287,7 +418,19 @@ class FixateWorker:
             input(traceback.print_exc())
             raise
         finally:
+            events.stop()
             unregister_csv()
+            unregister_checkpoint()
+            unregister_profile()
+            if spc is not None:
+                spc.unregister()
+                if spc.checks:
+                    spc.save(self.args.spc_history)
+            # Shared by the slots of a MultiSlotSequencer, which has no histories of its own outside a slot thread
+            if retry_stats is not None and retry_stats.tests:
+                retry_stats.save(self.args.retry_history)
+            if sampling_history is not None and sampling_history.tests:
+                sampling_history.save(self.args.sampling_history)
             if serial_number == "ABORT_FORCE" or test_selector == "ABORT_FORCE":
                 return 11
             save_local_config()
@@ -302,6 +445,45 @@ class FixateWorker:
                 return 5
 
 
+def load_failure_history(paths):
+    """
+    :param paths: csv reports and json failure histories
+    :return: FailureHistory of all the results in paths
+    """
+    history = FailureHistory()
+    for path in paths:
+        if path.lower().endswith(".json"):
+            history.add_json(path)
+        else:
+            history.add_csv(path)
+    return history
+
+
+def print_plan(args):
+    """
+    Prints the tests that would run for the selected index with their expected durations. The test script is loaded but
+    no tests are run so no hardware is used
+    :return: exit code
+    """
+    test_suite = load_test_suite(args.path, args.zip, args.zip_selector)
+    sequencer = Sequencer()
+    if args.order_history:
+        sequencer.history = load_failure_history(args.order_history)
+    if args.select or args.exclude:
+        sequencer.selection = TestSelection(args.select, args.exclude)
+    if args.sampling_history and os.path.exists(args.sampling_history):
+        sequencer.sampling_history.add_json(args.sampling_history)
+    sequencer.load(retrieve_test_data(test_suite, args.index))
+    sequencer.sample_tests()
+    estimator = DurationEstimator(load_failure_history(args.duration_history))
+    rows = estimator.plan(sequencer.plan)
+    print("Test plan for index {}".format(args.index))
+    for level, test_name, seconds in rows:
+        print("{:<10} {:<60} {:>8.1f}s".format(level, str(test_name), seconds))
+    print("{} tests, expected cycle time {:.1f}s".format(sequencer.count_tests(), estimator.remaining(sequencer.plan)))
+    return 0
+
+
 def retrieve_test_data(test_suite, index):
     """
     Tries to retrieve test data from the loaded test_suite module
@@ -324,6 +506,8 @@ def retrieve_test_data(test_suite, index):
 def run_main_program(test_script_path=None):
     args, unknown = parser.parse_known_args()
     load_config(args.config)
+    if args.plan:
+        exit(print_plan(args))
     supervisor = FixateSupervisor(test_script_path, args)
     exit(supervisor.run_fixate())
 
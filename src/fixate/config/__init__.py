@@ -31,6 +31,10 @@ importer = None
 # Default settings for csv reporting. Can be configured via yaml either removing or overriding with plg_csv
 tpl_csv_path = ["{start_date_time}-{index}.csv"]
 tpl_time_stamp = "{0:%Y}{0:%m}{0:%d}-{0:%H}{0:%M}{0:%S}"
+# Journal of completed tests used to resume a sequence after a crash. Slots append -slot<n> to the file name
+checkpoint_path = "fixate-checkpoint.jsonl"
+# Timing profile of the last sequence. Slots append -slot<n> to the file name
+profile_path = "fixate-profile.json"
 
 plg_csv = {
     "import_name": "fixate.reporting.csv",
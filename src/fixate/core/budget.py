@@ -0,0 +1,75 @@
+"""
+Time budgeted sequences
+Skips low priority tests at runtime so that a sequence can finish within a fixed time. Before each test the sequencer
+compares the time left in the budget with the expected duration of the tests still to run. If they won't fit, tests
+are shed lowest TestClass.priority first, and the latest of equal priority first, until they do. Shed tests
+complete with the status BUDGET-SKIPPED. As the decision is made again before every test, a test shed early in the
+sequence can still run if the tests before it finish sooner than expected.
+
+Expected durations are the mean of the durations measured in this run of the program, eg. by earlier iterations in
+loop mode, or else those from a DurationEstimator. Tests with neither are not shed.
+>>>sequencer.budget = TimeBudget(120, DurationEstimator(history), keep_priority=10)
+"""
+import threading
+from fixate.core.statistics import RunningStatistics
+
+BUDGET_SKIPPED = "BUDGET-SKIPPED"
+
+
+class TimeBudget:
+    def __init__(self, seconds, estimator=None, keep_priority=None):
+        """
+        :param seconds: time the sequence should complete within
+        :param estimator: DurationEstimator for tests that haven't been measured. None to only use measured durations
+        :param keep_priority: tests with at least this priority are never shed. None to allow any test to be shed
+        """
+        self.seconds = seconds
+        self.estimator = estimator
+        self.keep_priority = keep_priority
+        self.measured = {}  # test_desc: RunningStatistics of the seconds the test took
+        self._lock = threading.Lock()  # The workers of a ConcurrentTestList record their tests at the same time
+
+    def record(self, test_desc, seconds):
+        with self._lock:
+            self.measured.setdefault(test_desc, RunningStatistics()).add(seconds)
+
+    def duration(self, node):
+        """
+        :param node: TestPlan node of a test
+        :return: The expected seconds of the test
+        """
+        if node["test_skip"] or node.get("sampled_out"):
+            return 0.0
+        measured = self.measured.get(node["test_name"])
+        if measured is not None:
+            return measured.mean
+        if self.estimator is not None:
+            return self.estimator.node_duration(node)
+        return 0.0
+
+    def sheddable(self, test):
+        return self.keep_priority is None or test.priority < self.keep_priority
+
+    def shed(self, elapsed, remaining, fixed=0.0):
+        """
+        :param elapsed: seconds since the sequence started
+        :param remaining: list of (test, plan node) of the tests still to run in execution order
+        :param fixed: expected seconds of remaining tests that can't be shed, eg. the tests of a LazyTestList
+        :return: list of the tests in remaining to skip
+        """
+        with self._lock:
+            durations = [self.duration(node) for _, node in remaining]
+        available = self.seconds - elapsed - fixed
+        expected = sum(durations)
+        if expected <= available:
+            return []
+        shed = []
+        candidates = sorted(range(len(remaining)), key=lambda index: (remaining[index][0].priority, -index))
+        for index in candidates:
+            if expected <= available:
+                break
+            test = remaining[index][0]
+            if durations[index] and self.sheddable(test):
+                shed.append(test)
+                expected -= durations[index]
+        return shed
@@ -1,32 +1,81 @@
 """
 This module is used to allow for tests to test values against criteria.
 It should implement necessary logging functions and report success or failure.
+
+The chk_array_* functions check every value of a sequence or numpy array against the limits and report a single
+check. The check passes only if every value passes. Its test_val is the worst case value, the one with the least
+margin to the limits, and the limits are those at the worst case index. Limits can be a single value or a sequence
+with a limit for each value. The comparison is vectorised if numpy is installed
+
+chk_sequential_in_range and chk_sequential_in_tolerance take a function that makes a measurement instead of a value.
+Measurements are made one at a time until the confidence interval of their mean is entirely inside or outside the
+limits, or max_samples is reached. The check's test_val is the mean and samples is the number of measurements made
+
+chk_limits and chk_array_limits take their limits from the limits table loaded into the sequencer. See
+fixate.core.limits
 """
+import array
+import math
 import fixate.config
+from fixate.core.exceptions import ParameterError, MissingLimit
+from fixate.core.statistics import RunningStatistics
 
 
 class CheckClass:
-    status = None
-    test_val = None
-    comparison = None
-    _min = None
-    _max = None
-    nominal = None
-    context = None
-    exception = None
-    tol = None
-    description = ''
-    test_index = ''
-
-    def __init__(self, **kwargs):
-        self.__dict__.update(**kwargs)
+    """
+    Record of a check sent to the listeners of the Check message. Slotted as thousands can be made by a test
+    """
+    __slots__ = ("target", "test_val", "_min", "_max", "nominal", "tol", "description", "count", "pass_count",
+                 "worst_index", "attachment", "samples", "status", "comparison", "context", "exception", "test_index")
+
+    def __init__(self, target=None, test_val=None, _min=None, _max=None, nominal=None, tol=None, description='',
+                 count=None, pass_count=None, worst_index=None, attachment=None, samples=None, status=None,
+                 comparison=None, context=None, exception=None, test_index=''):
+        """
+        :param target: function of the check that returns True if it passes
+        :param count: number of values checked by a chk_array_* function
+        :param attachment: bytes of the values as little endian float64 if attached to the check
+        :param samples: number of measurements averaged by a chk_sequential_* function
+        """
+        self.target = target
+        self.test_val = test_val
+        self._min = _min
+        self._max = _max
+        self.nominal = nominal
+        self.tol = tol
+        self.description = description
+        self.count = count
+        self.pass_count = pass_count
+        self.worst_index = worst_index
+        self.attachment = attachment
+        self.samples = samples
+        self.status = status
+        self.comparison = comparison
+        self.context = context
+        self.exception = exception
+        self.test_index = test_index
+
+    @property
+    def check_type(self):
+        """
+        :return: Name of the comparison made by the check, eg. "in range". Shared by every check with the target
+        """
+        try:
+            return _check_types[self.target]
+        except KeyError:
+            check_type = _check_types[self.target] = self.target.__name__[1:].replace('check_', '').replace('_', ' ')
+            return check_type
+
+
+_check_types = {}  # target: name of the comparison
+
+
+def _check(chk):
+    return fixate.config.RESOURCES["SEQUENCER"].check(chk, chk.target(chk))
 
 
 def _message_parse(target, **kwargs):
-    chk = CheckClass(**kwargs)
-    chk.target = target
-    result = target(chk)
-    return fixate.config.RESOURCES["SEQUENCER"].check(chk, result)
+    return _check(CheckClass(target, **kwargs))
 
 
 def _passes(chk):
@@ -34,7 +83,7 @@ def _passes(chk):
 
 
 def chk_passes(description=''):
-    return _message_parse(target=_passes, description=description)
+    return _check(CheckClass(_passes, description=description))
 
 
 def _fails(chk):
@@ -42,7 +91,7 @@ def _fails(chk):
 
 
 def chk_fails(description=''):
-    return _message_parse(target=_fails, description=description)
+    return _check(CheckClass(_fails, description=description))
 
 
 def _log_value(chk):
@@ -50,7 +99,7 @@ def _log_value(chk):
 
 
 def chk_log_value(test_val, description=''):
-    return _message_parse(test_val=test_val, target=_log_value, description=description)
+    return _check(CheckClass(_log_value, test_val, description=description))
 
 
 def _in_range(chk):
@@ -58,7 +107,7 @@ def _in_range(chk):
 
 
 def chk_in_range(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_in_range, _min=_min, _max=_max, description=description)
+    return _check(CheckClass(_in_range, test_val, _min=_min, _max=_max, description=description))
 
 
 def _in_tolerance(chk):
@@ -69,7 +118,7 @@ def _in_tolerance(chk):
 
 
 def chk_in_tolerance(test_val, nominal, tol, description=''):
-    return _message_parse(test_val=test_val, target=_in_tolerance, nominal=nominal, tol=tol, description=description)
+    return _check(CheckClass(_in_tolerance, test_val, nominal=nominal, tol=tol, description=description))
 
 
 def _in_range_equal(chk):
@@ -77,7 +126,7 @@ def _in_range_equal(chk):
 
 
 def chk_in_range_equal(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_in_range_equal, _min=_min, _max=_max, description=description)
+    return _check(CheckClass(_in_range_equal, test_val, _min=_min, _max=_max, description=description))
 
 
 def _in_range_equal_min(chk):
@@ -85,7 +134,7 @@ def _in_range_equal_min(chk):
 
 
 def chk_in_range_equal_min(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_in_range_equal_min, _min=_min, _max=_max, description=description)
+    return _check(CheckClass(_in_range_equal_min, test_val, _min=_min, _max=_max, description=description))
 
 
 def _in_range_equal_max(chk):
@@ -93,7 +142,7 @@ def _in_range_equal_max(chk):
 
 
 def chk_in_range_equal_max(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_in_range_equal_max, _min=_min, _max=_max, description=description)
+    return _check(CheckClass(_in_range_equal_max, test_val, _min=_min, _max=_max, description=description))
 
 
 def _outside_range(chk):
@@ -101,7 +150,7 @@ def _outside_range(chk):
 
 
 def chk_outside_range(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_outside_range, _min=_min, _max=_max, description=description)
+    return _check(CheckClass(_outside_range, test_val, _min=_min, _max=_max, description=description))
 
 
 def _outside_range_equal(chk):
@@ -109,7 +158,7 @@ def _outside_range_equal(chk):
 
 
 def chk_outside_range_equal(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_outside_range_equal, _min=_min, _max=_max, description=description)
+    return _check(CheckClass(_outside_range_equal, test_val, _min=_min, _max=_max, description=description))
 
 
 def _outside_range_equal_min(chk):
@@ -117,8 +166,7 @@ def _outside_range_equal_min(chk):
 
 
 def chk_outside_range_equal_min(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_outside_range_equal_min, _min=_min, _max=_max,
-                   description=description)
+    return _check(CheckClass(_outside_range_equal_min, test_val, _min=_min, _max=_max, description=description))
 
 
 def _outside_range_equal_max(chk):
@@ -126,8 +174,7 @@ def _outside_range_equal_max(chk):
 
 
 def chk_outside_range_equal_max(test_val, _min, _max, description=''):
-    return _message_parse(test_val=test_val, target=_outside_range_equal_max, _min=_min, _max=_max,
-                   description=description)
+    return _check(CheckClass(_outside_range_equal_max, test_val, _min=_min, _max=_max, description=description))
 
 
 def _smaller_or_equal(chk):
@@ -135,7 +182,7 @@ def _smaller_or_equal(chk):
 
 
 def chk_smaller_or_equal(test_val, nominal, description=''):
-    return _message_parse(test_val=test_val, target=_smaller_or_equal, nominal=nominal, description=description)
+    return _check(CheckClass(_smaller_or_equal, test_val, nominal=nominal, description=description))
 
 
 def _greater_or_equal(chk):
@@ -143,7 +190,7 @@ def _greater_or_equal(chk):
 
 
 def chk_greater_or_equal(test_val, nominal, description=''):
-    return _message_parse(test_val=test_val, target=_greater_or_equal, nominal=nominal, description=description)
+    return _check(CheckClass(_greater_or_equal, test_val, nominal=nominal, description=description))
 
 
 def _smaller(chk):
@@ -151,7 +198,7 @@ def _smaller(chk):
 
 
 def chk_smaller(test_val, nominal, description=''):
-    return _message_parse(test_val=test_val, target=_smaller, nominal=nominal, description=description)
+    return _check(CheckClass(_smaller, test_val, nominal=nominal, description=description))
 
 
 def _greater(chk):
@@ -159,7 +206,7 @@ def _greater(chk):
 
 
 def chk_greater(test_val, nominal, description=''):
-    return _message_parse(test_val=test_val, target=_greater, nominal=nominal, description=description)
+    return _check(CheckClass(_greater, test_val, nominal=nominal, description=description))
 
 
 def _equal(chk):
@@ -167,7 +214,7 @@ def _equal(chk):
 
 
 def chk_equal(test_val, nominal, description=''):
-    return _message_parse(test_val=test_val, target=_equal, nominal=nominal, description=description)
+    return _check(CheckClass(_equal, test_val, nominal=nominal, description=description))
 
 
 def _true(chk):
@@ -175,7 +222,7 @@ def _true(chk):
 
 
 def chk_true(test_val, description=''):
-    return _message_parse(test_val=test_val, target=_true, description=description)
+    return _check(CheckClass(_true, test_val, description=description))
 
 
 def _false(chk):
@@ -183,7 +230,7 @@ def _false(chk):
 
 
 def chk_false(test_val, description=''):
-    return _message_parse(test_val=test_val, target=_false, description=description)
+    return _check(CheckClass(_false, test_val, description=description))
 
 
 def _in_tolerance_equal(chk):
@@ -191,4 +238,263 @@ def _in_tolerance_equal(chk):
 
 
 def chk_in_tolerance_equal(test_val, nominal, tol, description=''):
-    return _message_parse(test_val=test_val, target=_in_tolerance_equal, nominal=nominal, tol=tol, description=description)
\ No newline at end of file
+    return _check(CheckClass(_in_tolerance_equal, test_val, nominal=nominal, tol=tol, description=description))
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _array_margins(test_vals, lower, upper, inclusive):
+    """
+    :param lower: lower limit, a sequence of limits for each value or None
+    :param upper: upper limit, a sequence of limits for each value or None
+    :param inclusive: True if values equal to a limit pass
+    :return: (values, number of passing values, index of the worst case value)
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.asarray(test_vals, dtype=float).ravel()
+        margin = numpy.full(values.shape, numpy.inf)
+        passed = numpy.ones(values.shape, dtype=bool)
+        if lower is not None:
+            lower = numpy.broadcast_to(numpy.asarray(lower, dtype=float), values.shape)
+            margin = numpy.minimum(margin, values - lower)
+            passed &= values >= lower if inclusive else values > lower
+        if upper is not None:
+            upper = numpy.broadcast_to(numpy.asarray(upper, dtype=float), values.shape)
+            margin = numpy.minimum(margin, upper - values)
+            passed &= values <= upper if inclusive else values < upper
+        worst = int(numpy.argmin(margin)) if values.size else None
+        return values, int(numpy.count_nonzero(passed)), worst
+    values = [float(value) for value in test_vals]
+    pass_count, worst, worst_margin = 0, None, None
+    for index, value in enumerate(values):
+        margin = float("inf")
+        if lower is not None:
+            margin = min(margin, value - _limit(lower, index))
+        if upper is not None:
+            margin = min(margin, _limit(upper, index) - value)
+        if value != value:
+            margin = float("-inf")  # nan fails so it is the worst case
+        if margin > 0 or (inclusive and margin == 0):
+            pass_count += 1
+        if worst is None or margin < worst_margin:
+            worst, worst_margin = index, margin
+    return values, pass_count, worst
+
+
+def _limit(limit, index):
+    """
+    :return: The limit for the value at index of a single limit or a sequence of limits
+    """
+    if limit is None or isinstance(limit, (int, float)):
+        return limit
+    try:
+        return float(limit[index])
+    except (TypeError, IndexError):
+        return float(limit)  # numpy scalars
+
+
+def _array_parse(target, test_vals, lower, upper, inclusive, description, attach, **kwargs):
+    """
+    Checks every value in test_vals and reports one aggregated check
+    :param kwargs: limits reported with the check. Sequences of limits are reported at the worst case index
+    """
+    values, pass_count, worst = _array_margins(test_vals, lower, upper, inclusive)
+    if worst is None:
+        raise ValueError("No values to check for {}".format(description))
+    limits = {name: _limit(limit, worst) for name, limit in kwargs.items()}
+    attachment = None
+    if attach:
+        numpy = _numpy()
+        if numpy is not None:
+            attachment = numpy.asarray(values, dtype="<f8").tobytes()
+        else:
+            data = array.array("d", values)
+            if array.array("H", [1]).tobytes()[0] != 1:
+                data.byteswap()  # Store as little endian
+            attachment = data.tobytes()
+    return _check(CheckClass(target, float(values[worst]), description=description, count=len(values),
+                             pass_count=pass_count, worst_index=worst, attachment=attachment, **limits))
+
+
+def _array_passes(chk):
+    return chk.pass_count == chk.count
+
+
+def _array_in_range(chk):
+    return _array_passes(chk)
+
+
+def chk_array_in_range(test_vals, _min, _max, description='', attach=False):
+    """
+    Checks that _min < value < _max for every value in test_vals
+    :param attach: attach the values to the check so that reports can store them
+    """
+    return _array_parse(_array_in_range, test_vals, _min, _max, False, description, attach, _min=_min, _max=_max)
+
+
+def _array_in_range_equal(chk):
+    return _array_passes(chk)
+
+
+def chk_array_in_range_equal(test_vals, _min, _max, description='', attach=False):
+    """
+    Checks that _min <= value <= _max for every value in test_vals
+    """
+    return _array_parse(_array_in_range_equal, test_vals, _min, _max, True, description, attach, _min=_min, _max=_max)
+
+
+def _array_in_tolerance(chk):
+    return _array_passes(chk)
+
+
+def chk_array_in_tolerance(test_vals, nominal, tol, description='', attach=False):
+    """
+    Checks that every value in test_vals is within tol percent of nominal, including the limits
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        nominal_arr, tol_arr = numpy.asarray(nominal, dtype=float), numpy.asarray(tol, dtype=float)
+        first, second = nominal_arr * (1 - tol_arr / 100), nominal_arr * (1 + tol_arr / 100)
+        lower, upper = numpy.minimum(first, second), numpy.maximum(first, second)
+    else:
+        test_vals = list(test_vals)
+        count = len(test_vals)
+        first = [_limit(nominal, i) * (1 - _limit(tol, i) / 100) for i in range(count)]
+        second = [_limit(nominal, i) * (1 + _limit(tol, i) / 100) for i in range(count)]
+        lower, upper = list(map(min, first, second)), list(map(max, first, second))
+    return _array_parse(_array_in_tolerance, test_vals, lower, upper, True, description, attach, nominal=nominal,
+                        tol=tol)
+
+
+def _array_smaller_or_equal(chk):
+    return _array_passes(chk)
+
+
+def chk_array_smaller_or_equal(test_vals, nominal, description='', attach=False):
+    """
+    Checks that value <= nominal for every value in test_vals
+    """
+    return _array_parse(_array_smaller_or_equal, test_vals, None, nominal, True, description, attach,
+                        nominal=nominal)
+
+
+def _array_greater_or_equal(chk):
+    return _array_passes(chk)
+
+
+def chk_array_greater_or_equal(test_vals, nominal, description='', attach=False):
+    """
+    Checks that value >= nominal for every value in test_vals
+    """
+    return _array_parse(_array_greater_or_equal, test_vals, nominal, None, True, description, attach,
+                        nominal=nominal)
+
+
+# Two sided critical values of Student's t distribution by confidence, for 1 to 30 degrees of freedom
+T_CRITICAL = {
+    0.95: (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228, 2.201, 2.179, 2.160, 2.145, 2.131,
+           2.120, 2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042),
+    0.99: (63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169, 3.106, 3.055, 3.012, 2.977, 2.947,
+           2.921, 2.898, 2.878, 2.861, 2.845, 2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750),
+    0.999: (636.619, 31.599, 12.924, 8.610, 6.869, 5.959, 5.408, 5.041, 4.781, 4.587, 4.437, 4.318, 4.221, 4.140,
+            4.073, 4.015, 3.965, 3.922, 3.883, 3.850, 3.819, 3.792, 3.768, 3.745, 3.725, 3.707, 3.690, 3.674, 3.659,
+            3.646),
+}
+
+
+def _t_critical(confidence, degrees_of_freedom):
+    """
+    :return: The two sided critical value of t. Above 30 degrees of freedom the value for 30 is used, which is slightly
+    wider than the true interval
+    """
+    values = T_CRITICAL[confidence]
+    return values[min(degrees_of_freedom, len(values)) - 1]
+
+
+def _sequential_mean(measure, _min, _max, max_samples, min_samples, confidence):
+    """
+    Measures until the confidence interval of the mean is entirely inside or outside the limits. The interval uses
+    Student's t for n - 1 degrees of freedom because the standard deviation is estimated from the few samples made
+    :return: (mean, number of measurements)
+    """
+    if min_samples < 2 or max_samples < min_samples:
+        raise ParameterError("Need 2 <= min_samples <= max_samples")
+    if confidence not in T_CRITICAL:
+        raise ParameterError("confidence must be one of {}".format(sorted(T_CRITICAL)))
+    stats = RunningStatistics()
+    while stats.count < max_samples:
+        stats.add(float(measure()))
+        if stats.count >= min_samples:
+            half_width = _t_critical(confidence, stats.count - 1) * stats.std_dev / math.sqrt(stats.count)
+            lower, upper = stats.mean - half_width, stats.mean + half_width
+            if _min < lower and upper < _max:
+                break  # Certain to pass
+            if upper < _min or lower > _max:
+                break  # Certain to fail
+    return stats.mean, stats.count
+
+
+def _sequential_in_range(chk):
+    return chk._min < chk.test_val < chk._max
+
+
+def chk_sequential_in_range(measure, _min, _max, description='', max_samples=20, min_samples=2, confidence=0.99):
+    """
+    Checks that _min < mean < _max for the mean of measurements made until the result is certain
+    :param measure: function that makes a measurement and returns its value
+    :param max_samples: most measurements to make. If the result is still uncertain the mean of these is checked
+    :param min_samples: measurements to make before the result can be decided
+    :param confidence: confidence of the interval of the mean, one of T_CRITICAL
+    """
+    mean, samples = _sequential_mean(measure, _min, _max, max_samples, min_samples, confidence)
+    return _check(CheckClass(_sequential_in_range, mean, _min=_min, _max=_max, description=description,
+                             samples=samples))
+
+
+def _sequential_in_tolerance(chk):
+    return _in_tolerance(chk)
+
+
+def chk_sequential_in_tolerance(measure, nominal, tol, description='', max_samples=20, min_samples=2, confidence=0.99):
+    """
+    Checks that the mean of measurements made until the result is certain is within tol percent of nominal
+    """
+    first, second = nominal * (1 - tol / 100), nominal * (1 + tol / 100)
+    mean, samples = _sequential_mean(measure, min(first, second), max(first, second), max_samples, min_samples, confidence)
+    return _check(CheckClass(_sequential_in_tolerance, mean, nominal=nominal, tol=tol, description=description,
+                             samples=samples))
+
+
+def _table_limit(description):
+    sequencer = fixate.config.RESOURCES["SEQUENCER"]
+    if sequencer.limits is None:
+        raise MissingLimit("No limits table is loaded for check {!r}".format(description))
+    # Tests keep the level they have in the test script when they are pruned or reordered at load
+    return sequencer.limits.lookup(sequencer.levels(), description)
+
+
+def chk_limits(test_val, description):
+    """
+    Checks test_val with the check and limits for description in the active test from the limits table
+    """
+    limit = _table_limit(description)
+    return globals()["chk_" + limit.check](test_val, *limit.args, description=description)
+
+
+def chk_array_limits(test_vals, description, attach=False):
+    """
+    Checks every value in test_vals with the check and limits for description in the active test from the limits
+    table. Only the checks with a chk_array_ function can be used
+    """
+    limit = _table_limit(description)
+    check = globals().get("chk_array_" + limit.check)
+    if check is None:
+        raise ParameterError("Check {} of {!r} can't be used for arrays".format(limit.check, description))
+    return check(test_vals, *limit.args, description=description, attach=attach)
@@ -1,5 +1,7 @@
 import re
 import sys
+import copy
+import operator
 import threading
 import inspect
 import ctypes
@@ -13,13 +15,14 @@ def _async_raise(tid, exctype):
     """raises the exception, performs cleanup if needed"""
     if not inspect.isclass(exctype):
         exctype = type(exctype)
-    res = ctypes.pythonapi.PyThreadState_SetAsyncExc(tid, ctypes.py_object(exctype))
+    # Thread ids are unsigned long and would be truncated if passed as a plain int
+    res = ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(tid), ctypes.py_object(exctype))
     if res == 0:
         raise ValueError("invalid thread id")
     elif res != 1:
         # """if it returns a number greater than one, you're in trouble,
         # and you should call it again with exc=NULL to revert the effect"""
-        ctypes.pythonapi.PyThreadState_SetAsyncExc(tid, None)
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(tid), None)
         raise SystemError("PyThreadState_SetAsyncExc failed")
 
 
@@ -252,6 +255,56 @@ class ExcThread(threading.Thread):
             pass  # System could not find thread. Most likely already killed
 
 
+class Watchdog:
+    """
+    Raises exctype in a thread if it has not been cancelled within timeout seconds.
+    Uses the same asynchronous exception mechanism as ExcThread.stop so the exception is only raised once the thread is
+    executing python code. ie. A blocking call must return first
+    >>>watchdog = Watchdog(10, TestTimeout).start()
+    >>>try:
+    >>>    long_running_function()
+    >>>finally:
+    >>>    watchdog.cancel()
+    """
+
+    def __init__(self, timeout, exctype, thread_id=None):
+        """
+        :param timeout: seconds before exctype is raised
+        :param exctype: exception class to raise
+        :param thread_id: ident of the thread to raise the exception in. Defaults to the calling thread
+        """
+        self.timeout = timeout
+        self.exctype = exctype
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.expired = False
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _watch(self):
+        if self._cancelled.wait(self.timeout):
+            return
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self.expired = True
+            _async_raise(self.thread_id, self.exctype)
+
+    def cancel(self):
+        """
+        Stops the watchdog. Once this returns the exception will not be raised.
+        If the watchdog expired but the exception has not yet been delivered it is discarded
+        """
+        with self._lock:
+            self._cancelled.set()
+            if self.expired:
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self.thread_id), None)
+
+
 def deprecated(func):
     def inner(*args, **kwargs):
         logger.warning("Function is deprecated. Please consider updating api calls")
@@ -261,6 +314,14 @@ def deprecated(func):
 
 
 class TestList:
+    SCOPE_TEST = 1  # set_up and tear_down are called around each test contained within
+    SCOPE_LIST = 2  # set_up is called once when the list is entered and tear_down once when it is exited
+
+    scope = SCOPE_TEST
+    timeout = None  # Seconds any one test in this list may run for before it is stopped
+    tags = []  # Names the list can be selected by. See fixate.core.selection
+    numbers = None  # Original positions of the items, from 1, if the list has been pruned. Levels use these
+
     def __init__(self, seq=None):
         self.tests = []
         if seq is None:
@@ -306,12 +367,15 @@ class TestList:
 
     def set_up(self):
         """
-        This is called at the beginning of each test contained within
+        This is called at the beginning of each test contained within.
+        If scope is SCOPE_LIST it is instead called once when the list is entered, after enter. If it raises an
+        exception tear_down is called straight away, and if it isn't retried the tests of the list are errored
         """
 
     def tear_down(self):
         """
-        This is called at the conclusion of each test contained within
+        This is called at the conclusion of each test contained within.
+        If scope is SCOPE_LIST it is instead called once when the list is exited, before exit
         """
 
     def enter(self):
@@ -325,6 +389,99 @@ class TestList:
         """
 
 
+class ConcurrentTestList(TestList):
+    # A test list whose tests are run concurrently on a thread pool of max_workers threads.
+    # Two tests are only run at the same time if the resources they declare in TestClass.resources don't collide.
+    # Results are reported in the order of the tests in the list.
+    # Can only contain tests. The set_up and tear_down of the enclosing test lists are called around each test and
+    # must be safe to run concurrently.
+    # Not documented with a docstring as TestList uses the docstring as the test description
+    max_workers = 4
+
+    def __init__(self, seq=None, max_workers=None):
+        super().__init__(seq)
+        if max_workers is not None:
+            self.max_workers = max_workers
+
+
+class LazyTestList(TestList):
+    # A test list whose tests are created by a generator as the sequencer reaches them instead of all up front.
+    # factory is a callable returning an iterable of tests, eg. a generator function. A generator object can be used
+    # directly but then the list can't be copied, eg. for a MultiSlotSequencer.
+    # length_hint is the number of tests the factory is expected to produce. It is used for progress and the test tree
+    # so the tests don't have to be created to count them.
+    # Tests are released once the sequencer moves past them, so only the active test is kept in memory.
+    # Not documented with a docstring as TestList uses the docstring as the test description
+
+    def __init__(self, factory, length_hint=None):
+        super().__init__()
+        self.factory = factory
+        if length_hint is None and not callable(factory):
+            length_hint = operator.length_hint(factory)
+        self.length_hint = length_hint
+        self._reset()
+
+    def _reset(self):
+        self.tests = []
+        self._iterator = None
+        self._offset = 0  # Index of self.tests[0] in the whole list
+        self._exhausted = False
+
+    def enter(self):
+        """
+        Creates the tests again from the start of the factory if the list has been run before, eg. by run_loops
+        """
+        if self._iterator is not None:
+            if not callable(self.factory):
+                raise TypeError("A LazyTestList can only be run again if it was created from a factory function")
+            self._reset()
+
+    def materialise(self, index):
+        """
+        Creates the tests up to and including index. Tests before index are released
+        :return: True if the list has a test at index, False if the factory ran out of tests first
+        """
+        if index < self._offset:
+            raise IndexError("Test {} of {} has already been released".format(index, self.test_desc))
+        if self._iterator is None:
+            self._iterator = iter(self.factory() if callable(self.factory) else self.factory)
+        while not self._exhausted and self._offset + len(self.tests) <= index:
+            try:
+                self.tests.append(next(self._iterator))
+            except StopIteration:
+                self._exhausted = True
+        released = min(index - self._offset, len(self.tests))
+        del self.tests[:released]
+        self._offset += released
+        return index < self._offset + len(self.tests)
+
+    def __getitem__(self, item):
+        if not self.materialise(item):
+            raise IndexError("{} has no test {}".format(self.test_desc, item))
+        return self.tests[item - self._offset]
+
+    def __setitem__(self, key, value):
+        if not self.materialise(key):
+            raise IndexError("{} has no test {}".format(self.test_desc, key))
+        self.tests[key - self._offset] = value
+
+    def __len__(self):
+        """
+        :return: The number of tests once the factory is exhausted, otherwise the length hint
+        """
+        if self._exhausted:
+            return self._offset + len(self.tests)
+        return max(self.length_hint or 0, self._offset + len(self.tests))
+
+    def __deepcopy__(self, memo):
+        if not callable(self.factory):
+            raise TypeError("A LazyTestList can only be copied if it was created from a factory function")
+        new = copy.copy(self)
+        memo[id(self)] = new
+        new._reset()
+        return new
+
+
 class TestClass:
     """
     This class is an abstract base class to implement tests
@@ -339,10 +496,19 @@ class TestClass:
     attempts = 1
     tests = []
     retry_type = RT_PROMPT
+    retry_policy = None  # RetryPolicy deciding if and when a failed attempt is retried. See fixate.core.retry
+    sampling_policy = None  # SamplingPolicy deciding which units the test runs on. See fixate.core.sampling
+    priority = 0  # Tests with a lower priority are skipped first to fit a time budget. See fixate.core.budget
+    memoise = None  # Memoise to reuse the checks of the last passing run instead of running. See fixate.core.memo
+    defer_check_failures = False  # Run the whole test before failing it, reporting every failed check
     retry_exceptions = [BaseException]  # Depreciated
     skip_exceptions = []
     abort_exceptions = [KeyboardInterrupt, AttributeError, NameError]
     skip_on_fail = False
+    resources = []  # Resources used by the test eg. driver names, VirtualMux instances or jig pins
+    timeout = None  # Seconds the set_up and test may run for before the test is stopped with a TIMEOUT status
+    order_independent = False  # The test can be run in any order relative to other order independent tests
+    tags = []  # Names the test can be selected by. See fixate.core.selection
 
     def __init__(self, skip=False):
         self.skip = skip
@@ -360,11 +526,13 @@ class TestClass:
     def set_up(self):
         """
         Optionally override this code that is executed before the test method is called
+        May be defined with async def
         """
 
     def tear_down(self):
         """
         Optionally override this code that is always executed last
+        May be defined with async def
         """
 
     def test(self):
@@ -372,4 +540,7 @@ class TestClass:
         This method should be overridden with the test code
         This is the test sequence code
         You can explicitly call self.result() to add a test result to the class
+        May be defined with async def to await several instruments at once. eg.
+        >>>async def test(self):
+        >>>    v, i = await asyncio.gather(read_voltage(), read_current())
         """
@@ -0,0 +1,78 @@
+"""
+Sequence duration estimates
+Predicts the time a sequence will take from the durations of the tests in previous runs. The durations come from a
+FailureHistory built from csv reports or a saved json history. As a test's recorded duration runs from its start to
+its end, the time spent on retries is included in its mean.
+Skipped and sampled out tests are estimated to take no time. Tests that have no history and the tests of a
+LazyTestList take default_duration.
+>>>estimator = DurationEstimator(FailureHistory.from_csv(glob.glob("reports/*.csv")))
+>>>estimator.remaining(sequencer.plan, sequencer.tests_completed())
+"""
+
+
+class DurationEstimator:
+    def __init__(self, history, default_duration=None):
+        """
+        :param history: FailureHistory with the durations of previous runs
+        :param default_duration: seconds for a test without history. If None, the mean duration of the tests in the
+        history is used
+        """
+        self.history = history
+        if default_duration is None:
+            durations = [history.mean_duration(test_desc) for test_desc in history.tests]
+            durations = [duration for duration in durations if duration is not None]
+            default_duration = sum(durations) / len(durations) if durations else 0.0
+        self.default_duration = default_duration
+
+    def test_duration(self, test_desc):
+        """
+        :return: The expected seconds of a test with the description test_desc
+        """
+        duration = self.history.mean_duration(test_desc)
+        return self.default_duration if duration is None else duration
+
+    def node_duration(self, node):
+        """
+        :param node: a node of a TestPlan
+        :return: The expected seconds of the tests in the node, not including the tests of its children
+        """
+        if node["test_type"] == "test":
+            if node["test_skip"] or node.get("sampled_out"):
+                return 0.0
+            return self.test_duration(node["test_name"])
+        if node.get("lazy"):
+            return node["length"] * self.default_duration
+        return 0.0
+
+    def remaining(self, plan, completed=0):
+        """
+        :param plan: TestPlan of the loaded tests
+        :param completed: number of tests completed, as returned by Sequencer.tests_completed
+        :return: The expected seconds to run the tests after the first completed tests
+        """
+        remaining = self.lazy_remaining(plan, completed)
+        for node in plan.nodes:
+            if node["test_type"] == "test" and node["ordinal"] > completed:
+                remaining += self.node_duration(node)
+        return remaining
+
+    def lazy_remaining(self, plan, completed=0):
+        """
+        :return: The expected seconds to run the tests of the LazyTestLists in plan after the first completed tests
+        """
+        remaining = 0.0
+        for node in plan.nodes:
+            if node.get("lazy"):
+                # The ordinal of a test list is the number of tests before it
+                left = min(node["length"], node["ordinal"] + node["length"] - completed)
+                if left > 0:
+                    remaining += left * self.default_duration
+        return remaining
+
+    def plan(self, plan):
+        """
+        :param plan: TestPlan of the loaded tests
+        :return: list of [level, test name, expected seconds] for each test and lazy test list in execution order
+        """
+        return [[node["level"], node["test_name"], self.node_duration(node)]
+                for node in plan.nodes if node["test_type"] == "test" or node.get("lazy")]
@@ -0,0 +1,154 @@
+"""
+Event dispatch
+Sequencer events are sent through publish instead of pub.sendMessage. While the dispatcher is running, events are
+queued and delivered to the pubsub listeners in batches on a dispatch thread so that reporting and display don't hold
+up the test thread. Events are always delivered in the order they were published.
+
+Topics in SYNC_TOPICS are delivered immediately in the publishing thread, after the events queued before them.
+These are topics whose listeners reply to the sender (eg. the UI request topics) or read live sequencer state (eg.
+Test_Complete reads the check counters). Use register_sync_topic for a listener that needs synchronous delivery.
+
+Listeners of queued events are called some time after the event was published. A listener that time stamps an
+event, eg. a report of how long each test took, should use published_time instead of the current time.
+
+If the dispatcher is not running, publish is a synchronous pub.sendMessage
+>>>start()
+>>>publish("Check", passes=True, chk=chk, chk_cnt=1, context="1")
+>>>stop()  # Delivers any queued events
+"""
+import logging
+import threading
+from queue import Queue, Empty
+from time import perf_counter
+from pubsub import pub
+from fixate.config import RESOURCES
+
+logger = logging.getLogger(__name__)
+
+SYNC_TOPICS = {"UI_req", "UI_req_input", "UI_req_choices", "UI_action", "UI_image", "UI_display",
+               "UI_display_important", "Test_Complete", "Sequence_Update", "Sequence_Start", "Sequence_Complete",
+               "Sequence_Abort"}
+MAX_BATCH = 100  # Events delivered per wake up of the dispatch thread
+
+
+class EventDispatcher:
+    def __init__(self):
+        self.queue = Queue()
+        self.thread = None
+        self._published = None  # perf_counter time the event being delivered on the dispatch thread was published
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._dispatch, name="EventDispatcher", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        Delivers the queued events and stops the dispatch thread
+        """
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def publish(self, topic, **kwargs):
+        if self.thread is None or threading.current_thread() is self.thread:
+            # Events published by listeners are delivered with the event that caused them
+            pub.sendMessage(topic, **kwargs)
+        elif topic in SYNC_TOPICS:
+            self.flush()
+            pub.sendMessage(topic, **kwargs)
+        else:
+            self.queue.put((topic, kwargs, _capture_slot(), perf_counter()))
+
+    def published_time(self):
+        """
+        :return: The perf_counter time the event being delivered to the calling listener was published
+        """
+        if threading.current_thread() is self.thread and self._published is not None:
+            return self._published
+        return perf_counter()  # Delivered as it was published
+
+    def flush(self):
+        """
+        Blocks until the events queued before the call have been delivered
+        """
+        if self.thread is not None and threading.current_thread() is not self.thread:
+            delivered = threading.Event()
+            self.queue.put(delivered)
+            delivered.wait()
+
+    def _dispatch(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < MAX_BATCH:
+                    batch.append(self.queue.get_nowait())
+            except Empty:
+                pass
+            for event in batch:
+                if event is None:
+                    return
+                elif isinstance(event, threading.Event):
+                    event.set()  # Flush marker
+                else:
+                    self._deliver(*event)
+
+    def _deliver(self, topic, kwargs, slot, published):
+        sequencer = RESOURCES.get("SEQUENCER")
+        if slot is not None:
+            # Listeners of a MultiSlotSequencer find the slot that sent the event from the calling thread
+            sequencer._activate(slot)
+        self._published = published
+        try:
+            pub.sendMessage(topic, **kwargs)
+        except Exception:
+            logger.exception("Listener of {} raised an exception".format(topic))
+        finally:
+            self._published = None
+            if slot is not None:
+                sequencer._deactivate()
+
+
+def _capture_slot():
+    """
+    :return: The slot Sequencer publishing from the calling thread if a MultiSlotSequencer is installed
+    """
+    active_slot = getattr(RESOURCES.get("SEQUENCER"), "active_slot", None)
+    return active_slot() if active_slot is not None else None
+
+
+dispatcher = EventDispatcher()
+
+
+def publish(topic, **kwargs):
+    dispatcher.publish(topic, **kwargs)
+
+
+def published_time():
+    return dispatcher.published_time()
+
+
+def start():
+    dispatcher.start()
+
+
+def stop():
+    dispatcher.stop()
+
+
+def flush():
+    dispatcher.flush()
+
+
+def register_sync_topic(topic):
+    SYNC_TOPICS.add(topic)
+
+
+def unregister_sync_topic(topic):
+    SYNC_TOPICS.discard(topic)
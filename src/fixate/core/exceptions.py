@@ -46,6 +46,10 @@ class MissingParameters(ParameterError):
     pass
 
 
+class MissingLimit(ParameterError):
+    pass
+
+
 class UserInputError(BaseException):
     pass
 
@@ -64,3 +68,7 @@ class DUTError(BaseException):
 
 class CheckFail(BaseException):
     pass
+
+
+class TestTimeout(BaseException):
+    pass
@@ -0,0 +1,171 @@
+"""
+Limits tables
+Loads check limits from a file so they can be changed without editing the test script. Limits are keyed by the test
+level and the check description and are used by fixate.core.checks.chk_limits and chk_array_limits. A level of "*"
+applies to checks with the description in any test that has no limit of its own.
+
+YAML
+version: "1.2"
+limits:
+  "2.1":
+    5V rail: {min: 4.75, max: 5.25}
+    Oscillator: {check: in_tolerance, nominal: 16e6, tol: 0.1}
+  "*":
+    Supply current: {max: 0.2}
+
+CSV. The version is given in a comment line
+# version: 1.2
+level,description,check,min,max,nominal,tol
+2.1,5V rail,,4.75,5.25,,
+*,Supply current,,,0.2,,
+
+The check is the name of the chk_ function to use without the prefix. If it is left out it is chosen from the limits
+given: nominal and tol is in_tolerance, min and max is in_range, only max is smaller_or_equal, only min is
+greater_or_equal and only nominal is equal.
+If the file has no version, the first characters of its sha1 hash are used so that reports still identify it.
+"""
+import csv
+import hashlib
+import os
+import ruamel.yaml
+from fixate.core.exceptions import ParameterError, MissingLimit
+
+# Limits used by each check, in the order they are passed to the check function
+LIMIT_FIELDS = {"in_range": ("min", "max"),
+                "in_range_equal": ("min", "max"),
+                "in_range_equal_min": ("min", "max"),
+                "in_range_equal_max": ("min", "max"),
+                "outside_range": ("min", "max"),
+                "outside_range_equal": ("min", "max"),
+                "outside_range_equal_min": ("min", "max"),
+                "outside_range_equal_max": ("min", "max"),
+                "in_tolerance": ("nominal", "tol"),
+                "in_tolerance_equal": ("nominal", "tol"),
+                "smaller": ("max",),
+                "smaller_or_equal": ("max",),
+                "greater": ("min",),
+                "greater_or_equal": ("min",),
+                "equal": ("nominal",)}
+FIELDS = ("min", "max", "nominal", "tol")
+
+
+class Limit:
+    __slots__ = ("check", "args")
+
+    def __init__(self, check, args):
+        """
+        :param check: name of the check function without the chk_ prefix
+        :param args: limits passed to the check function after the test value
+        """
+        self.check = check
+        self.args = args
+
+    def __repr__(self):
+        return "Limit({!r}, {!r})".format(self.check, self.args)
+
+
+def compile_limit(limits, where=""):
+    """
+    :param limits: dictionary of the limits of a check with the keys check, min, max, nominal and tol. Missing and
+    empty values are ignored
+    :param where: location of the limits in the file for error messages
+    :return: Limit
+    """
+    values = {}
+    for field in FIELDS:
+        value = limits.get(field)
+        if value is not None and value != "":
+            try:
+                values[field] = float(value)
+            except (TypeError, ValueError):
+                raise ParameterError("Invalid {} limit {!r} {}".format(field, value, where)) from None
+    check = limits.get("check") or _default_check(values)
+    if check not in LIMIT_FIELDS:
+        raise ParameterError("Unknown check {!r} {}".format(check, where))
+    missing = [field for field in LIMIT_FIELDS[check] if field not in values]
+    if missing:
+        raise ParameterError("Check {} needs {} {}".format(check, ", ".join(missing), where))
+    return Limit(check, tuple(values[field] for field in LIMIT_FIELDS[check]))
+
+
+def _default_check(values):
+    if "nominal" in values and "tol" in values:
+        return "in_tolerance"
+    if "min" in values and "max" in values:
+        return "in_range"
+    if "max" in values:
+        return "smaller_or_equal"
+    if "min" in values:
+        return "greater_or_equal"
+    if "nominal" in values:
+        return "equal"
+    return None
+
+
+class LimitsTable:
+    def __init__(self, limits=None, version=None, path=None):
+        """
+        :param limits: dictionary of (level, description): Limit
+        :param version: version of the limits file
+        :param path: file the limits were loaded from
+        """
+        self.limits = limits if limits is not None else {}
+        self.version = version
+        self.path = path
+
+    def __len__(self):
+        return len(self.limits)
+
+    def lookup(self, level, description):
+        """
+        :return: The Limit for the check with description in the test at level
+        """
+        limit = self.limits.get((level, description))
+        if limit is None:
+            limit = self.limits.get(("*", description))
+            if limit is None:
+                raise MissingLimit("No limits for check {!r} of test {} in {}".format(description, level, self.path))
+        return limit
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a yaml (.yaml, .yml) or csv limits file
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        text = data.decode("utf-8-sig")
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            limits, version = _parse_yaml(text, path)
+        else:
+            limits, version = _parse_csv(text, path)
+        if version is None:
+            version = "sha1:" + hashlib.sha1(data).hexdigest()[:10]
+        return cls(limits, str(version), path)
+
+
+def _parse_yaml(text, path):
+    content = ruamel.yaml.YAML(typ="safe").load(text) or {}
+    limits = {}
+    for level, checks in (content.get("limits") or {}).items():
+        for description, check_limits in checks.items():
+            where = "for test {} check {!r} in {}".format(level, description, path)
+            limits[(str(level), str(description))] = compile_limit(check_limits, where)
+    return limits, content.get("version")
+
+
+def _parse_csv(text, path):
+    version = None
+    lines = []
+    for line in text.splitlines():
+        if line.startswith("#"):
+            key, _, value = line[1:].partition(":")
+            if key.strip().lower() == "version":
+                version = value.strip()
+        else:
+            lines.append(line)
+    limits = {}
+    for row_number, row in enumerate(csv.DictReader(lines), 2):
+        where = "on row {} of {}".format(row_number, path)
+        limits[(row["level"].strip(), row["description"])] = compile_limit(row, where)
+    return limits, version
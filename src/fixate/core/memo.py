@@ -0,0 +1,120 @@
+"""
+Memoisation of idempotent steps
+Steps such as instrument self calibration, fixture continuity checks or reading the firmware version of a DUT often
+give the same result for many units in a row. Memoise caches their results for the rest of the station session, eg.
+the iterations of loop mode, until they expire after a time or a number of reuses.
+Decorate a function to cache its return value:
+>>>@Memoise(ttl=3600)
+>>>def self_calibrate(dmm):
+>>>    ...
+
+Or set it on a test to cache its checks. A cached test isn't run, its checks from the last passing run are reported
+again instead. Only passing runs are cached:
+>>>class FixtureContinuity(TestClass):
+>>>    memoise = Memoise(max_uses=50)
+
+The cache is kept in RESOURCES["STEP_CACHE"]. Each reuse sends Step_Cached with the age of the result so that it is
+marked as cached in the report.
+"""
+import functools
+import threading
+import time
+import fixate.config
+
+
+class CachedResult:
+    def __init__(self, value):
+        self.value = value
+        self.created = time.monotonic()
+        self.uses = 0  # Times the result has been reused
+
+    @property
+    def age(self):
+        """
+        :return: Seconds since the result was cached
+        """
+        return time.monotonic() - self.created
+
+
+class StepCache:
+    """
+    Results of memoised steps
+    """
+
+    def __init__(self):
+        self.entries = {}  # key: CachedResult
+        self._lock = threading.Lock()
+
+    def get(self, key, ttl=None, max_uses=None):
+        """
+        Reuses a cached result. Expired results are removed
+        :param key: key the result was cached with
+        :param ttl: seconds a result can be reused for. None for no limit
+        :param max_uses: times a result can be reused. None for no limit
+        :return: The CachedResult or None if there is no unexpired result
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if (ttl is not None and entry.age > ttl) or (max_uses is not None and entry.uses >= max_uses):
+                del self.entries[key]
+                return None
+            entry.uses += 1
+            return entry
+
+    def put(self, key, value):
+        with self._lock:
+            entry = self.entries[key] = CachedResult(value)
+            return entry
+
+    def invalidate(self, key=None):
+        """
+        Removes the result cached with key or every result if key is None
+        """
+        with self._lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+
+def step_cache():
+    """
+    :return: The StepCache of the session, created in RESOURCES on first use
+    """
+    return fixate.config.RESOURCES.setdefault("STEP_CACHE", StepCache())
+
+
+class Memoise:
+    def __init__(self, ttl=None, max_uses=None, key=None):
+        """
+        :param ttl: seconds a result can be reused for. None for no limit
+        :param max_uses: times a result can be reused before the step is run again. None for no limit
+        :param key: key to cache the result with. Defaults to the function and its arguments, or the slot, level and
+        class of the test.
+        Steps with the same key share their result
+        """
+        self.ttl = ttl
+        self.max_uses = max_uses
+        self.key = key
+
+    def get(self, key):
+        return step_cache().get(self.key if self.key is not None else key, self.ttl, self.max_uses)
+
+    def put(self, key, value):
+        return step_cache().put(self.key if self.key is not None else key, value)
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+            entry = self.get(key)
+            if entry is None:
+                return self.put(key, func(*args, **kwargs)).value
+            sequencer = fixate.config.RESOURCES.get("SEQUENCER")
+            if sequencer is not None:
+                sequencer.step_cached(func.__qualname__, entry)
+            return entry.value
+
+        return wrapper
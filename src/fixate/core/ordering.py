@@ -0,0 +1,158 @@
+"""
+Failure history ordering
+Reorders tests so that the ones most likely to fail run first, reducing the time spent on a bad unit before it fails.
+Only tests marked with TestClass.order_independent = True are moved and only amongst neighbouring tests that are also
+order independent. Any other test in a test list stays where it is, so tests that depend on the tests before them are
+not affected.
+
+Tests are ranked by their historical failure probability divided by their mean duration. For independent tests this
+ordering minimises the expected time until the first failure.
+Moved tests keep their levels, recorded in TestList.numbers, so a test is reported, journalled and looked up in a
+limits table by the same level wherever it runs.
+History is keyed by the test description, so tests that share a description share their history.
+>>>history = FailureHistory.from_csv(glob.glob("reports/*.csv"))
+>>>order_tests(test_list, history)
+"""
+import csv
+import json
+from fixate.core.common import TestList, TestClass, LazyTestList
+
+PASS_STATUSES = ["PASS"]
+# Statuses that don't say if the test works
+IGNORED_STATUSES = ["SKIP", "SKIPPED", "PENDING", "SAMPLED-OUT", "BUDGET-SKIPPED"]
+
+
+class FailureHistory:
+    def __init__(self):
+        self.tests = {}  # test_desc: {"runs": n, "failures": n, "duration": total seconds of timed runs, "timed": n}
+
+    def record(self, test_desc, status, duration=None):
+        """
+        Adds a result to the history
+        :param test_desc: description of the test
+        :param status: status of the test as sent with Test_Complete
+        :param duration: seconds the test took or None if unknown
+        """
+        if status.upper() in IGNORED_STATUSES:
+            return
+        test = self._test(test_desc)
+        test["runs"] += 1
+        if status.upper() not in PASS_STATUSES:
+            test["failures"] += 1
+        if duration is not None:
+            test["duration"] += duration
+            test["timed"] += 1
+
+    def _test(self, test_desc):
+        return self.tests.setdefault(test_desc, {"runs": 0, "failures": 0, "duration": 0.0, "timed": 0})
+
+    def failure_probability(self, test_desc):
+        """
+        :return: The estimated probability that the test fails. Smoothed so that a test with little history is not
+        treated as certain to pass or fail. A test with no history is 0.5
+        """
+        test = self.tests.get(test_desc, {"runs": 0, "failures": 0})
+        return (test["failures"] + 1) / (test["runs"] + 2)
+
+    def mean_duration(self, test_desc):
+        """
+        :return: The mean duration of the test in seconds or None if it has not been timed
+        """
+        test = self.tests.get(test_desc)
+        if not test or not test["timed"]:
+            return None
+        return test["duration"] / test["timed"]
+
+    def score(self, test_desc, default_duration=1.0):
+        """
+        :return: Failure probability per second. Tests with higher scores should run first
+        """
+        duration = self.mean_duration(test_desc)
+        if duration is None:
+            duration = default_duration
+        return self.failure_probability(test_desc) / max(duration, 1e-3)
+
+    @classmethod
+    def from_csv(cls, paths):
+        """
+        Builds the history from csv reports
+        :param paths: paths of csv reports written by fixate.reporting.csv
+        """
+        history = cls()
+        for path in paths:
+            history.add_csv(path)
+        return history
+
+    def add_csv(self, path):
+        started = {}  # test level: (test description, start time)
+        with open(path, 'r', newline='') as f:
+            for row in csv.reader(f):
+                if len(row) < 4 or not row[1].startswith("Test "):
+                    continue
+                level = row[1][len("Test "):]
+                try:
+                    time_stamp = float(row[0])
+                except ValueError:
+                    time_stamp = None
+                if row[2] == "start":
+                    started[level] = (row[3], time_stamp)
+                elif row[2] == "end" and level in started:
+                    test_desc, start_time = started.pop(level)
+                    duration = None
+                    if time_stamp is not None and start_time is not None:
+                        duration = time_stamp - start_time
+                    self.record(test_desc, row[3], duration)
+
+    def add_json(self, path):
+        """
+        Adds the results of a history saved with save
+        """
+        with open(path, 'r') as f:
+            tests = json.load(f)
+        for test_desc, results in tests.items():
+            test = self._test(test_desc)
+            for key in test:
+                test[key] += results.get(key, 0)
+
+    @classmethod
+    def load(cls, path):
+        history = cls()
+        history.add_json(path)
+        return history
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.tests, f, indent=2)
+
+
+def order_tests(test_list, history):
+    """
+    Reorders the order independent tests in test_list and the test lists it contains, most likely to fail first.
+    Each run of neighbouring order independent tests is sorted separately. The sort is stable so tests without
+    history keep their relative order
+    :param test_list: TestList to reorder in place. Plain lists are reordered but can't keep the levels of moved tests
+    :param history: FailureHistory to rank the tests with
+    """
+    if isinstance(test_list, LazyTestList):
+        return  # The tests haven't been created yet
+    numbers = getattr(test_list, "numbers", None)
+    numbers = list(numbers) if numbers is not None else list(range(1, len(test_list) + 1))
+    start = None
+    for index in range(len(test_list) + 1):
+        item = test_list[index] if index < len(test_list) else None
+        if isinstance(item, TestClass) and item.order_independent:
+            if start is None:
+                start = index
+            continue
+        if start is not None:
+            order = sorted(range(start, index), key=lambda position: -history.score(test_list[position].test_desc))
+            test_list[start:index] = [test_list[position] for position in order]
+            numbers[start:index] = [numbers[position] for position in order]
+            start = None
+        if isinstance(item, TestList):
+            order_tests(item, history)
+        elif isinstance(item, list):
+            test_list[index] = TestList(item)
+            order_tests(test_list[index], history)
+    if isinstance(test_list, TestList) and numbers != list(range(1, len(test_list) + 1)):
+        test_list.numbers = numbers
@@ -0,0 +1,91 @@
+"""
+Test timing profiler
+The sequencer records how long each phase of every test attempt takes, keyed by level string.
+The set_up and tear_down of a list scoped test list are called once, not for each test, so they are recorded against
+the level of the test list, with an attempt for each time its set_up is tried.
+Phases:
+    list_set_up: set_up of the test lists containing the test, or of a list scoped test list
+    set_up: set_up of the test
+    test: the test itself
+    tear_down: tear_down of the test and the test lists containing it, or of a list scoped test list
+    retry: deciding whether to retry, including the retry prompt
+    user: blocked waiting for the user to respond to a prompt. This time is also part of the phase the prompt was
+    shown in
+At the end of the sequence the summary is sent with the Sequence_Profile message
+"""
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+PHASES = ["list_set_up", "set_up", "test", "tear_down", "retry", "user"]
+
+
+class Profiler:
+    def __init__(self):
+        self.attempts = {}  # level: [{phase: seconds}, ...] for each attempt of the test
+        self._local = threading.local()  # Attempt being timed in the calling thread
+
+    def clear(self):
+        self.attempts = {}
+        self._local = threading.local()
+
+    def start_attempt(self, level):
+        """
+        Starts timing a new attempt of the test at level in the calling thread
+        """
+        attempt = {}
+        self.attempts.setdefault(level, []).append(attempt)
+        self._local.attempt = attempt
+
+    def continue_attempt(self, level):
+        """
+        Continues timing the last attempt at level in the calling thread
+        """
+        attempts = self.attempts.setdefault(level, [])
+        if not attempts:
+            attempts.append({})
+        self._local.attempt = attempts[-1]
+
+    def add(self, phase, seconds):
+        """
+        Adds time to a phase of the attempt being timed in the calling thread
+        """
+        attempt = getattr(self._local, "attempt", None)
+        if attempt is not None:
+            attempt[phase] = attempt.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, phase):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - start)
+
+    def summary(self, slowest=10):
+        """
+        :param slowest: Number of the slowest steps to include
+        :return: dictionary with
+            "total": seconds spent running tests. user time is not added as it is already part of another phase
+            "phases": total seconds of each phase
+            "tests": {level: {"attempts": n, "total": seconds, <phase>: seconds}} for each test and list scoped
+            test list
+            "slowest": the slowest steps as {"level": level, "attempt": n, "phase": phase, "seconds": seconds}
+        """
+        phases = dict.fromkeys(PHASES, 0.0)
+        tests = {}
+        steps = []
+        for level, attempts in self.attempts.items():
+            test = tests[level] = {"attempts": len(attempts), "total": 0.0}
+            for number, attempt in enumerate(attempts, 1):
+                for phase, seconds in attempt.items():
+                    phases[phase] = phases.get(phase, 0.0) + seconds
+                    test[phase] = test.get(phase, 0.0) + seconds
+                    if phase != "user":
+                        test["total"] += seconds
+                    steps.append({"level": level, "attempt": number, "phase": phase, "seconds": seconds})
+        steps.sort(key=lambda step: step["seconds"], reverse=True)
+        return {"total": sum(test["total"] for test in tests.values()),
+                "phases": phases,
+                "tests": tests,
+                "slowest": steps[:slowest]}
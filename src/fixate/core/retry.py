@@ -0,0 +1,182 @@
+"""
+Retry policies
+A retry policy decides if a failed attempt of a test is retried and how long to wait before the next attempt. Set a
+policy on a test with TestClass.retry_policy. Tests without a policy keep the immediate retries up to
+TestClass.attempts.
+>>>class PowerRail(TestClass):
+>>>    retry_policy = BackoffRetry(attempts=4, delay=0.1, factor=2)
+
+Policies are only consulted when the sequencer would retry the test automatically, so retry_type RT_FAIL and RT_ABORT
+and the prompt for abort exceptions are unchanged.
+
+The sequencer keeps RetryStatistics of how often retrying each test has recovered it. A policy with min_recovery_rate
+stops retrying a test once its history shows that retries rarely make it pass.
+"""
+import json
+import threading
+
+
+class RetryPolicy:
+    """
+    Retries any failure immediately
+    """
+
+    def __init__(self, attempts=None, min_recovery_rate=None, min_history=5):
+        """
+        :param attempts: total attempts including the first. If None, TestClass.attempts is used
+        :param min_recovery_rate: stop retrying a test once less than this fraction of its retried runs have passed
+        :param min_history: retried runs needed before min_recovery_rate is applied
+        """
+        self.attempts = attempts
+        self.min_recovery_rate = min_recovery_rate
+        self.min_history = min_history
+
+    def max_attempts(self, test):
+        return test.attempts if self.attempts is None else self.attempts
+
+    def should_retry(self, test, attempt, exception, statistics=None):
+        """
+        :param test: the TestClass that failed
+        :param attempt: the number of the attempt that failed, starting from 1
+        :param exception: the exception the attempt failed with
+        :param statistics: RetryStatistics of previous runs or None
+        :return: True if the test should be attempted again
+        """
+        if attempt >= self.max_attempts(test):
+            return False
+        if self.min_recovery_rate is not None and statistics is not None:
+            rate = statistics.recovery_rate(test.test_desc, self.min_history)
+            if rate is not None and rate < self.min_recovery_rate:
+                return False
+        return True
+
+    def delay(self, attempt):
+        """
+        :param attempt: the number of the attempt that failed, starting from 1
+        :return: seconds to wait before the next attempt
+        """
+        return 0
+
+
+class FixedRetry(RetryPolicy):
+    """
+    Waits the same time before each retry
+    """
+
+    def __init__(self, attempts=None, delay=0.0, **kwargs):
+        super().__init__(attempts, **kwargs)
+        self.fixed_delay = delay
+
+    def delay(self, attempt):
+        return self.fixed_delay
+
+
+class BackoffRetry(RetryPolicy):
+    """
+    Waits delay * factor ** (attempt - 1) seconds before each retry, up to max_delay
+    """
+
+    def __init__(self, attempts=None, delay=0.1, factor=2.0, max_delay=None, **kwargs):
+        super().__init__(attempts, **kwargs)
+        self.initial_delay = delay
+        self.factor = factor
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        delay = self.initial_delay * self.factor ** (attempt - 1)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+
+
+class ExceptionRetry(RetryPolicy):
+    """
+    Only retries failures caused by the given exception types. Failed checks raise fixate.core.exceptions.CheckFail
+    and timeouts raise fixate.core.exceptions.TestTimeout
+    """
+
+    def __init__(self, exceptions, policy=None):
+        """
+        :param exceptions: exception types that are retried
+        :param policy: policy used to decide the attempts and delay of the retried exceptions. Defaults to RetryPolicy
+        """
+        super().__init__()
+        self.exceptions = tuple(exceptions)
+        self.policy = policy if policy is not None else RetryPolicy()
+
+    def max_attempts(self, test):
+        return self.policy.max_attempts(test)
+
+    def should_retry(self, test, attempt, exception, statistics=None):
+        if not isinstance(exception, self.exceptions):
+            return False
+        return self.policy.should_retry(test, attempt, exception, statistics)
+
+    def delay(self, attempt):
+        return self.policy.delay(attempt)
+
+
+class RetryStatistics:
+    """
+    How often retrying each test has made it pass. Keyed by the test description
+    """
+
+    def __init__(self):
+        self.tests = {}  # test_desc: {"runs": retried runs, "recovered": retried runs that passed, "retries": n}
+        self._lock = threading.Lock()
+
+    def record(self, test_desc, retries, passed):
+        """
+        :param test_desc: description of the test
+        :param retries: number of times the test was retried
+        :param passed: True if the test passed on its last attempt
+        """
+        if not retries:
+            return
+        with self._lock:
+            test = self._test(test_desc)
+            test["runs"] += 1
+            test["retries"] += retries
+            if passed:
+                test["recovered"] += 1
+
+    def _test(self, test_desc):
+        return self.tests.setdefault(test_desc, {"runs": 0, "recovered": 0, "retries": 0})
+
+    def recovery_rate(self, test_desc, min_history=1):
+        """
+        :return: The fraction of retried runs of the test that passed or None if it has been retried in less than
+        min_history runs
+        """
+        test = self.tests.get(test_desc)
+        if not test or test["runs"] < max(min_history, 1):
+            return None
+        return test["recovered"] / test["runs"]
+
+    def summary(self):
+        with self._lock:
+            return {test_desc: dict(test, recovery_rate=test["recovered"] / test["runs"])
+                    for test_desc, test in self.tests.items()}
+
+    def add_json(self, path):
+        """
+        Adds the statistics saved with save
+        """
+        with open(path, 'r') as f:
+            tests = json.load(f)
+        with self._lock:
+            for test_desc, results in tests.items():
+                test = self._test(test_desc)
+                for key in test:
+                    test[key] += results.get(key, 0)
+
+    @classmethod
+    def load(cls, path):
+        statistics = cls()
+        statistics.add_json(path)
+        return statistics
+
+    def save(self, path):
+        with self._lock:
+            with open(path, 'w') as f:
+                json.dump(self.tests, f, indent=2)
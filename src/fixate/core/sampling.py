@@ -0,0 +1,144 @@
+"""
+Skip-lot sampling
+Expensive tests can be run on a sample of units once the process is stable. Set a policy on a test with
+TestClass.sampling_policy. Whether each test runs is decided when the sequence starts, from a SamplingHistory of the
+units previously tested on the station. Tests that are not run complete with the status SAMPLED-OUT.
+>>>class FrequencySweep(TestClass):
+>>>    sampling_policy = AdaptiveSampling(every=10, min_yield=0.99, window=50)
+
+History is keyed by the test description, so tests that share a description share their history.
+"""
+import json
+import threading
+
+SAMPLED_OUT = "SAMPLED-OUT"
+PASS_STATUSES = ["PASS"]
+# Statuses that are not a result of running the test
+IGNORED_STATUSES = ["SKIP", "SKIPPED", "PENDING", "BUDGET-SKIPPED", SAMPLED_OUT]
+MAX_RESULTS = 1000  # Results kept per test for the rolling yield
+
+
+class SamplingPolicy:
+    """
+    Runs the test on every unit
+    """
+
+    def should_run(self, test_desc, history):
+        """
+        :param test_desc: description of the test
+        :param history: SamplingHistory of the station
+        :return: True if the test should run on this unit
+        """
+        return True
+
+
+class EveryNth(SamplingPolicy):
+    """
+    Runs the test on one unit in every n
+    """
+
+    def __init__(self, n):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+
+    def should_run(self, test_desc, history):
+        since_run = history.units_since_run(test_desc)
+        return since_run is None or since_run >= self.n - 1
+
+
+class AdaptiveSampling(SamplingPolicy):
+    """
+    Runs the test on every unit until its rolling yield over the last window runs reaches min_yield, then on one unit
+    in every n. Any failure within the window returns the test to every unit
+    """
+
+    def __init__(self, every, min_yield=0.99, window=50):
+        """
+        :param every: once stable, run the test on one unit in this many
+        :param min_yield: fraction of the last window runs that must have passed for the test to be sampled
+        :param window: number of runs the yield is calculated over
+        """
+        self.sampled = EveryNth(every)
+        self.min_yield = min_yield
+        self.window = window
+
+    def should_run(self, test_desc, history):
+        rolling_yield = history.rolling_yield(test_desc, self.window)
+        if rolling_yield is None or rolling_yield < self.min_yield:
+            return True
+        return self.sampled.should_run(test_desc, history)
+
+
+class SamplingHistory:
+    """
+    Results of the tests with a sampling policy on the units tested by a station
+    """
+
+    def __init__(self):
+        self.tests = {}  # test_desc: {"since_run": units sampled out since the last run, "results": [passed, ...]}
+        self._lock = threading.Lock()
+
+    def record(self, test_desc, status):
+        """
+        Adds the result of a test to the history
+        :param test_desc: description of the test
+        :param status: status of the test as sent with Test_Complete
+        """
+        status = status.upper()
+        if status in IGNORED_STATUSES and status != SAMPLED_OUT:
+            return
+        with self._lock:
+            test = self._test(test_desc)
+            if status == SAMPLED_OUT:
+                test["since_run"] += 1
+                return
+            test["since_run"] = 0
+            test["results"].append(status in PASS_STATUSES)
+            del test["results"][:-MAX_RESULTS]
+
+    def _test(self, test_desc):
+        return self.tests.setdefault(test_desc, {"since_run": 0, "results": []})
+
+    def units_since_run(self, test_desc):
+        """
+        :return: The number of units the test has been sampled out on since it last ran or None if it has never run
+        """
+        test = self.tests.get(test_desc)
+        if not test or not test["results"]:
+            return None
+        return test["since_run"]
+
+    def rolling_yield(self, test_desc, window):
+        """
+        :return: The fraction of the last window runs of the test that passed or None if it has run less than window
+        times
+        """
+        test = self.tests.get(test_desc)
+        if not test or len(test["results"]) < window:
+            return None
+        results = test["results"][-window:]
+        return sum(results) / len(results)
+
+    def add_json(self, path):
+        """
+        Adds the history saved with save
+        """
+        with open(path, 'r') as f:
+            tests = json.load(f)
+        with self._lock:
+            for test_desc, saved in tests.items():
+                test = self._test(test_desc)
+                test["since_run"] += saved.get("since_run", 0)
+                test["results"] = (saved.get("results", []) + test["results"])[-MAX_RESULTS:]
+
+    @classmethod
+    def load(cls, path):
+        history = cls()
+        history.add_json(path)
+        return history
+
+    def save(self, path):
+        with self._lock:
+            with open(path, 'w') as f:
+                json.dump(self.tests, f)
@@ -0,0 +1,100 @@
+"""
+Test selection
+Selects the tests to run from a test list before it is loaded. Tests that aren't selected are removed along with any
+test list left with nothing to run, so their set_up, tear_down, enter and exit are never called.
+Patterns can be:
+    Level paths, eg. "2.3" or "2.3.*". Shell style wildcards are supported. Selecting a test list selects every test
+    in it
+    Tags, eg. "tag:rework", matching tests and test lists with the tag in their tags attribute
+    Class names, eg. "PowerOnTest", matching instances of the class or its subclasses
+Levels are those of the test list before it is pruned. The remaining tests keep their levels: a pruned list records
+the original positions of its tests in TestList.numbers, so test 2.3 is still reported as 2.3 when it runs alone and
+reports of partial runs can be compared with those of full runs.
+Tests in a LazyTestList can't be selected individually as they haven't been created yet. The list is kept whole if it
+is selected, otherwise it is removed
+>>>TestSelection(include=["2.3.*", "tag:rework"], exclude=["2.3.4"]).prune(test_list)
+"""
+import copy
+import fnmatch
+import re
+from fixate.core.common import TestList, TestClass, LazyTestList
+
+LEVEL_PATTERN = re.compile(r'^[\d.*?\[\]]+$')
+
+
+def _matches(pattern, item, level):
+    if pattern.startswith("tag:"):
+        return pattern[len("tag:"):] in getattr(item, "tags", [])
+    if LEVEL_PATTERN.match(pattern):
+        return bool(level) and fnmatch.fnmatchcase(level, pattern)
+    return any(cls.__name__ == pattern for cls in type(item).__mro__)
+
+
+class TestSelection:
+    def __init__(self, include=None, exclude=None):
+        """
+        :param include: patterns of the tests to run. If empty, every test that isn't excluded is run
+        :param exclude: patterns of the tests not to run. Takes priority over include
+        """
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+
+    def included(self, item, level):
+        return any(_matches(pattern, item, level) for pattern in self.include)
+
+    def excluded(self, item, level):
+        return any(_matches(pattern, item, level) for pattern in self.exclude)
+
+    def prune(self, test_list):
+        """
+        :param test_list: the TestList (or list) that would be loaded into the sequencer. It is not modified
+        :return: a copy of test_list containing only the selected tests. Test lists are shallow copies so their
+        set_up, tear_down, enter and exit are kept
+        """
+        if not isinstance(test_list, TestList):
+            test_list = TestList(test_list)
+        selected = not self.include or self.included(test_list, "")
+        pruned = self._prune_list(test_list, "", selected)
+        if pruned is None:
+            pruned = copy.copy(test_list)
+            pruned.tests = []
+        return pruned
+
+    def _prune_list(self, test_list, level, selected):
+        """
+        :return: a copy of test_list with only the selected items or None if nothing in it is selected
+        """
+        items = []
+        numbers = []
+        for index, item in enumerate(test_list):
+            number = _number(test_list, index)
+            item_level = "{}.{}".format(level, number) if level else str(number)
+            if self.excluded(item, item_level):
+                continue
+            item_selected = selected or self.included(item, item_level)
+            if isinstance(item, TestClass) or isinstance(item, LazyTestList):
+                if not item_selected:
+                    continue
+            else:
+                if not isinstance(item, TestList):
+                    item = TestList(item)
+                item = self._prune_list(item, item_level, item_selected)
+                if item is None:
+                    continue
+            items.append(item)
+            numbers.append(number)
+        if not items:
+            return None
+        pruned = copy.copy(test_list)
+        pruned.tests = items
+        pruned.numbers = numbers
+        return pruned
+
+
+def _number(test_list, index):
+    """
+    :return: The level number of the item at index of test_list
+    """
+    if test_list.numbers is not None:
+        return test_list.numbers[index]
+    return index + 1
@@ -0,0 +1,214 @@
+"""
+Statistical process control
+SpcMonitor listens to the Check message and keeps running statistics of the measured values of every check, keyed by
+the test level and the check description, across the units tested by a station. The statistics are kept in constant
+memory so that they can be saved and carried over between sessions.
+
+Each check keeps
+- the count, mean, standard deviation, min and max of every value (fixate.core.statistics.RunningStatistics)
+- an exponentially weighted mean and variance of the recent values
+- the process capability (Cpk) of both against the limits of the check
+
+When the Cpk of the recent values falls below min_cpk the monitor sends SPC_Drift so that a measurement moving
+towards its limits, eg. from a worn fixture or an instrument out of calibration, is noticed before units fail.
+SPC_Drift is sent once when the check starts to drift and again only after it has recovered.
+>>>monitor = SpcMonitor.load("spc.json") if os.path.exists("spc.json") else SpcMonitor()
+>>>monitor.register()
+>>>...
+>>>monitor.save("spc.json")
+
+Only numeric test values are recorded. Limits are taken from _min and _max, nominal and tol, or the nominal of the
+smaller and greater checks. Checks without limits, eg. chk_log_value, get statistics but no Cpk.
+Check is delivered on the event dispatch thread, so the monitor does not hold up the test thread. See
+fixate.core.events
+"""
+import json
+import math
+import numbers
+import threading
+from pubsub import pub
+from fixate.core.events import publish
+from fixate.core.statistics import RunningStatistics
+
+UPPER_LIMIT_CHECKS = ("smaller", "smaller or equal")
+LOWER_LIMIT_CHECKS = ("greater", "greater or equal")
+
+
+def capability(mean, std_dev, lower=None, upper=None):
+    """
+    :return: The Cpk of values with mean and std_dev against the limits, or None if there are no limits or no spread
+    """
+    if (lower is None and upper is None) or not std_dev:
+        return None
+    margins = []
+    if upper is not None:
+        margins.append(upper - mean)
+    if lower is not None:
+        margins.append(mean - lower)
+    return min(margins) / (3 * std_dev)
+
+
+def check_limits(chk):
+    """
+    :param chk: CheckClass sent with the Check message
+    :return: (lower, upper) limits of the check. Either can be None
+    """
+    check_type = chk.check_type
+    if check_type.startswith("array "):
+        check_type = check_type[len("array "):]
+    if check_type.startswith("outside range"):
+        return None, None
+    if chk._min is not None or chk._max is not None:
+        return chk._min, chk._max
+    if chk.nominal is not None and chk.tol is not None:
+        first, second = chk.nominal * (1 - chk.tol / 100), chk.nominal * (1 + chk.tol / 100)
+        return min(first, second), max(first, second)
+    if check_type in UPPER_LIMIT_CHECKS:
+        return None, chk.nominal
+    if check_type in LOWER_LIMIT_CHECKS:
+        return chk.nominal, None
+    return None, None
+
+
+class CheckStatistics:
+    def __init__(self, alpha=0.1):
+        """
+        :param alpha: weight of each new value in the recent mean and variance
+        """
+        self.alpha = alpha
+        self.values = RunningStatistics()
+        self.recent_mean = None
+        self.recent_variance = 0.0
+        self.lower = None  # Limits of the last value
+        self.upper = None
+        self.drifting = False
+
+    def add(self, value, lower=None, upper=None):
+        self.values.add(value)
+        self.lower, self.upper = lower, upper
+        if self.recent_mean is None:
+            self.recent_mean = value
+        else:
+            diff = value - self.recent_mean
+            increment = self.alpha * diff
+            self.recent_mean += increment
+            self.recent_variance = (1 - self.alpha) * (self.recent_variance + diff * increment)
+
+    @property
+    def cpk(self):
+        """
+        :return: The Cpk of every value or None
+        """
+        return capability(self.values.mean, self.values.std_dev, self.lower, self.upper)
+
+    @property
+    def recent_cpk(self):
+        """
+        :return: The Cpk of the recent values or None
+        """
+        if self.recent_mean is None:
+            return None
+        return capability(self.recent_mean, math.sqrt(self.recent_variance), self.lower, self.upper)
+
+    def summary(self):
+        return {"values": self.values.summary(),
+                "recent_mean": self.recent_mean,
+                "recent_variance": self.recent_variance,
+                "lower": self.lower,
+                "upper": self.upper,
+                "cpk": self.cpk,
+                "recent_cpk": self.recent_cpk,
+                "drifting": self.drifting}
+
+    @classmethod
+    def from_summary(cls, summary, alpha=0.1):
+        stats = cls(alpha)
+        stats.values = RunningStatistics.from_summary(summary["values"])
+        stats.recent_mean = summary["recent_mean"]
+        stats.recent_variance = summary["recent_variance"]
+        stats.lower = summary["lower"]
+        stats.upper = summary["upper"]
+        stats.drifting = summary.get("drifting", False)
+        return stats
+
+
+class SpcMonitor:
+    def __init__(self, min_cpk=1.33, min_count=10, alpha=0.1):
+        """
+        :param min_cpk: SPC_Drift is sent when the Cpk of the recent values of a check falls below this
+        :param min_count: values a check needs before it can drift
+        :param alpha: weight of each new value in the recent mean and variance
+        """
+        self.min_cpk = min_cpk
+        self.min_count = min_count
+        self.alpha = alpha
+        self.checks = {}  # (level, description): CheckStatistics
+        self._lock = threading.Lock()  # Slots of a MultiSlotSequencer share the monitor
+
+    def record(self, level, description, value, lower=None, upper=None):
+        """
+        Adds a value to the statistics of a check and sends SPC_Drift if it has started to drift
+        :return: True if the check is drifting
+        """
+        with self._lock:
+            stats = self.checks.get((level, description))
+            if stats is None:
+                stats = self.checks[(level, description)] = CheckStatistics(self.alpha)
+            stats.add(value, lower, upper)
+            recent_cpk = stats.recent_cpk
+            drifting = stats.values.count >= self.min_count and recent_cpk is not None and recent_cpk < self.min_cpk
+            started = drifting and not stats.drifting
+            stats.drifting = drifting
+            mean = stats.recent_mean
+        if started:
+            publish("SPC_Drift", test_index=level, description=description, cpk=recent_cpk, mean=mean, lower=lower,
+                    upper=upper)
+        return drifting
+
+    def check(self, passes, chk, chk_cnt, context):
+        """
+        Listener of the Check message
+        """
+        value = chk.test_val
+        if isinstance(value, bool) or not isinstance(value, numbers.Real) or value != value:
+            return
+        lower, upper = check_limits(chk)
+        self.record(context, chk.description, float(value), lower, upper)
+
+    def register(self):
+        pub.subscribe(self.check, "Check")
+
+    def unregister(self):
+        pub.unsubscribe(self.check, "Check")
+
+    def summary(self):
+        """
+        :return: dictionary of {level: {description: statistics}}
+        """
+        with self._lock:
+            summary = {}
+            for (level, description), stats in self.checks.items():
+                summary.setdefault(level, {})[description] = stats.summary()
+            return summary
+
+    def add_json(self, path):
+        """
+        Adds the statistics saved with save. Checks already recorded in this session are kept
+        """
+        with open(path, 'r') as f:
+            levels = json.load(f)
+        with self._lock:
+            for level, checks in levels.items():
+                for description, summary in checks.items():
+                    self.checks.setdefault((level, description), CheckStatistics.from_summary(summary, self.alpha))
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        monitor = cls(**kwargs)
+        monitor.add_json(path)
+        return monitor
+
+    def save(self, path):
+        summary = self.summary()
+        with open(path, 'w') as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,88 @@
+"""
+Running statistics
+Statistics that are updated one value at a time in constant memory so they can be kept over thousands of sequence
+iterations
+"""
+import math
+import threading
+
+
+class RunningStatistics:
+    """
+    Count, mean, standard deviation, min and max of a stream of values using Welford's algorithm
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self):
+        """
+        :return: The sample variance or 0 if there are less than two values
+        """
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    def summary(self):
+        return {"count": self.count, "mean": self.mean, "std_dev": self.std_dev, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_summary(cls, summary):
+        """
+        :return: RunningStatistics that continue from the values described by a summary
+        """
+        stats = cls()
+        stats.count = summary["count"]
+        stats.mean = summary["mean"]
+        stats._m2 = summary["std_dev"] ** 2 * max(stats.count - 1, 0)
+        stats.min = summary["min"]
+        stats.max = summary["max"]
+        return stats
+
+
+class LoopStatistics:
+    """
+    Results of the iterations of a looped sequence
+    """
+
+    def __init__(self):
+        self.iterations = 0
+        self.end_statuses = {}  # end status: number of iterations
+        self.tests = {}  # level: {test status: count}
+        self.duration = RunningStatistics()  # Seconds per iteration
+        self._lock = threading.Lock()
+
+    def add_test(self, level, status):
+        with self._lock:
+            statuses = self.tests.setdefault(level, {})
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def add_iteration(self, end_status, duration):
+        with self._lock:
+            self.iterations += 1
+            self.end_statuses[end_status] = self.end_statuses.get(end_status, 0) + 1
+            self.duration.add(duration)
+
+    def summary(self):
+        with self._lock:
+            return {"iterations": self.iterations,
+                    "end_statuses": dict(self.end_statuses),
+                    "tests": {level: dict(statuses) for level, statuses in self.tests.items()},
+                    "duration": self.duration.summary()}
@@ -2,8 +2,9 @@
 This module details user input api
 """
 import time
+from contextlib import contextmanager
 from queue import Queue, Empty
-from pubsub import pub
+from fixate.core.events import publish
 from fixate.core.exceptions import UserInputError
 from fixate.core.checks import chk_log_value
 from fixate.config import RESOURCES
@@ -15,6 +16,22 @@ USER_RETRY_ABORT_FAIL = ("RETRY", "ABORT", "FAIL")
 USER_RETRY_ABORT = ("RETRY", "ABORT")
 
 
+@contextmanager
+def _user_wait():
+    """
+    Records the time spent waiting for the user in the sequencer profiler.
+    Covers sending the request as the user interface may block on the user while handling it
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        try:
+            RESOURCES["SEQUENCER"].profiler.add("user", time.perf_counter() - start)
+        except (KeyError, AttributeError):
+            pass  # No sequencer or outside of a slot thread
+
+
 def _user_req(msg):
     """
     A blocking function that waits for the user returned values
@@ -30,8 +47,9 @@ def _user_req(msg):
      Returns the user response
     """
     q = Queue()
-    pub.sendMessage('UI_req', msg=msg, q=q)
-    return q.get()
+    with _user_wait():
+        publish('UI_req', msg=msg, q=q)
+        return q.get()
 
 
 def _user_image(path, overlay):
@@ -40,7 +58,7 @@ def _user_image(path, overlay):
     :param path:
      A relative path to the image
     """
-    pub.sendMessage('UI_image', path=path, overlay=overlay)
+    publish('UI_image', path=path, overlay=overlay)
     return
 
 
@@ -59,8 +77,9 @@ def _user_req_input(msg, target=None, attempts=5, **kwargs):
      Returns the user response
     """
     q = Queue()
-    pub.sendMessage('UI_req_input', msg=msg, q=q, target=target, attempts=attempts, kwargs=kwargs)
-    return q.get()
+    with _user_wait():
+        publish('UI_req_input', msg=msg, q=q, target=target, attempts=attempts, kwargs=kwargs)
+        return q.get()
 
 
 def _user_req_choices(msg, choices, target=None, attempts=5):
@@ -80,16 +99,17 @@ def _user_req_choices(msg, choices, target=None, attempts=5):
     if len(choices) < 2:
         raise ValueError("Requires at least two choices to work, {} provided".format(choices))
     q = Queue()
-    pub.sendMessage('UI_req_choices', msg=msg, q=q, choices=choices, target=target, attempts=attempts)
-    return q.get()
+    with _user_wait():
+        publish('UI_req_choices', msg=msg, q=q, choices=choices, target=target, attempts=attempts)
+        return q.get()
 
 
 def user_info(msg):
-    pub.sendMessage('UI_display', msg=msg)
+    publish('UI_display', msg=msg)
 
 
 def user_info_important(msg):
-    pub.sendMessage('UI_display_important', msg=msg)
+    publish('UI_display_important', msg=msg)
 
 
 def user_input(msg):
@@ -141,18 +161,19 @@ def user_action(msg, target):
     # UI command that will push
     # False into the queue if the user fails the test through an external interface.
     # True if the user passes the test through an external interface.
-    pub.sendMessage('UI_action', msg=msg, q=q, abort=abort)
-    while True:
-        try:
-            itm = q.get_nowait()
-            abort.put(True)
-            return itm
-        except Empty:
-            pass
-        if target():
-            abort.put(True)
-            return True
-        time.sleep(0)  # Yield control for other threads but don't slow down target
+    with _user_wait():
+        publish('UI_action', msg=msg, q=q, abort=abort)
+        while True:
+            try:
+                itm = q.get_nowait()
+                abort.put(True)
+                return itm
+            except Empty:
+                pass
+            if target():
+                abort.put(True)
+                return True
+            time.sleep(0)  # Yield control for other threads but don't slow down target
 
 
 def user_ok(msg):
@@ -1,5 +1,11 @@
-from inspect import isfunction
+from contextlib import contextmanager
+from inspect import isfunction, isroutine
 from functools import wraps, partial
+from numbers import Number
+from threading import RLock
+
+# Attributes of a locked driver that are returned as they are rather than behind the driver's lock
+_UNLOCKED_TYPES = (Number, str, bytes, list, tuple, dict, set, frozenset, type(None))
 
 
 def _ensure_connected(f):
@@ -57,6 +63,49 @@ class Driver(metaclass=DriverMeta):
         print("Disconnected from {}".format(self.__class__.__name__))
         self.is_connected = False
 
+    def __deepcopy__(self, memo):
+        # A driver is an instrument, copies of the tests that use it (eg. for each fixture slot) share it
+        return self
+
+
+class _LockedDriver:
+    """
+    Proxy to a driver that holds the driver's lock for every attribute access and method call.
+    Used when a driver is shared between concurrently running fixture slots.
+    Sub-objects of the driver, eg. the channels of a PPS, are returned as proxies holding the same lock so that calls
+    through them are serialised as well
+    """
+
+    def __init__(self, driver, lock):
+        object.__setattr__(self, '_driver', driver)
+        object.__setattr__(self, '_lock', lock)
+
+    def __getattr__(self, item):
+        with self._lock:
+            attr = getattr(self._driver, item)
+        if isinstance(attr, _UNLOCKED_TYPES):
+            return attr
+        if not (isroutine(attr) or isinstance(attr, partial)):
+            return _LockedDriver(attr, self._lock)
+
+        @wraps(attr)
+        def locked_call(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+
+        return locked_call
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            return self._driver(*args, **kwargs)
+
+    def __setattr__(self, key, value):
+        with self._lock:
+            setattr(self._driver, key, value)
+
+    def __deepcopy__(self, memo):
+        return self
+
 
 class DriverManager:
     """
@@ -66,11 +115,23 @@ class DriverManager:
     def disconnect(self): # No Parameters
     and have an attribute
     is_connected (Boolean)
+
+    Set locking = True when the driver manager is shared between the slots of a MultiSlotSequencer.
+    Every call to a driver is then serialised on a lock for that driver only, so slots only wait on each other for
+    the instruments they are both using. Use the lock context manager to hold one or more drivers across several calls
+    >>>dm.locking = True
+    >>>with dm.lock('dmm', 'pps'):
+    >>>    dm.pps.voltage = 5
+    >>>    dm.dmm.measurement()
+
+    Deep copies of the tests, such as those made for each slot, share the driver manager and its drivers
     """
+    locking = False
 
     def __init__(self, **kwargs):
         self.drivers = {}
         self._cleanup = []
+        self._locks = {}
         self.add_drivers(**kwargs)
 
     def add_drivers(self, **kwargs):
@@ -86,6 +147,24 @@ class DriverManager:
         :return:
         """
         self.drivers.update(kwargs)
+        for id in kwargs:
+            self._locks.setdefault(id, RLock())
+
+    @contextmanager
+    def lock(self, *ids):
+        """
+        Holds the locks of the given drivers for the duration of the with block.
+        Locks are always acquired in sorted order to prevent deadlocks between slots
+        :param ids: Drivers to be locked
+        """
+        locks = [self._locks[id] for id in sorted(set(ids))]
+        for lck in locks:
+            lck.acquire()
+        try:
+            yield
+        finally:
+            for lck in reversed(locks):
+                lck.release()
 
     def remove_drivers(self, *ids):
         """
@@ -107,6 +186,7 @@ class DriverManager:
             if drv:
                 drv.disconnect()
                 del self.drivers[id]
+                self._locks.pop(id, None)
 
     def register_initialisation(self, id, init_funcs):
         # TODO Needed? Should this just be done on instantiation of the driver class?
@@ -131,10 +211,15 @@ class DriverManager:
     def cleanup_clear(self):
         self._cleanup.clear()
 
+    def __deepcopy__(self, memo):
+        return self
+
     def __getattr__(self, attr):
         driver = self.drivers.get(attr)
         if driver is None:
             return self.__getattribute__(attr)  # Should Raise Attribute Error
+        if self.locking:
+            return _LockedDriver(driver, self._locks[attr])
         return driver
 
 
@@ -139,6 +139,13 @@ class Lst(TestList):
         print("{}: list exit".format(seq.levels()))
 
 
+class ListScopedLst(Lst):
+    """
+    Dummy Test List with the set_up and tear_down called once for the list
+    """
+    scope = TestList.SCOPE_LIST
+
+
 class FailSetup(TestList):
     """
     Dummy Test List
@@ -218,6 +225,39 @@ test_deep_test_fail = Lst([Test(1),
                            Lst([Test(2), Lst([Test(3), Test(4)])]),
                            Lst([Lst([Test(5), FailTest(6)]), Test(7)]),
                            TestSubclass(10)])
+
+# List scoped expected output
+"""
+1: setup 1
+1: test 1
+1: teardown 1
+2: list enter
+2: list setup
+2.1: setup 2
+2.1: test 2
+2.1: teardown 2
+2.2: list enter
+2.2.1: list setup
+2.2.1: setup 3
+2.2.1: test 3
+2.2.1: teardown 3
+2.2.1: list teardown
+2.2.2: list setup
+2.2.2: setup 4
+2.2.2: test 4
+2.2.2: teardown 4
+2.2.2: list teardown
+2.2: list exit
+2: list teardown
+2: list exit
+3: setup 10
+i'm a subclass
+3: teardown 10
+"""
+tests_list_scope = TestList([Test(1),
+                             ListScopedLst([Test(2), Lst([Test(3), Test(4)])]),
+                             TestSubclass(10)])
+
 test_list_setup_fail = Lst([Test(1),
                             Lst([Test(2), Lst([Test(3), Test(4)])]),
                             FailSetup([Lst([Test(5), Test(6)]), Test(7)]),
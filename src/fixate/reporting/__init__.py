@@ -1 +1,3 @@
-from fixate.reporting.csv import register_csv, unregister_csv
\ No newline at end of file
+from fixate.reporting.csv import register_csv, unregister_csv
+from fixate.reporting.checkpoint import register_checkpoint, unregister_checkpoint, resume_sequence
+from fixate.reporting.profile import register_profile, unregister_profile
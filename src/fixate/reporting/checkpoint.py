@@ -0,0 +1,146 @@
+"""
+Checkpoint journal
+After each completed test a line is appended to a json lines journal at fixate.config.checkpoint_path.
+Each line records the test level, its status and the context_data:
+{"level": "2.1", "status": "PASS", "context_data": {...}}
+Lines are flushed to disk as they are written, so the journal survives a crash of the station.
+If a sequence is interrupted, resume_sequence restores the context_data and continues from the first test that is not
+in the journal. The test counters are rebuilt from the journalled statuses. They aren't journalled as a failed test
+that goes to the retry prompt is only counted after its Test_Complete is sent.
+The journal is removed once a sequence finishes.
+"""
+import json
+import os
+from pubsub import pub
+import fixate.config
+
+PASS_STATUSES = ["PASS"]
+FAIL_STATUSES = ["FAIL"]
+ERROR_STATUSES = ["ERROR", "TIMEOUT"]
+
+
+def journal_path(sequencer):
+    """
+    :return: The journal path for the sequencer. Each slot of a MultiSlotSequencer has its own journal
+    """
+    if sequencer.slot is None:
+        return fixate.config.checkpoint_path
+    base, ext = os.path.splitext(fixate.config.checkpoint_path)
+    return "{}-slot{}{}".format(base, sequencer.slot, ext)
+
+
+def read_journal(sequencer):
+    """
+    :return: The entries of the sequencer's journal in the order they were written
+    """
+    try:
+        with open(journal_path(sequencer), 'r') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            break  # Partially written line from the crash
+    return entries
+
+
+def resume_sequence(sequencer):
+    """
+    Restores a loaded sequencer to the state recorded in its journal so that running it continues from the first
+    incomplete test
+    :param sequencer: The Sequencer with the same tests loaded as when the journal was written
+    :return: True if the sequence was resumed, False if there was no journal to resume from
+    """
+    entries = read_journal(sequencer)
+    if not entries:
+        return False
+    last = entries[-1]
+    index = last["context_data"].get("index")
+    if index != sequencer.context_data.get("index", index):
+        raise ValueError("Checkpoint was recorded for test index {}".format(index))
+    sequencer.context_data.update(last["context_data"])
+    _restore_counters(sequencer, entries)
+    completed = set(entry["level"] for entry in entries)
+    for node in sequencer.plan.nodes:
+        if node.get("lazy"):
+            # The tests of a lazy test list aren't in the plan. Continue after the last one completed
+            prefix = node["level"] + "." if node["level"] else ""
+            done = [int(level[len(prefix):]) for level in completed
+                    if level.startswith(prefix) and level[len(prefix):].isdigit()]
+            if not done:
+                sequencer.resume_from(node["level"])
+                break
+            if last["level"] == "{}{}".format(prefix, max(done)):  # Interrupted inside the lazy test list
+                sequencer.resume_from("{}{}".format(prefix, max(done) + 1))
+                break
+        elif node["test_type"] == "test" and node["level"] not in completed:
+            sequencer.resume_from(node["level"])
+            break
+    else:
+        sequencer.resume_from(None)
+    return True
+
+
+def _restore_counters(sequencer, entries):
+    """
+    Sets the test counters of the sequencer from the final status of each journalled test. A test that was retried
+    from the prompt is journalled once per run
+    """
+    statuses = {entry["level"]: entry["status"].upper() for entry in entries}
+    sequencer.tests_passed = sequencer.tests_failed = sequencer.tests_errored = sequencer.tests_skipped = 0
+    for status in statuses.values():
+        if status in PASS_STATUSES:
+            sequencer.tests_passed += 1
+        elif status in FAIL_STATUSES:
+            sequencer.tests_failed += 1
+        elif status in ERROR_STATUSES:
+            sequencer.tests_errored += 1
+        else:
+            sequencer.tests_skipped += 1
+
+
+class CheckpointJournal:
+    def sequence_start(self):
+        sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        if not sequencer.resumed:
+            # Starting from the beginning. Discard the journal of any previous sequence
+            open(journal_path(sequencer), 'w').close()
+
+    def test_complete(self, data, test_index, status):
+        sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        entry = {"level": test_index,
+                 "status": status,
+                 "context_data": sequencer.context_data}
+        with open(journal_path(sequencer), 'a') as f:
+            f.write(json.dumps(entry, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def sequence_complete(self, status, passed, failed, error, skipped, sequence_status):
+        if sequence_status == "Finished":
+            try:
+                os.remove(journal_path(fixate.config.RESOURCES["SEQUENCER"]))
+            except FileNotFoundError:
+                pass
+
+
+journal = None
+
+
+def register_checkpoint():
+    global journal
+    journal = CheckpointJournal()
+    pub.subscribe(journal.sequence_start, "Sequence_Start")
+    pub.subscribe(journal.test_complete, "Test_Complete")
+    pub.subscribe(journal.sequence_complete, "Sequence_Complete")
+
+
+def unregister_checkpoint():
+    if journal is None:
+        return
+    pub.unsubscribe(journal.sequence_start, "Sequence_Start")
+    pub.unsubscribe(journal.test_complete, "Test_Complete")
+    pub.unsubscribe(journal.sequence_complete, "Sequence_Complete")
@@ -24,6 +24,8 @@ plugins = {
             "index_string={index_string}"]
 First Line
 tpl_first_line
+... If a limits table is loaded
+limits-version=<version of the limits file>
 
 Last Line
 <Time Elapsed (s)>,Sequence,ended=tmp_time_stamp,tests-passed=<passed>,
@@ -45,9 +47,24 @@ Check Function
 <test_val>,<nominal>,<tol>
 ... For passes, fails no more fields
 
+... For chk_array_* the check type is prefixed with array, <test_val> is the worst case value and the limits are
+those at its index, followed by
+passed=<passing values>/<values>,worst-index=<index>
+... If the values are attached, they are written next to the report as little endian float64 in
+<report name>-test<index>-check<index>.f64 and the line ends with
+attachment=<file name>
+... For chk_sequential_* <test_val> is the mean of the measurements, followed by
+samples=<measurements made>
+
 Check Exception
 <Time Elapsed (s)>,Test <index>,check<index>,exception,<exception_message>
 
+Cached Step. A memoised step or test reused its result. The checks of a cached test follow
+<Time Elapsed (s)>,Test <index>,cached,<step name>,age=<seconds since the result was cached>,uses=<reuses>
+
+SPC Drift. The recent values of a check are drifting towards its limits. See fixate.core.spc
+<Time Elapsed (s)>,Test <index>,spc-drift,<description>,cpk=<Cpk of the recent values>,mean=<recent mean>
+
 Test End
 <Time Elapsed (s)>,Test <index>,end,<PASS FAIL ERROR>,checks-passed=<passed>,checks-failed<failed>,checks-error=<errors>
 
@@ -88,13 +105,13 @@ import csv
 import datetime
 import sys
 import os
-import time
 
 from pubsub import pub
 
 from queue import Queue
 from fixate.core.common import TestClass
 from fixate.core.common import ExcThread
+from fixate.core.events import published_time
 import fixate
 import fixate.config
 
@@ -110,14 +127,14 @@ class TestClassImp(TestClass):
 
 
 class CSVWriter:
-    def __init__(self, ):
+    def __init__(self, sequencer=None):
         self.csv_queue = Queue()
         self.csv_writer = None
         # data = fixate.config.get_config_dict()
         # data.update(fixate.config.get_plugin_data('plg_csv'))
         # self.csv_dir = os.path.join(*fixate.config.render_template(data["tpl_csv_path"], **data,
         #                                                            **fixate.config.RESOURCES["SEQUENCER"].context_data))
-        self.reporting = CsvReporting()
+        self.reporting = CsvReporting(self, sequencer)
 
     def install(self):
         self.csv_writer = ExcThread(target=self._csv_write,
@@ -146,7 +163,16 @@ class CSVWriter:
 
 
 class CsvReporting:
-    def __init__(self):
+    def __init__(self, writer=None, sequencer=None):
+        """
+        :param writer:
+         The CSVWriter that lines are queued to. Defaults to the module writer
+        :param sequencer:
+         The slot Sequencer to report on when running a MultiSlotSequencer.
+         Messages from other slots are ignored. Defaults to reporting on every message
+        """
+        self.writer = writer
+        self.sequencer = sequencer
         self.exception_in_test = False
         self.failed = False
         self.chk_cnt = 0
@@ -154,29 +180,69 @@ class CsvReporting:
         self.test_module = None
         self.start_time = None
         self.current_test = None
+        self.restarting = False
         self.data = fixate.config.get_config_dict()
         self.data.update(fixate.config.get_plugin_data('plg_csv'))
 
+    def _in_scope(self):
+        """
+        :return: True if the message being handled was sent by the sequencer this instance reports on
+        """
+        if self.sequencer is None:
+            return True
+        return fixate.config.RESOURCES["SEQUENCER"].active_slot() is self.sequencer
+
     def sequence_update(self, status):
+        if not self._in_scope():
+            return
+        if status == "Restart":
+            # The sequence is being run again, eg. in loop mode. It continues in the same report
+            self.restarting = self.start_time is not None
+            return
         # Do Start Sequence Reporting
         if status in ["Running"]:
             sequencer = fixate.config.RESOURCES["SEQUENCER"]
+            if self.restarting:
+                self.restarting = False
+                restarted = self.data["tpl_time_stamp"].format(datetime.datetime.now())
+                self._write_line_to_csv([self._elapsed(), 'Sequence',
+                                         "restarted={}".format(restarted),
+                                         "loop={}".format(sequencer.context_data.get("loop_iteration", ""))])
+                return
             self.data.update(sequencer.context_data)
             # Create new csv path
             self.data["start_date_time"] = self.data["tpl_time_stamp"].format(datetime.datetime.now())
             self.test_module = sys.modules["module.loaded_tests"]
+            if sequencer.resumed and sequencer.context_data.get("_csv_path"):
+                # Continue appending to the report of the interrupted sequence
+                self.csv_path = sequencer.context_data["_csv_path"]
+                self.start_time = published_time()
+                self._write_line_to_csv(["{:.2f}".format(0), 'Sequence',
+                                         "resumed={}".format(self.data["start_date_time"])])
+                return
             self.csv_path = os.path.join(*fixate.config.render_template(self.data["tpl_csv_path"], **self.data, self=self))
+            if self.sequencer is not None:
+                # Keep the reports of slots started in the same second apart
+                base, ext = os.path.splitext(self.csv_path)
+                self.csv_path = "{}-slot{}{}".format(base, self.sequencer.slot, ext)
+            # Recorded in the checkpoint journal so that a resumed sequence reports to the same file
+            sequencer.context_data["_csv_path"] = self.csv_path
             self.data["fixate_version"] = fixate.__version__
             # Add dev if installed in editable mode
             if 'site-packages' not in __file__:
                 self.data["fixate_version"] += 'dev'
             self.data["test_script_name"] = os.path.basename(self.test_module.__file__).split('.')[0]
             self.data.update(sequencer.context_data)
-            self.start_time = time.clock()
-            self._write_line_to_csv(fixate.config.render_template(self.data["tpl_first_line"], **self.data, self=self))
+            self.start_time = published_time()
+            first_line = fixate.config.render_template(self.data["tpl_first_line"], **self.data, self=self)
+            if sequencer.limits is not None:
+                first_line.append("limits-version={}".format(sequencer.limits.version))
+            self._write_line_to_csv(first_line)
 
     def sequence_complete(self, status, passed, failed, error, skipped, sequence_status):
-        self._write_line_to_csv(["{:.2f}".format(time.clock() - self.start_time),
+        if not self._in_scope():
+            return
+        self._write_line_to_csv([self._elapsed(),
                                  'Sequence',
                                  "ended={}".format(self.data["tpl_time_stamp"].format(datetime.datetime.now())),
                                  sequence_status,
@@ -195,31 +261,58 @@ class CsvReporting:
         :param test_index:
          the test index in the sequencer
         """
+        if not self._in_scope():
+            return
         # Add a test record for this result that is overridden if the test is repeated
         # [0, 0, 0] -> Passed, Failed, Exception
         # Test <test_index>, start, <test name>
-        self._write_line_to_csv(["{:.2f}".format(time.clock() - self.start_time),
+        self._write_line_to_csv([self._elapsed(),
                                  'Test {}'.format(test_index), 'start', data.test_desc, data.test_desc_long])
 
         test_params = self.extract_test_parameters(data)
         self.current_test = test_index
         if len(test_params):
             # Test <test_index>, test-parameters, <param_name>=<param_value>, ...
-            param_line = ["{:.2f}".format(time.clock() - self.start_time),
+            param_line = [self._elapsed(),
                           'Test {}'.format(test_index), 'test-parameters']
             for param_name, param_value in test_params:
                 param_line.append('{}={}'.format(param_name, param_value))
             self._write_line_to_csv(param_line)
 
     def test_exception(self, exception, test_index):
+        if not self._in_scope():
+            return
         self.current_test = test_index
-        exc_line = ["{:.2f}".format(time.clock() - self.start_time),
+        exc_line = [self._elapsed(),
                     'Test {}'.format(test_index),
                     'exception',
                     repr(exception)]
         self._write_line_to_csv(exc_line)
 
+    def step_cached(self, name, age, uses, test_index):
+        if not self._in_scope():
+            return
+        self.current_test = test_index
+        self._write_line_to_csv([self._elapsed(),
+                                 'Test {}'.format(test_index),
+                                 'cached',
+                                 name,
+                                 "age={:.1f}".format(age),
+                                 "uses={}".format(uses)])
+
+    def spc_drift(self, test_index, description, cpk, mean, lower, upper):
+        if not self._in_scope():
+            return
+        self._write_line_to_csv([self._elapsed(),
+                                 'Test {}'.format(test_index),
+                                 'spc-drift',
+                                 description,
+                                 "cpk={:.3g}".format(cpk),
+                                 "mean={:.6g}".format(mean)])
+
     def test_comparison(self, passes, chk, chk_cnt, context):
+        if not self._in_scope():
+            return
         # pub.sendMessage("Check", passes=result, chk=chk, context=self.get_context())
         if passes:
             status = "PASS"
@@ -227,24 +320,32 @@ class CsvReporting:
             status = "FAIL"
         # Test <test_index>, check<number>, <check type>, <status>, <test_val>, <expected>
         # If exception <test_index>, check<number>, <exception details>
-        chk_line = ["{:.2f}".format(time.clock() - self.start_time),
+        chk_line = [self._elapsed(),
                     'Test {}'.format(context),
                     'check{}'.format(chk_cnt),
-                    chk.target.__name__[1:].replace('check_', '').replace('_', ' '),
+                    chk.check_type,
                     chk.description, status, chk.test_val]
         chk_line.extend([x for x in [chk.nominal, chk._min, chk._max, chk.tol] if x is not None])
+        if chk.count is not None:
+            chk_line.extend(["passed={}/{}".format(chk.pass_count, chk.count), "worst-index={}".format(chk.worst_index)])
+            if chk.attachment is not None:
+                chk_line.append("attachment={}".format(self._write_attachment(context, chk_cnt, chk.attachment)))
+        if chk.samples is not None:
+            chk_line.append("samples={}".format(chk.samples))
 
         self._write_line_to_csv(chk_line)
         self.chk_cnt += 1
 
     def test_complete(self, data, test_index, status):
+        if not self._in_scope():
+            return
         self.current_test = test_index
         try:
             sequencer = fixate.config.RESOURCES["SEQUENCER"]
             passed = sequencer.chk_pass
             failed = sequencer.chk_fail
 
-            self._write_line_to_csv(["{:.2f}".format(time.clock() - self.start_time),
+            self._write_line_to_csv([self._elapsed(),
                                      'Test {}'.format(test_index),
                                      'end',
                                      status,
@@ -254,7 +355,9 @@ class CsvReporting:
             self.chk_cnt = 0
 
     def user_wait(self, *args, **kwargs):
-        self._write_line_to_csv(["{:.2f}".format(time.clock() - self.start_time),
+        if not self._in_scope():
+            return
+        self._write_line_to_csv([self._elapsed(),
                                  'Test {}'.format(self.current_test),
                                  'waiting'])
 
@@ -271,14 +374,33 @@ class CsvReporting:
         keys = sorted(set(test_cls.__dict__) - set(comp.__dict__))
         return [(key, test_cls.__dict__[key]) for key in keys]
 
+    def _write_attachment(self, context, chk_cnt, data):
+        """
+        Writes the data attached to a check to a file next to the csv report
+        :return: The file name of the attachment
+        """
+        path = "{}-test{}-check{}.f64".format(os.path.splitext(self.csv_path)[0], context, chk_cnt)
+        try:
+            os.makedirs(os.path.dirname(path))
+        except OSError:
+            pass
+        with open(path, 'wb') as f:
+            f.write(data)
+        return os.path.basename(path)
+
+    def _elapsed(self):
+        """
+        :return: Seconds from the start of the sequence to when the event being reported was published
+        """
+        return "{:.2f}".format(published_time() - self.start_time)
+
     def _write_line_to_csv(self, line):
         """
         :param line:
          single line of data with each column as an element in the list
         :return:
         """
-        global writer
-        writer.csv_queue.put(line)
+        (self.writer or writer).csv_queue.put(line)
         # try:
         #     os.makedirs(self.csv_dir)
         # except OSError:
@@ -289,27 +411,49 @@ class CsvReporting:
 
 
 writer = None
+slot_writers = []
+
+CSV_TOPICS = [("test_start", "Test_Start"),
+              ("test_comparison", "Check"),
+              ("test_exception", "Test_Exception"),
+              ("step_cached", "Step_Cached"),
+              ("spc_drift", "SPC_Drift"),
+              ("test_complete", "Test_Complete"),
+              ("sequence_update", "Sequence_Update"),
+              ("sequence_complete", "Sequence_Complete"),
+              ("user_wait", "UI_req"),
+              ("user_wait", "UI_req_choices"),
+              ("user_wait", "UI_req_input"),
+              ("user_wait", "UI_action")]
+
+
+def _subscribe(csv_writer):
+    csv_writer.install()
+    for method, topic in CSV_TOPICS:
+        pub.subscribe(getattr(csv_writer.reporting, method), topic)
+
+
+def _unsubscribe(csv_writer):
+    for method, topic in CSV_TOPICS:
+        pub.unsubscribe(getattr(csv_writer.reporting, method), topic)
+    csv_writer.uninstall()
 
 
 def register_csv():
     """
-    :param csv_dir: Base directory for for csv file
-    :param args: Args as parsed into the command line interface
+    Registers the csv reporting. If the sequencer is a MultiSlotSequencer each slot gets its own csv file
     :return:
     """
     global writer
-    writer = CSVWriter()
-    writer.install()
-    pub.subscribe(writer.reporting.test_start, 'Test_Start')
-    pub.subscribe(writer.reporting.test_comparison, 'Check')
-    pub.subscribe(writer.reporting.test_exception, "Test_Exception")
-    pub.subscribe(writer.reporting.test_complete, "Test_Complete")
-    pub.subscribe(writer.reporting.sequence_update, "Sequence_Update")
-    pub.subscribe(writer.reporting.sequence_complete, "Sequence_Complete")
-    pub.subscribe(writer.reporting.user_wait, "UI_req")
-    pub.subscribe(writer.reporting.user_wait, "UI_req_choices")
-    pub.subscribe(writer.reporting.user_wait, "UI_req_input")
-    pub.subscribe(writer.reporting.user_wait, "UI_action")
+    slots = getattr(fixate.config.RESOURCES["SEQUENCER"], "slots", None)
+    if slots is None:
+        writer = CSVWriter()
+        _subscribe(writer)
+        return
+    for slot in slots:
+        slot_writer = CSVWriter(sequencer=slot)
+        slot_writers.append(slot_writer)
+        _subscribe(slot_writer)
 
 
 def unregister_csv():
@@ -317,15 +461,9 @@ def unregister_csv():
     Note, will disable the final result eg. Unit Passed
     :return:
     """
-    global writer
-    pub.unsubscribe(writer.reporting.test_start, 'Test_Start')
-    pub.unsubscribe(writer.reporting.test_comparison, 'Check')
-    pub.unsubscribe(writer.reporting.test_exception, "Test_Exception")
-    pub.unsubscribe(writer.reporting.test_complete, "Test_Complete")
-    pub.unsubscribe(writer.reporting.sequence_update, "Sequence_Update")
-    pub.unsubscribe(writer.reporting.sequence_complete, "Sequence_Complete")
-    pub.unsubscribe(writer.reporting.user_wait, "UI_req")
-    pub.unsubscribe(writer.reporting.user_wait, "UI_req_choices")
-    pub.unsubscribe(writer.reporting.user_wait, "UI_req_input")
-    pub.unsubscribe(writer.reporting.user_wait, "UI_action")
-    writer.uninstall()
+    if slot_writers:
+        for slot_writer in slot_writers:
+            _unsubscribe(slot_writer)
+        slot_writers.clear()
+    else:
+        _unsubscribe(writer)
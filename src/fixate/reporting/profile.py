@@ -0,0 +1,32 @@
+"""
+Timing profile report
+Writes the summary of the sequencer's Profiler to a json file at fixate.config.profile_path when a sequence completes.
+See fixate.core.profiler for the phases and the layout of the summary
+"""
+import json
+import os
+from pubsub import pub
+import fixate.config
+
+
+def profile_path(sequencer):
+    """
+    :return: The profile path for the sequencer. Each slot of a MultiSlotSequencer has its own profile
+    """
+    if sequencer.slot is None:
+        return fixate.config.profile_path
+    base, ext = os.path.splitext(fixate.config.profile_path)
+    return "{}-slot{}{}".format(base, sequencer.slot, ext)
+
+
+def write_profile(summary):
+    with open(profile_path(fixate.config.RESOURCES["SEQUENCER"]), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+
+def register_profile():
+    pub.subscribe(write_profile, "Sequence_Profile")
+
+
+def unregister_profile():
+    pub.unsubscribe(write_profile, "Sequence_Profile")
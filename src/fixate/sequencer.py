@@ -1,10 +1,22 @@
 import asyncio
+import bisect
+import copy
 import sys
-import time
+import threading
 import re
-from pubsub import pub
-from fixate.core.common import TestList, TestClass
-from fixate.core.exceptions import SequenceAbort, TestRetryExceeded, CheckFail
+import time
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fixate.core.events import publish
+from fixate.core.common import TestList, TestClass, ExcThread, ConcurrentTestList, LazyTestList, Watchdog
+from fixate.core.profiler import Profiler
+from fixate.core.ordering import order_tests
+from fixate.core.selection import TestSelection
+from fixate.core.statistics import LoopStatistics
+from fixate.core.retry import RetryStatistics
+from fixate.core.sampling import SamplingHistory, SAMPLED_OUT
+from fixate.core.budget import BUDGET_SKIPPED
+from fixate.core.exceptions import SequenceAbort, TestRetryExceeded, CheckFail, TestTimeout
 from fixate.core.ui import user_retry_abort_fail
 
 STATUS_STATES = ["Idle", "Running", "Paused", "Finished", "Restart", "Aborted"]
@@ -16,8 +28,14 @@ def default_retry(*args, **kwargs):
 
 
 class ContextStackNode:
-    def __init__(self, seq):
+    def __init__(self, seq, plan=None):
+        """
+        :param seq: The test list to step through
+        :param plan: The TestPlan nodes of the items in seq, if the test list has been indexed
+        """
         self.index = 0
+        self.plan = plan
+        self.set_up_failed = False  # The set_up of this test list or a test list containing it raised an exception
         if isinstance(seq, TestList):
             self.testlist = seq
         elif isinstance(seq, list):
@@ -31,10 +49,45 @@ class ContextStackNode:
             next_item = self.testlist[self.index]
         return next_item
 
+    def number(self):
+        """
+        :return: The level number of the current item. Tests of a pruned test list keep their original numbers
+        """
+        numbers = self.testlist.numbers
+        if numbers is not None and self.index < len(numbers):
+            return numbers[self.index]
+        return self.index + 1
+
+    def finished(self):
+        """
+        :return: True once the index has moved past the last item of the test list
+        """
+        if isinstance(self.testlist, LazyTestList):
+            # The length of a lazy test list isn't known until its factory runs out of tests
+            return not self.testlist.materialise(self.index)
+        return self.index >= len(self.testlist)
+
+    def plan_node(self):
+        """
+        :return: The TestPlan node of the current item or None if not indexed
+        """
+        if self.plan is None or self.index >= len(self.plan):
+            return None
+        return self.plan[self.index]
+
+    def child_plan(self):
+        """
+        :return: The TestPlan nodes of the items in the current test list or None if not indexed
+        """
+        node = self.plan_node()
+        if node is None:
+            return None
+        return node.get("children")
+
 
 class ContextStack(list):
-    def push(self, test):
-        self.append(ContextStackNode(test))
+    def push(self, test, plan=None):
+        self.append(ContextStackNode(test, plan))
 
     def top(self):
         return self[-1]
@@ -42,7 +95,7 @@ class ContextStack(list):
 
 def test_list_repr(test_list):
     def levels_repr():
-        return ".".join(str(x.index + 1) for x in context[1:])
+        return ".".join(str(x.number()) for x in context[1:])
 
     def curr_test_name():
         return top.current().test_desc
@@ -58,7 +111,7 @@ def test_list_repr(test_list):
 
     while context:
         top = context.top()
-        if top.index >= len(top.testlist):  # Finished tests in the test list
+        if top.finished():  # Finished tests in the test list
             context.pop()
             if context:
                 context.top().index += 1
@@ -76,6 +129,71 @@ def test_list_repr(test_list):
     return ret_list
 
 
+class TestPlan:
+    """
+    Flattened index of a test list, built once when tests are loaded so that progress and tree queries don't have to
+    walk the nested test lists.
+    nodes contains the same dictionaries as test_list_repr in execution order with the additional keys
+    "ordinal": Number of tests up to and including this test. For a test list, the number of tests before it
+    "children": For test lists, the nodes of the items in the list
+    The tests of a LazyTestList aren't indexed. Its node has "lazy": True, no children and counts as its length hint
+    """
+
+    def __init__(self, test_list):
+        self.nodes = []
+        self.levels = {}
+        self.test_count = 0
+        self.children = self._index(test_list)
+        self.tree = [[node["level"], node["test_name"]] for node in self.nodes if node["level"]]
+
+    def _index(self, test_list, level=None):
+        children = []
+        for index in range(len(test_list)):
+            item = test_list[index]
+            if not isinstance(item, TestList) and isinstance(item, list):
+                # Convert a normal list into a TestList as the ContextStackNode would
+                item = test_list[index] = TestList(item)
+            # The items of the root list don't contribute to the level
+            number = test_list.numbers[index] if test_list.numbers is not None else index + 1
+            if level is None:
+                item_level = ""
+            elif level:
+                item_level = "{}.{}".format(level, number)
+            else:
+                item_level = str(number)
+            node = {"level": item_level, "test_name": getattr(item, "test_desc", None), "test_type": None,
+                    "test_skip": False, "parent": get_parent_level(item_level), "ordinal": self.test_count}
+            self.nodes.append(node)
+            self.levels.setdefault(item_level, node)
+            children.append(node)
+            if isinstance(item, TestClass):
+                self.test_count += 1
+                node.update(test_type="test", test_skip=item.skip, ordinal=self.test_count)
+            elif isinstance(item, LazyTestList):
+                node.update(test_type="list", lazy=True, length=len(item))
+                self.test_count += node["length"]
+            elif isinstance(item, TestList):
+                node["test_type"] = "list"
+                node["children"] = self._index(item, item_level)
+        return children
+
+
+def _position(test_list, number):
+    """
+    :return: The index in test_list of the item with the level number
+    """
+    if test_list.numbers is not None:
+        return test_list.numbers.index(number)
+    return number - 1
+
+
+def _per_test_fixture(item):
+    """
+    :return: True if the set_up and tear_down of an item in the context stack are called around each test
+    """
+    return not isinstance(item, TestList) or item.scope == TestList.SCOPE_TEST
+
+
 def get_parent_level(level):
     m = re.match(r'^\d+$', level)
 
@@ -87,9 +205,14 @@ def get_parent_level(level):
 
 
 class Sequencer:
-    def __init__(self):
+    def __init__(self, slot=None):
+        self.slot = slot
+        self.multi_slot = None
+        self._local = threading.local()
+        self._events = None
         self.tests = TestList()
         self._status = "Idle"
+        self._status_change = threading.Condition()
         self.active_test = None
         self.ABORT = False
         # pub.subscribe(self._handle_sequence_abort, "Seq_Abort")
@@ -102,10 +225,33 @@ class Sequencer:
         self.tests_skipped = 0
         self._skip_tests = set([])
         self.context = ContextStack()
+        self.plan = TestPlan(self.tests)
         self.context_data = {}
         self.loop = asyncio.get_event_loop()
         self.retry_type = TestClass.RT_RETRY
         self.end_status = "N/A"
+        self.resumed = False
+        self.profiler = Profiler()
+        self.history = None  # FailureHistory used to run the order independent tests most likely to fail first
+        self.selection = None  # TestSelection of the tests to load
+        # The statistics below are updated as tests complete, which can be on several threads at once. The workers
+        # running a ConcurrentTestList share them with this sequencer, and __main__ gives every slot of a
+        # MultiSlotSequencer the same retry_stats and sampling_history. So each of them locks its updates
+        self.loop_stats = None  # LoopStatistics while running in loop mode
+        self.retry_stats = RetryStatistics()  # How often retries have recovered each test. Kept between sequences
+        self.sampling_history = SamplingHistory()  # Results of the sampled tests on the units tested by the station
+        self._sampled_out = {}  # id of a test with a sampling policy: True if it isn't run on this unit
+        self.estimator = None  # DurationEstimator used to send Sequence_Estimate as tests complete
+        self.budget = None  # TimeBudget used to skip low priority tests so the sequence finishes in time
+        self._budget_plan = None  # (TestPlan, [(test, plan node)], [ordinal]) of the loaded tests for the budget
+        self._sequence_start = perf_counter()
+        self._test_start = None
+        self._recorded_checks = None  # Checks of the active test when its result is memoised
+        self._deadline = None  # perf_counter time the active test times out at
+        self._watchdog = None
+        self.limits = None  # LimitsTable used by chk_limits and chk_array_limits
+        self.defer_check_failures = False  # Run every test to the end before failing it for its failed checks
+        self._deferred_failures = []  # Descriptions of the failed checks of the current attempt when deferred
         # self.retry_type = TestClass.RT_PROMPT
 
     def levels(self):
@@ -113,8 +259,27 @@ class Sequencer:
         Get the current test context from the stack
         :return:
         """
+        worker = self._active_worker()
+        if worker is not None:
+            return worker.levels()
         # Load now pushes whole test list as opposed to extending
-        return ".".join(str(x.index + 1) for x in self.context[1:])
+        return ".".join(str(x.number()) for x in self.context[1:])
+
+    def _active_worker(self):
+        """
+        :return: The worker running a test of a ConcurrentTestList in the calling thread or None
+        """
+        return getattr(self._local, "worker", None)
+
+    def _publish(self, topic, **kwargs):
+        """
+        Sends a test message. Workers of a ConcurrentTestList buffer their messages so that they can be reported in
+        test order once the test is complete
+        """
+        if self._events is None:
+            publish(topic, **kwargs)
+        else:
+            self._events.append((topic, kwargs))
 
     @property
     def status(self):
@@ -126,12 +291,13 @@ class Sequencer:
             raise ValueError("Invalid Sequencer Status")
         # Only if a change in status
         if val != self._status:
-            pub.sendMessage('Sequence_Update', status=val)
+            publish('Sequence_Update', status=val)
             if self._status not in ["Paused"] and val in ["Running"]:
-                pub.sendMessage('Sequence_Start')
+                self.profiler.clear()
+                publish('Sequence_Start')
             if val == "Restart":
                 self._status = "Running"
-                pub.sendMessage('Sequence_Update', status="Running")
+                publish('Sequence_Update', status="Running")
             elif val in ["Aborted", "Finished"]:
                 self._status = val
                 if self.tests_errored or val == "Aborted":
@@ -140,82 +306,140 @@ class Sequencer:
                     self.end_status = "FAILED"
                 else:
                     self.end_status = "PASSED"
+                publish('Sequence_Profile', summary=self.profiler.summary())
                 # This notifies other sections on the final
-                pub.sendMessage('Sequence_Complete', status=self.end_status, passed=self.tests_passed,
+                publish('Sequence_Complete', status=self.end_status, passed=self.tests_passed,
                                 failed=self.tests_failed, error=self.tests_errored, skipped=self.tests_skipped,
                                 sequence_status=self._status)
             else:
                 self._status = val
+            # Wake the run loop if it is waiting on a paused or idle sequence
+            with self._status_change:
+                self._status_change.notify_all()
+
+    def _wait_for_run(self):
+        """
+        Blocks the calling thread until the sequence is Running or Aborted.
+        Status changes notify immediately so a paused sequence does not consume any cpu
+        """
+        with self._status_change:
+            self._status_change.wait_for(lambda: self._status in ["Running", "Aborted"])
 
     def load(self, val):
+        if self.selection is not None or self._skip_tests:
+            # Tests that aren't selected are removed so they aren't walked or set up
+            selection = self.selection or TestSelection()
+            selection = TestSelection(selection.include, selection.exclude + sorted(self._skip_tests))
+            val = selection.prune(val)
+        if self.history is not None:
+            if not isinstance(val, TestList):
+                val = TestList(val)
+            order_tests(val, self.history)
         self.tests.append(val)
-        self.context.push(self.tests)
+        self.plan = TestPlan(self.tests)
+        self.context.push(self.tests, self.plan.children)
         self.end_status = "N/A"
+        self.resumed = False
+
+    def resume_from(self, level):
+        """
+        Rebuilds the context stack so that the sequence continues from the test at level.
+        The test lists leading to the test are entered as they would be when running from the start
+        :param level: Level string of the test to continue from. None if all tests have already completed
+        """
+        if self.status == "Running":
+            raise RuntimeError("Cannot resume while tests are running")
+        self.context[:] = []
+        self.resumed = True
+        if level is None:
+            return
+        parent_level = get_parent_level(level)
+        parent = self.get_level("" if parent_level == "Top" else parent_level)
+        if self.get_level(level) is None and not (parent is not None and parent.get("lazy")):
+            raise ValueError("Cannot resume from unknown test level {}".format(level))
+        self.context.push(self.tests, self.plan.children)
+        numbers = [1] + [int(part) for part in level.split(".")]
+        for number in numbers[:-1]:
+            top = self.context.top()
+            top.index = _position(top.testlist, number)
+            self._push_list()
+        self.context.top().index = _position(self.context.top().testlist, numbers[-1])
 
     def clear_tests(self):
         if self.status == "Running":
             raise RuntimeError("Cannot clear tests while running")
         self.tests[:] = []
+        self.plan = TestPlan(self.tests)
         self.context[:] = []
         self.context_data.clear()
         self.end_status = "N/A"
 
     def count_tests(self):
         """Get the total number of tests"""
-        return sum(1 for test in test_list_repr(self.context[0].testlist) if test.get('test_type') == 'test')
+        return self.plan.test_count
 
     def tests_completed(self):
-        """Count the number of tests remaining"""
-        current_index = "0"
-        search_index = 0
-
-        for index, test in enumerate(self.context):
-            if index == 0:
-                pass
-            elif index == 1:
-                current_index = str(test.index + 1)
-            else:
-                current_index += "." + str(test.index + 1)
-
-        try:
-            for index, test in enumerate(test_list_repr(self.context[0].testlist)):
-                if test.get('test_type') == 'test':
-                    search_index += 1
-                if test.get('level') == current_index:
-                    return search_index
-
-        except IndexError:
+        """Count the number of tests completed, including the active test"""
+        if len(self.context) < 2:
             return 0
-
+        top = self.context.top()
+        node = top.plan_node()
+        if node is not None:
+            return node["ordinal"]
+        parent = self.context[-2].plan_node() if len(self.context) > 2 else None
+        if parent is not None and parent.get("lazy"):
+            # Tests of a lazy test list aren't indexed so count from the position in the list
+            return parent["ordinal"] + min(top.index + 1, parent["length"])
         return 0
 
     def get_tree(self):
         """Get the test tree as a list"""
+        return [item[:] for item in self.plan.tree]
 
-        tree = []
-        tests = test_list_repr(self.context[0].testlist)
-
-        for test in tests:
-            if len(test.get('level')) != 0:
-                tree.append(["", ""])
-                tree[-1][0] = test.get('level')
-                tree[-1][1] = test.get('test_name')
-        return tree
+    def get_level(self, level):
+        """
+        :param level: Level string as returned by levels()
+        :return: The TestPlan node for the level or None if there is no such level
+        """
+        return self.plan.levels.get(level)
 
     def run_sequence(self):
         """
         Runs the sequence from the beginning to end once
         :return:
         """
+        self.sample_tests()
+        self._sequence_start = perf_counter()
         self.status = "Running"
+        self._publish_estimate()
         try:
             self.run_once()
         finally:
             while self.context:
-                top = self.context.top()
-                if isinstance(top.current(), TestList):
-                    top.current().exit()
-                self.context.pop()
+                top = self.context.pop()
+                if self.context:
+                    self._exit_list(top)
+
+    def run_loops(self, n_loops):
+        """
+        Runs the sequence n_loops times reusing the loaded tests, instruments and reporters.
+        Only the counters and the context stack are reset between iterations. The results of each iteration are added
+        to loop_stats and sent with the Loop_Complete message
+        :param n_loops: Number of iterations. -1 to loop until the sequence is aborted
+        """
+        self.loop_stats = LoopStatistics()
+        iteration = 0
+        while n_loops < 0 or iteration < n_loops:
+            iteration += 1
+            self.context_data["loop_iteration"] = iteration
+            start = perf_counter()
+            if iteration > 1:
+                self._restart()
+            self.run_sequence()
+            self.loop_stats.add_iteration(self.end_status, perf_counter() - start)
+            publish("Loop_Complete", iteration=iteration, statistics=self.loop_stats.summary())
+            if self.status == "Aborted":
+                break
 
     def run_once(self):
         """
@@ -227,12 +451,15 @@ class Sequencer:
             if self.status == "Running":
                 try:
                     top = self.context.top()
-                    if top.index >= len(top.testlist):  # Finished tests in the test list
+                    if top.finished():  # Finished tests in the test list
                         self.context.pop()
-                        pub.sendMessage("TestList_Complete", data=top.testlist, test_index=self.levels())
-                        top.testlist.exit()
+                        publish("TestList_Complete", data=top.testlist, test_index=self.levels())
+                        self._exit_list(top)
                         if self.context:
                             self.context.top().index += 1
+                    elif isinstance(top.current(), TestClass) and isinstance(top.testlist, ConcurrentTestList) and \
+                            not top.set_up_failed:
+                        self.run_concurrent()
                     elif isinstance(top.current(), TestClass):
                         if self.run_test():
                             top.index += 1
@@ -241,18 +468,16 @@ class Sequencer:
                                 self.tests_failed += 1
                                 top.index += 1
                     elif isinstance(top.current(), TestList):
-                        pub.sendMessage("TestList_Start", data=top.current(), test_index=self.levels())
-                        top.current().enter()
-                        self.context.push(top.current())
+                        self._push_list()
                     else:
                         raise SequenceAbort("Unknown Test Item Type")
                 except BaseException as e:
-                    pub.sendMessage("Test_Exception", exception=sys.exc_info()[1], test_index=self.levels())
-                    pub.sendMessage("Sequence_Abort", exception=e)
+                    publish("Test_Exception", exception=sys.exc_info()[1], test_index=self.levels())
+                    publish("Sequence_Abort", exception=e)
                     self._handle_sequence_abort()
                     return
             elif self.status != "Aborted":
-                time.sleep(0.1)
+                self._wait_for_run()
             else:
                 return
         self.status = "Finished"
@@ -266,35 +491,87 @@ class Sequencer:
 
         active_test = self.context.top().current()
         active_test_status = "PENDING"
-        pub.sendMessage("Test_Start", data=active_test, test_index=self.levels())
+        self._publish("Test_Start", data=active_test, test_index=self.levels())
         if active_test.skip:
             self.tests_skipped += 1
             active_test_status = "SKIP"
-            pub.sendMessage("Test_Skip", data=active_test, test_index=self.levels())
-            pub.sendMessage("Test_Complete", data=active_test, test_index=self.levels(), status=active_test_status)
+            self._publish("Test_Skip", data=active_test, test_index=self.levels())
+            self._complete_test(active_test, active_test_status)
+            return True
+        if self._is_sampled_out(active_test):
+            self.tests_skipped += 1
+            active_test_status = SAMPLED_OUT
+            self._publish("Test_Skip", data=active_test, test_index=self.levels())
+            self._complete_test(active_test, active_test_status)
+            return True
+        if self._is_budget_skipped(active_test):
+            self.tests_skipped += 1
+            active_test_status = BUDGET_SKIPPED
+            self._publish("Test_Skip", data=active_test, test_index=self.levels())
+            self._complete_test(active_test, active_test_status)
+            return True
+        if self.context.top().set_up_failed:
+            # Reported with the exception from the set_up of the test list
+            self.tests_errored += 1
+            self._complete_test(active_test, "ERROR")
             return True
 
+        self._test_start = perf_counter()
+        if active_test.memoise is not None:
+            cached = active_test.memoise.get(self._memo_key(active_test))
+            if cached is not None:
+                return self._replay_test(active_test, cached)
         attempts = 0
+        retries = 0
+        max_attempts = active_test.attempts if active_test.retry_policy is None else \
+            active_test.retry_policy.max_attempts(active_test)
         abort_exceptions = [SequenceAbort, KeyboardInterrupt]
         abort_exceptions.extend(active_test.abort_exceptions)
         while True:
             attempts += 1
             # Retry exceeded test only when user is not involved in retry process
             try:
-                if attempts > active_test.attempts and attempts != -1:
+                if attempts > max_attempts and attempts != -1:
                     break
+                if attempts > 1:
+                    retries += 1
                 self.chk_fail, self.chk_pass = 0, 0
+                self._deferred_failures = []
+                self._recorded_checks = [] if active_test.memoise is not None else None
+                self.profiler.start_attempt(self.levels())
                 # Run the test
+                timeout = self.test_timeout()
+                if timeout is not None:
+                    self._deadline = perf_counter() + timeout
+                    self._watchdog = Watchdog(timeout, TestTimeout).start()
                 try:
-                    for index_context, current_level in enumerate(self.context):
-                        current_level.current().set_up()
-                    active_test.test()
+                    try:
+                        for index_context, current_level in enumerate(self.context):
+                            if not _per_test_fixture(current_level.current()):
+                                continue
+                            phase = "set_up" if current_level is self.context.top() else "list_set_up"
+                            with self.profiler.phase(phase):
+                                self._call(current_level.current().set_up)
+                        with self.profiler.phase("test"):
+                            self._call(active_test.test)
+                    finally:
+                        # Cancelled before tear down so that a timeout can't interrupt the clean up
+                        self._deadline = None
+                        if self._watchdog is not None:
+                            self._watchdog.cancel()
+                            self._watchdog = None
                 finally:
-                    for current_level in self.context[index_context::-1]:
-                        current_level.current().tear_down()
+                    with self.profiler.phase("tear_down"):
+                        for current_level in self.context[index_context::-1]:
+                            if _per_test_fixture(current_level.current()):
+                                self._call(current_level.current().tear_down)
+                if self._deferred_failures:
+                    raise CheckFail("Checks failed: {}".format(", ".join(self._deferred_failures)))
                 if not self.chk_fail:
                     active_test_status = "PASS"
                     self.tests_passed += 1
+                    if active_test.memoise is not None:
+                        active_test.memoise.put(self._memo_key(active_test), self._recorded_checks)
                 else:
                     active_test_status = "FAIL"
                     self.tests_failed += 1
@@ -309,11 +586,25 @@ class Sequencer:
                     # Retry handle set to skip the test
                     self.tests_failed += 1
                     break
+                if not self._policy_retry(active_test, attempts, sys.exc_info()[1]):
+                    break  # Counted by run_once, as when the attempts run out
+            except TestTimeout:
+                if self.ABORT:  # Program force quit
+                    active_test_status = "ERROR"
+                    raise SequenceAbort("Sequence Aborted")
+                timeout_exception = TestTimeout("Test exceeded its timeout of {}s".format(timeout))
+                self._publish("Test_Exception", exception=timeout_exception, test_index=self.levels())
+                active_test_status = "TIMEOUT"
+                if not self.retry_test(TestClass.RT_RETRY, prompt_message=repr(timeout_exception)):
+                    self.tests_errored += 1
+                    break
+                if not self._policy_retry(active_test, attempts, timeout_exception):
+                    break
             except tuple(abort_exceptions):
                 if self.ABORT:  # Program force quit
                     active_test_status = "ERROR"
                     raise SequenceAbort("Sequence Aborted")
-                pub.sendMessage("Test_Exception", exception=sys.exc_info()[1], test_index=self.levels())
+                self._publish("Test_Exception", exception=sys.exc_info()[1], test_index=self.levels())
                 attempts = 0
                 active_test_status = "ERROR"
                 if not self.retry_test(TestClass.RT_PROMPT):
@@ -324,32 +615,339 @@ class Sequencer:
                 if self.ABORT:  # Program force quit
                     active_test_status = "ERROR"
                     raise SequenceAbort("Sequence Aborted")
-                pub.sendMessage("Test_Exception", exception=sys.exc_info()[1], test_index=self.levels())
+                self._publish("Test_Exception", exception=sys.exc_info()[1], test_index=self.levels())
                 # Retry handle selected to skip the test.
                 # Should be depreciated as test class shouldn't set sequencer behaviour
                 active_test_status = "ERROR"
                 if not self.retry_test(TestClass.RT_RETRY, prompt_message=repr(e)):
                     self.tests_errored += 1
                     break
+                if not self._policy_retry(active_test, attempts, e):
+                    break
             # Retry Logic
-            pub.sendMessage("Test_Retry", data=active_test, test_index=self.levels())
-        pub.sendMessage("Test_Complete", data=active_test, test_index=self.levels(), status=active_test_status)
+            self._publish("Test_Retry", data=active_test, test_index=self.levels())
+        self._recorded_checks = None
+        self.retry_stats.record(active_test.test_desc, retries, active_test_status == "PASS")
+        self._complete_test(active_test, active_test_status)
         return active_test_status == "PASS"
 
-    def retry_test(self, retry_type=None, prompt_message=""):
-        if self.retry_type == TestClass.RT_ABORT or retry_type == TestClass.RT_ABORT:
-            raise SequenceAbort("Sequence Aborted Automatically")
-        elif self.retry_type == TestClass.RT_FAIL or retry_type == TestClass.RT_FAIL:
-            return False
-        elif retry_type == TestClass.RT_RETRY:
+    def _memo_key(self, active_test):
+        """
+        :return: The key the checks of a memoised test are cached with. The test object isn't used as the tests of a
+        LazyTestList are created again each time it is run and a ConcurrentTestList runs copies of its tests
+        """
+        test_class = type(active_test)
+        return "test", self.slot, self.levels(), test_class.__module__ + "." + test_class.__qualname__
+
+    def _replay_test(self, active_test, cached):
+        """
+        Reports the checks of the last passing run of a memoised test instead of running it
+        :param cached: CachedResult of the checks
+        :return: True as only passing runs are cached
+        """
+        self.chk_fail, self.chk_pass = 0, 0
+        self.step_cached(active_test.test_desc, cached)
+        for chk, result in cached.value:
+            self.check(chk, result)
+        self.tests_passed += 1
+        self._complete_test(active_test, "PASS")
+        return True
+
+    def _policy_retry(self, active_test, attempt, exception):
+        """
+        Decides if a failed attempt of the active test is retried automatically by its retry policy. Only called once
+        the sequencer's retry_type has allowed the retry. Waits for the policy's delay before returning.
+        A test the policy won't retry ends as if it had run out of attempts
+        :return: True if the test should be attempted again
+        """
+        policy = active_test.retry_policy
+        if policy is None:
             return True
-        elif retry_type == TestClass.RT_PROMPT:
-            print(prompt_message)
-            status, resp = user_retry_abort_fail(prompt_message)  # TODO Fix me
-            if resp == "ABORT":
-                raise SequenceAbort("Sequence Aborted By User")
-            else:
-                return resp == "RETRY"
+        with self.profiler.phase("retry"):
+            if not policy.should_retry(active_test, attempt, exception, self.retry_stats):
+                return False
+            delay = policy.delay(attempt)
+            if delay > 0:
+                time.sleep(delay)
+        return True
+
+    def sample_tests(self):
+        """
+        Decides which of the loaded tests with a sampling policy are run on this unit. Their plan nodes are marked with
+        "sampled_out". Tests in a LazyTestList are decided when they are reached
+        """
+        self._sampled_out = {}
+        for test, node in self._planned_tests():
+            if test.sampling_policy is not None:
+                node["sampled_out"] = self._is_sampled_out(test)
+
+    def _planned_tests(self, test_list=None, nodes=None):
+        """
+        Yields (test, plan node) for each loaded test in execution order. Tests in a LazyTestList are not included
+        """
+        if test_list is None:
+            test_list, nodes = self.tests, self.plan.children
+        for item, node in zip(test_list, nodes):
+            if isinstance(item, TestClass):
+                yield item, node
+            elif isinstance(item, TestList) and "children" in node:
+                yield from self._planned_tests(item, node["children"])
+
+    def _is_budget_skipped(self, test):
+        """
+        :return: True if the test should be skipped for the remaining tests to fit in the time budget
+        """
+        if self.budget is None:
+            return False
+        if self._budget_plan is None or self._budget_plan[0] is not self.plan:
+            # Built once for the loaded tests rather than before every test
+            planned = list(self._planned_tests())
+            self._budget_plan = self.plan, planned, [node["ordinal"] for _, node in planned]
+        _, planned, ordinals = self._budget_plan
+        completed = self.tests_completed()  # Includes the active test
+        remaining = planned[bisect.bisect_left(ordinals, completed):]
+        if not remaining or remaining[0][0] is not test:
+            return False  # Tests of a LazyTestList aren't planned so they aren't shed
+        fixed = 0.0
+        if self.budget.estimator is not None:
+            fixed = self.budget.estimator.lazy_remaining(self.plan, completed)
+        shed = self.budget.shed(perf_counter() - self._sequence_start, remaining, fixed)
+        return any(item is test for item in shed)
+
+    def _is_sampled_out(self, test):
+        if test.sampling_policy is None:
+            return False
+        if id(test) not in self._sampled_out:
+            self._sampled_out[id(test)] = not test.sampling_policy.should_run(test.test_desc, self.sampling_history)
+        return self._sampled_out[id(test)]
+
+    def _complete_test(self, active_test, status):
+        if active_test.sampling_policy is not None:
+            self.sampling_history.record(active_test.test_desc, status)
+        if self.budget is not None and self._test_start is not None:
+            self.budget.record(active_test.test_desc, perf_counter() - self._test_start)
+        self._test_start = None
+        if self.loop_stats is not None:
+            self.loop_stats.add_test(self.levels(), status)
+        self._publish("Test_Complete", data=active_test, test_index=self.levels(), status=status)
+        self._publish_estimate()
+
+    def _publish_estimate(self):
+        """
+        Sends the expected seconds until the sequence completes and for the whole sequence if there is an estimator
+        """
+        if self.estimator is None:
+            return
+        self._publish("Sequence_Estimate", remaining=self.estimator.remaining(self.plan, self.tests_completed()),
+                      total=self.estimator.remaining(self.plan))
+
+    def _push_list(self):
+        """
+        Enters the test list that is the current item at the top of the context stack and pushes it onto the stack
+        """
+        top = self.context.top()
+        publish("TestList_Start", data=top.current(), test_index=self.levels())
+        try:
+            set_up = self._enter_list(top.current(), set_up=not top.set_up_failed)
+        except BaseException:
+            top.current().exit()  # Not on the context stack to be exited when the sequence aborts
+            raise
+        self.context.push(top.current(), top.child_plan())
+        self.context.top().set_up_failed = not set_up
+
+    def _enter_list(self, test_list, set_up=True):
+        """
+        Called when a test list is entered. The set_up of a list scoped test list is called once here and timed against
+        the level of the list.
+        An exception from set_up, or a check in set_up that failed while check failures are deferred, is prompted to be
+        retried. The list is torn down after each failed set_up, as the
+        fixture of a test is. If it isn't retried, the tests of the list are errored without being run
+        :param set_up: False if the set_up of a test list containing this one failed
+        :return: True unless the set_up of this test list or a test list containing it failed
+        """
+        test_list.enter()
+        if not set_up or test_list.scope != TestList.SCOPE_LIST:
+            return set_up
+        while True:
+            self.profiler.start_attempt(self.levels())
+            self._deferred_failures = []
+            try:
+                with self.profiler.phase("list_set_up"):
+                    self._call(test_list.set_up)
+                if self._deferred_failures:
+                    # Otherwise lost when the first test of the list starts with no deferred failures
+                    raise CheckFail("Checks failed in set_up: {}".format(", ".join(self._deferred_failures)))
+                return True
+            except BaseException as e:
+                with self.profiler.phase("tear_down"):
+                    self._call(test_list.tear_down)
+                if isinstance(e, (SequenceAbort, KeyboardInterrupt)):
+                    raise
+                if self.ABORT:  # Program force quit
+                    raise SequenceAbort("Sequence Aborted")
+                publish("Test_Exception", exception=e, test_index=self.levels())
+                if not self.retry_test(TestClass.RT_PROMPT, prompt_message=repr(e)):
+                    return False
+
+    def _exit_list(self, node):
+        """
+        Called when a test list is exited. The tear_down of a list scoped test list is called once here, unless it was
+        torn down when its set_up failed
+        :param node: ContextStackNode of the test list, already popped from the context stack
+        """
+        test_list = node.testlist
+        try:
+            if test_list.scope == TestList.SCOPE_LIST and not node.set_up_failed:
+                self.profiler.continue_attempt(self.levels())
+                with self.profiler.phase("tear_down"):
+                    self._call(test_list.tear_down)
+        finally:
+            test_list.exit()
+
+    def run_concurrent(self):
+        """
+        Runs the remaining tests of the ConcurrentTestList at the top of the context stack on a thread pool.
+        A test is only started when none of its declared resources are in use by a running test.
+        Each test runs on a worker copy of the sequencer with its own context and check counters. The messages of each
+        test are buffered and sent from this thread in the order of the tests in the list so that reporting is
+        deterministic.
+        """
+        top = self.context.top()
+        test_list = top.testlist
+        pending = list(range(top.index, len(test_list)))
+        for index in pending:
+            if not isinstance(test_list[index], TestClass):
+                raise SequenceAbort("ConcurrentTestList can only contain tests")
+        workers = {}
+        running = {}
+        in_use = set()
+        done = set()
+        with ThreadPoolExecutor(max_workers=test_list.max_workers) as executor:
+            while pending or running:
+                for index in list(pending):
+                    if len(running) >= test_list.max_workers:
+                        break
+                    resources = set(test_list[index].resources)
+                    if resources & in_use:
+                        continue
+                    in_use |= resources
+                    pending.remove(index)
+                    workers[index] = self._spawn_worker(index)
+                    running[executor.submit(self._run_worker, workers[index])] = index
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = running.pop(future)
+                    in_use -= set(test_list[index].resources)
+                    done.add(index)
+                    # Propagates aborts from the worker
+                    future.result()
+                while top.index in done:
+                    self._merge_worker(workers.pop(top.index))
+                    top.index += 1
+
+    def _spawn_worker(self, index):
+        """
+        Creates a copy of the sequencer to run the test at index of the list on top of the context stack
+        """
+        worker = copy.copy(self)
+        worker._local = threading.local()
+        worker._events = []
+        worker.context = ContextStack(copy.copy(node) for node in self.context)
+        worker.context.top().index = index
+        worker.chk_fail, worker.chk_pass = 0, 0
+        worker.tests_failed, worker.tests_passed, worker.tests_errored, worker.tests_skipped = 0, 0, 0, 0
+        return worker
+
+    def _run_worker(self, worker):
+        if self.multi_slot is not None:
+            self.multi_slot._activate(self)
+        self._local.worker = worker
+        try:
+            while not worker.run_test():
+                if not worker.retry_test(TestClass.RT_PROMPT):
+                    worker.tests_failed += 1
+                    break
+        finally:
+            self._local.worker = None
+
+    def _merge_worker(self, worker):
+        """
+        Sends the buffered messages of a completed worker and adds its results to the sequence totals
+        """
+        for topic, kwargs in worker._events:
+            if topic == "Test_Complete":
+                self.chk_fail, self.chk_pass = worker.chk_fail, worker.chk_pass
+            publish(topic, **kwargs)
+        self.tests_failed += worker.tests_failed
+        self.tests_passed += worker.tests_passed
+        self.tests_errored += worker.tests_errored
+        self.tests_skipped += worker.tests_skipped
+
+    def test_timeout(self):
+        """
+        :return: The time limit in seconds for the active test. The smallest timeout of the test and the test lists it
+        is contained in, or None if none of them have a timeout
+        """
+        timeouts = [level.current().timeout for level in self.context]
+        timeouts = [timeout for timeout in timeouts if timeout is not None]
+        return min(timeouts) if timeouts else None
+
+    def _call(self, func):
+        """
+        Calls a test hook. Hooks defined with async def are awaited on the event loop
+        """
+        result = func()
+        if asyncio.iscoroutine(result):
+            return self._await(result)
+        return result
+
+    def _await(self, coro):
+        """
+        Runs a coroutine to completion from the sequencer thread.
+        If the sequencer loop is running in another thread (eg. the ui loop) the coroutine is scheduled onto it.
+        Otherwise it is run on a private loop so that concurrent slots and workers don't compete for the same loop.
+        The watchdog can't interrupt the sequencer thread while it waits for the loop, so while a coroutine runs the
+        timeout of the active test is enforced on the loop instead
+        """
+        if self._deadline is None:
+            return self._run_coroutine(coro)
+        self._watchdog.cancel()
+        result = self._run_coroutine(_with_timeout(coro, self._deadline - perf_counter()))
+        remaining = self._deadline - perf_counter()
+        if remaining <= 0:
+            raise TestTimeout("Test exceeded its timeout")
+        self._watchdog = Watchdog(remaining, TestTimeout).start()
+        return result
+
+    def _run_coroutine(self, coro):
+        if self.loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            try:
+                return future.result()
+            except BaseException:
+                future.cancel()
+                raise
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    def retry_test(self, retry_type=None, prompt_message=""):
+        with self.profiler.phase("retry"):
+            if self.retry_type == TestClass.RT_ABORT or retry_type == TestClass.RT_ABORT:
+                raise SequenceAbort("Sequence Aborted Automatically")
+            elif self.retry_type == TestClass.RT_FAIL or retry_type == TestClass.RT_FAIL:
+                return False
+            elif retry_type == TestClass.RT_RETRY:
+                return True
+            elif retry_type == TestClass.RT_PROMPT:
+                print(prompt_message)
+                status, resp = user_retry_abort_fail(prompt_message)  # TODO Fix me
+                if resp == "ABORT":
+                    raise SequenceAbort("Sequence Aborted By User")
+                else:
+                    return resp == "RETRY"
 
     def _handle_sequence_abort(self):
         self.status = "Aborted"
@@ -357,14 +955,20 @@ class Sequencer:
         self.test_running = False
 
     def skip_test(self, index):
-        try:
-            self._skip_tests.update(index)
-        except TypeError:
+        """
+        Excludes tests from the next load
+        :param index: selection pattern or an iterable of patterns, eg. a level string "2.1". See TestSelection
+        """
+        if isinstance(index, str):
             self._skip_tests.add(index)
+        else:
+            self._skip_tests.update(index)
 
     def _restart(self):
         """
-        Clear the stack and reset test_index to 0
+        Clear the stack and reset the counters so that the loaded tests can be run again.
+        context_data is kept, other than the post sequence information of the previous run, so the sequence continues
+        to report against the same DUT
         :return:
         """
         if self.status == "Running":
@@ -376,19 +980,240 @@ class Sequencer:
         self.tests_passed = 0
         self.tests_errored = 0
         self.tests_skipped = 0
-        self.status = "Restart"
+        self.profiler.clear()  # Restart doesn't send Sequence_Start, which clears it for a new sequence
         self.context[:] = []
-        self.context.push(self.tests)
-        self.context_data.clear()
+        self.context.push(self.tests, self.plan.children)
+        for key in ["_post_sequence_info", "_post_sequence_info_pass", "_post_sequence_info_fail"]:
+            self.context_data.pop(key, None)
         self.end_status = "N/A"
+        self.resumed = False
+        self.ABORT = False
+        self.status = "Restart"
 
     def check(self, chk, result):
+        worker = self._active_worker()
+        if worker is not None:
+            return worker.check(chk, result)
         if result:
             self.chk_pass += 1
         else:
             self.chk_fail += 1
-        pub.sendMessage("Check", passes=result, chk=chk,
+        self._publish("Check", passes=result, chk=chk,
                         chk_cnt=self.chk_pass + self.chk_fail, context=self.levels())
+        if self._recorded_checks is not None:
+            self._recorded_checks.append((chk, result))
         if not result:
+            if self._defers_check_failures():
+                self._deferred_failures.append(chk.description or chk.target.__name__.lstrip("_"))
+                return result
             raise CheckFail("Check function returned failure, aborting test")
         return result
+
+    def _defers_check_failures(self):
+        """
+        :return: True if a failed check lets the active test continue. The test fails once it has run to the end
+        """
+        if self.defer_check_failures:
+            return True
+        if len(self.context) < 2:
+            return False
+        test = self.context.top().current()
+        return isinstance(test, TestClass) and test.defer_check_failures
+
+    def step_cached(self, name, entry):
+        """
+        Reports that a memoised step reused its cached result instead of running
+        :param name: name of the step
+        :param entry: CachedResult that was reused
+        """
+        worker = self._active_worker()
+        if worker is not None:
+            return worker.step_cached(name, entry)
+        self._publish("Step_Cached", name=name, age=entry.age, uses=entry.uses, test_index=self.levels())
+
+
+def _slot_total(name):
+    """
+    Builds a counter property for the MultiSlotSequencer.
+    Inside a slot thread the slot's own counter is returned, otherwise the sum across all slots
+    """
+
+    def getter(self):
+        seq = self.active_slot()
+        if seq is not None:
+            return getattr(seq, name)
+        return sum(getattr(slot, name) for slot in self.slots)
+
+    return property(getter)
+
+
+async def _with_timeout(coro, timeout):
+    """
+    Awaits coro, cancelling it and raising TestTimeout if it takes longer than timeout seconds
+    """
+    task = asyncio.ensure_future(coro)
+    done, _ = await asyncio.wait([task], timeout=max(timeout, 0))
+    if not done:
+        task.cancel()
+        await asyncio.wait([task])  # Let the coroutine clean up
+        raise TestTimeout("Test exceeded its timeout")
+    return task.result()
+
+
+class MultiSlotSequencer:
+    """
+    Runs one Sequencer per fixture slot concurrently so that panelised DUTs are tested in parallel.
+    Each slot has its own context_data, counters and report.
+    When installed as RESOURCES["SEQUENCER"], code executing in a slot thread (checks, ui hooks, reporting) is routed
+    to that slot's Sequencer. Outside of a slot thread the counters and status are aggregated across all slots.
+    Instruments shared between slots should be accessed through a DriverManager with locking enabled
+    """
+
+    def __init__(self, n_slots):
+        if n_slots < 1:
+            raise ValueError("At least one slot is required")
+        self.slots = [Sequencer(slot=index + 1) for index in range(n_slots)]
+        for slot in self.slots:
+            slot.multi_slot = self
+        self._context_data = {}
+        self._local = threading.local()
+
+    tests_passed = _slot_total("tests_passed")
+    tests_failed = _slot_total("tests_failed")
+    tests_errored = _slot_total("tests_errored")
+    tests_skipped = _slot_total("tests_skipped")
+
+    def __getattr__(self, item):
+        # Only called for attributes not found on the MultiSlotSequencer.
+        seq = self.active_slot()
+        if seq is None:
+            raise AttributeError("'{}' is only available from within a slot thread".format(item))
+        return getattr(seq, item)
+
+    def active_slot(self):
+        """
+        :return: The Sequencer of the slot that is running in the calling thread or None
+        """
+        return getattr(self._local, "sequencer", None)
+
+    def _activate(self, seq):
+        self._local.sequencer = seq
+
+    def _deactivate(self):
+        self._local.sequencer = None
+
+    @property
+    def context_data(self):
+        seq = self.active_slot()
+        if seq is not None:
+            return seq.context_data
+        return self._context_data
+
+    @property
+    def status(self):
+        seq = self.active_slot()
+        if seq is not None:
+            return seq.status
+        statuses = [slot.status for slot in self.slots]
+        for status in ["Running", "Paused"]:
+            if status in statuses:
+                return status
+        if "Aborted" in statuses:
+            return "Aborted"
+        return statuses[0]
+
+    @status.setter
+    def status(self, val):
+        seq = self.active_slot()
+        if seq is not None:
+            seq.status = val
+            return
+        for slot in self.slots:
+            self._activate(slot)
+            try:
+                slot.status = val
+            finally:
+                self._deactivate()
+
+    @property
+    def end_status(self):
+        seq = self.active_slot()
+        if seq is not None:
+            return seq.end_status
+        end_statuses = [slot.end_status for slot in self.slots]
+        for end_status in ["N/A", "ERROR", "FAILED"]:
+            if end_status in end_statuses:
+                return end_status
+        return "PASSED"
+
+    def load(self, val):
+        """
+        Loads the test list into every slot. Each slot gets its own copy of the tests so that test classes can hold
+        state without interfering with other slots. Drivers and DriverManagers held by the tests are not copied, so
+        the slots share the instruments and their locks
+        """
+        for index, slot in enumerate(self.slots):
+            slot.context_data.update(self._context_data)
+            slot.load(val if index == 0 else copy.deepcopy(val))
+
+    def clear_tests(self):
+        for slot in self.slots:
+            slot.clear_tests()
+        self._context_data.clear()
+
+    def count_tests(self):
+        seq = self.active_slot()
+        if seq is not None:
+            return seq.count_tests()
+        return sum(slot.count_tests() for slot in self.slots)
+
+    def tests_completed(self):
+        seq = self.active_slot()
+        if seq is not None:
+            return seq.tests_completed()
+        return sum(slot.tests_completed() for slot in self.slots)
+
+    def get_tree(self):
+        return self.slots[0].get_tree()
+
+    def run_sequence(self):
+        """
+        Runs the sequence in every slot concurrently and returns once all slots are complete
+        """
+        self._run_slots("run_sequence")
+
+    def run_loops(self, n_loops):
+        """
+        Loops the sequence in every slot concurrently. Each slot keeps its own loop_stats
+        """
+        self._run_slots("run_loops", n_loops)
+
+    def _run_slots(self, method, *args):
+        threads = [ExcThread(target=self._run_slot, args=(slot, method) + args, name="Slot {}".format(slot.slot))
+                   for slot in self.slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for thread in threads:
+            if thread.exec_info is not None:
+                raise thread.exec_info
+
+    def _run_slot(self, seq, method, *args):
+        self._activate(seq)
+        try:
+            getattr(seq, method)(*args)
+        finally:
+            self._deactivate()
+
+    def _handle_sequence_abort(self):
+        for slot in self.slots:
+            slot._handle_sequence_abort()
+
+    def _restart(self):
+        for slot in self.slots:
+            self._activate(slot)
+            try:
+                slot._restart()
+            finally:
+                self._deactivate()
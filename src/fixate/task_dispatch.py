@@ -1,5 +1,5 @@
-from threading import Timer
 from pubsub import pub
+from fixate.core.common import ExcThread
 from fixate.sequencer import Sequencer
 
 
@@ -12,14 +12,18 @@ class TaskDispatcher:
 
     def __init__(self):
         self.sequencer = Sequencer()
-        self.tick = 0.05
         self.status = "Stopped"
+        self._runner = None
         pub.subscribe(self.process_cmd_queue, 'Command')
 
     def run(self):
-        if self.status == "Running":
-            self.sequencer.run_once()
-            Timer(self.tick, self.run).start()
+        """
+        Runs the sequencer in a background thread.
+        While the sequence is paused the sequencer blocks until the next status change so no polling is required
+        """
+        if self.status == "Running" and not (self._runner and self._runner.is_alive()):
+            self._runner = ExcThread(target=self.sequencer.run_once)
+            self._runner.start()
 
     def process_cmd_queue(self, cmd, data):
         # Each command is only successfully processed once
@@ -33,7 +37,7 @@ class TaskDispatcher:
             self.sequencer.status = "Paused"
             return True
         if cmd == "Seq_Stop":
-            self.sequencer.status = "Stopped"
+            self.sequencer.status = "Aborted"
             return True
         if cmd == "Seq_Load_Tests":
             self.sequencer.load(data)
@@ -74,6 +74,7 @@ def register_cmd_line():
     pub.subscribe(_print_comparisons, 'Check')
     pub.subscribe(_print_errors, "Test_Exception")
     pub.subscribe(_print_sequence_end, "Sequence_Complete")
+    pub.subscribe(_print_loop_complete, "Loop_Complete")
     pub.subscribe(_user_ok, 'UI_req')
     pub.subscribe(_user_choices, "UI_req_choices")
     pub.subscribe(_user_input, 'UI_req_input')
@@ -81,6 +82,8 @@ def register_cmd_line():
     pub.subscribe(_user_display_important, "UI_display_important")
     pub.subscribe(_print_test_skip, 'Test_Skip')
     pub.subscribe(_print_test_retry, 'Test_Retry')
+    pub.subscribe(_print_step_cached, 'Step_Cached')
+    pub.subscribe(_print_spc_drift, 'SPC_Drift')
     pub.subscribe(_user_action, 'UI_action')
     key_hook.install()
 
@@ -258,6 +261,14 @@ def _print_sequence_end(status, passed, failed, error, skipped, sequence_status)
     print('\a')
 
 
+def _print_loop_complete(iteration, statistics):
+    duration = statistics["duration"]
+    print(reformat_text("Loop {}: {} passed of {}. Loop time mean {:.3g}s, min {:.3g}s, max {:.3g}s".format(
+        iteration, statistics["end_statuses"].get("PASSED", 0), statistics["iterations"],
+        duration["mean"], duration["min"], duration["max"])))
+    print("#" * wrapper.width)
+
+
 def _print_test_start(data, test_index):
     print("*" * wrapper.width)
     print(reformat_text("Test {}: {}".format(test_index, data.test_desc)))
@@ -283,6 +294,15 @@ def _print_test_retry(data, test_index):
     print(reformat_text("\nTest {}: Retry".format(test_index)))
 
 
+def _print_step_cached(name, age, uses, test_index):
+    print(reformat_text("\nTest {}: Reused cached result of {} from {:.1f}s ago".format(test_index, name, age)))
+
+
+def _print_spc_drift(test_index, description, cpk, mean, lower, upper):
+    print(reformat_text("\nTest {}: {} is drifting towards its limits, recent mean {:.3g} Cpk {:.2f}".format(
+        test_index, description, mean, cpk)))
+
+
 def _print_errors(exception, test_index):
     print("")
     print("!" * wrapper.width)
@@ -320,14 +340,14 @@ def _print_comparisons(passes, chk, chk_cnt, context):
         print(reformat_text("\nCheck {chk_cnt}: {status} when comparing {test_val} {comparison} {_min} - {_max} : "
                             "{description}".format(
             status=status,
-            comparison=chk.target.__name__[1:].replace('_', ' '),
+            comparison=chk.check_type,
             chk_cnt=chk_cnt,
             description=chk.description, **format_dict)))
     elif chk.nominal is not None and chk.tol is not None:
         print(reformat_text("\nCheck {chk_cnt}: {status} when comparing {test_val} {comparison} {nominal} +- {tol}% : "
                             "{description}".format(
             status=status,
-            comparison=chk.target.__name__[1:].replace('_', ' '),
+            comparison=chk.check_type,
             chk_cnt=chk_cnt,
             description=chk.description, **format_dict)))
     elif chk._min is not None or chk._max is not None or chk.nominal is not None:
@@ -336,7 +356,7 @@ def _print_comparisons(passes, chk, chk_cnt, context):
         print(reformat_text("\nCheck {chk_cnt}: {status} when comparing {test_val} {comparison} {comp_val} : "
                             "{description}".format(
             status=status,
-            comparison=chk.target.__name__[1:].replace('_', ' '),
+            comparison=chk.check_type,
             comp_val=comp_val,
             chk_cnt=chk_cnt,
             description=chk.description, **format_dict)))
@@ -74,6 +74,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
 
     working = pyqtSignal()
     progress = pyqtSignal()
+    estimate = pyqtSignal(float)
     finish = pyqtSignal()
 
     """Class Constructor and destructor"""
@@ -130,6 +131,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
         self.tree_init.connect(self.display_tree)
         self.tree_update.connect(self.update_tree)
         self.progress.connect(self.progress_update)
+        self.estimate.connect(self.estimate_update)
         self.working.connect(self.start_indicator)
 
         sys.excepthook = exception_hook  # TODO DEBUG REMOVE
@@ -151,6 +153,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
         pub.subscribe(self._print_test_start, 'Test_Start')
         pub.subscribe(self._print_test_seq_start, 'TestList_Start')
         pub.subscribe(self._print_test_complete, 'Test_Complete')
+        pub.subscribe(self._print_estimate, 'Sequence_Estimate')
         pub.subscribe(self._print_comparisons, 'Check')
         pub.subscribe(self._print_errors, "Test_Exception")
         pub.subscribe(self._print_sequence_end, "Sequence_Complete")
@@ -380,6 +383,10 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
         if self.worker.worker.sequencer.tests_failed > 0 or self.worker.worker.sequencer.tests_errored > 0:
             self.ProgressBar.setStyleSheet(ERROR_STYLE)
 
+    def estimate_update(self, remaining):
+        minutes, seconds = divmod(int(round(remaining)), 60)
+        self.ProgressBar.setFormat("%p% - {}:{:02d} remaining".format(minutes, seconds))
+
     def get_input(self, message, choices):
         self.Events.append(message)
         self.ActiveEvent.append(message)
@@ -727,6 +734,12 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
         self.label_update.emit(test_index, data.test_desc)
         self.tree_update.emit(test_index, "In Progress")
 
+    def _print_estimate(self, remaining, total):
+        if self.closing:
+            return
+
+        self.estimate.emit(remaining)
+
     def _print_test_seq_start(self, data, test_index):
         if self.closing:
             return
@@ -749,7 +762,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
         # self.event_output("Test {}: {}".format(test_index, status.upper()))
         self.event_output("-" * wrapper.width)
 
-        if status.upper() in ["ERROR", "SKIPPED"]:
+        if status.upper() in ["ERROR", "SKIPPED", "TIMEOUT", "SAMPLED-OUT", "BUDGET-SKIPPED"]:
             return
 
         if sequencer.chk_fail == 0:
@@ -816,7 +829,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
                 "\nCheck {chk_cnt}: {status} when comparing {test_val} {comparison} {_min} - {_max} : "
                 "{description}".format(
                     status=status,
-                    comparison=chk.target.__name__[1:].replace('_', ' '),
+                    comparison=chk.check_type,
                     chk_cnt=chk_cnt,
                     description=chk.description, **format_dict)), status=passes)
         elif chk.nominal is not None and chk.tol is not None:
@@ -824,7 +837,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
                 "\nCheck {chk_cnt}: {status} when comparing {test_val} {comparison} {nominal} +- {tol}% : "
                 "{description}".format(
                     status=status,
-                    comparison=chk.target.__name__[1:].replace('_', ' '),
+                    comparison=chk.check_type,
                     chk_cnt=chk_cnt,
                     description=chk.description, **format_dict)), status=passes)
         elif chk._min is not None or chk._max is not None or chk.nominal is not None:
@@ -834,7 +847,7 @@ class FixateGUI(QtWidgets.QMainWindow, layout.Ui_FixateUI):
                 self.reformat_text("\nCheck {chk_cnt}: {status} when comparing {test_val} {comparison} {comp_val} : "
                                    "{description}".format(
                     status=status,
-                    comparison=chk.target.__name__[1:].replace('_', ' '),
+                    comparison=chk.check_type,
                     comp_val=comp_val,
                     chk_cnt=chk_cnt,
                     description=chk.description, **format_dict)), status=passes)
@@ -0,0 +1,109 @@
+import threading
+import unittest
+from unittest.mock import patch
+from pubsub import pub
+from fixate.core.budget import TimeBudget, BUDGET_SKIPPED
+from fixate.core.common import TestList, TestClass
+from fixate.core.estimator import DurationEstimator
+from fixate.core.ordering import FailureHistory
+from fixate.sequencer import Sequencer
+
+
+class PriorityTest(TestClass):
+    def __init__(self, test_desc, priority):
+        self.test_desc = test_desc
+        super().__init__()
+        self.priority = priority
+        self.runs = 0
+
+    def test(self):
+        self.runs += 1
+
+
+def node(test_desc, skip=False):
+    return {"test_type": "test", "test_name": test_desc, "test_skip": skip}
+
+
+def make_estimator():
+    history = FailureHistory()
+    for test_desc, duration in [("A", 10.0), ("B", 30.0), ("C", 20.0)]:
+        history.record(test_desc, "PASS", duration)
+    return DurationEstimator(history)
+
+
+class TestTimeBudget(unittest.TestCase):
+    def test_shed_lowest_priority(self):
+        a, b, c = PriorityTest("A", 5), PriorityTest("B", 0), PriorityTest("C", 1)
+        remaining = [(a, node("A")), (b, node("B")), (c, node("C"))]
+        budget = TimeBudget(60, make_estimator())
+        self.assertEqual(budget.shed(0, remaining), [])
+        self.assertEqual(budget.shed(10, remaining), [b])
+        self.assertEqual(budget.shed(35, remaining), [b, c])
+        self.assertEqual(budget.shed(10, remaining, fixed=30), [b, c])
+
+    def test_equal_priority_sheds_latest(self):
+        a, b = PriorityTest("A", 0), PriorityTest("C", 0)
+        budget = TimeBudget(25, make_estimator())
+        self.assertEqual(budget.shed(0, [(a, node("A")), (b, node("C"))]), [b])
+
+    def test_keep_priority(self):
+        a, b = PriorityTest("A", 0), PriorityTest("B", 10)
+        budget = TimeBudget(5, make_estimator(), keep_priority=10)
+        self.assertEqual(budget.shed(0, [(a, node("A")), (b, node("B"))]), [a])
+
+    def test_measured_durations(self):
+        budget = TimeBudget(5)
+        self.assertEqual(budget.duration(node("A")), 0.0)
+        budget.record("A", 2.0)
+        budget.record("A", 4.0)
+        self.assertEqual(budget.duration(node("A")), 3.0)
+        self.assertEqual(budget.duration(node("A", skip=True)), 0.0)
+
+    def test_concurrent_records(self):
+        budget = TimeBudget(5)
+
+        def record():
+            for _ in range(1000):
+                budget.record("A", 1.0)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(budget.measured["A"].count, 4000)
+
+
+class TestSequencerBudget(unittest.TestCase):
+    def setUp(self):
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_FAIL
+        self.statuses = []
+        pub.subscribe(self.on_test_complete, "Test_Complete")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_test_complete, "Test_Complete")
+
+    def on_test_complete(self, data, test_index, status):
+        self.statuses.append(status)
+
+    def test_budget_skipped(self):
+        tests = [PriorityTest("A", 5), PriorityTest("B", 0), PriorityTest("C", 1)]
+        self.sequencer.budget = TimeBudget(40, make_estimator())
+        self.sequencer.load(TestList(tests))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.statuses, ["PASS", BUDGET_SKIPPED, "PASS"])
+        self.assertEqual([test.runs for test in tests], [1, 0, 1])
+        self.assertEqual(self.sequencer.tests_skipped, 1)
+        self.assertEqual(self.sequencer.end_status, "PASSED")
+
+    def test_plan_built_once(self):
+        tests = [PriorityTest("A", 0) for _ in range(20)]
+        self.sequencer.budget = TimeBudget(40, make_estimator())
+        self.sequencer.load(TestList(tests))
+        with patch.object(Sequencer, "_planned_tests", autospec=True,
+                          side_effect=Sequencer._planned_tests) as planned_tests:
+            self.sequencer.run_sequence()
+        # Once to sample the tests and once for the budget, not counting the calls for the test lists inside
+        self.assertEqual(len([args for args, _ in planned_tests.call_args_list if len(args) == 1]), 2)
+        self.assertEqual(self.sequencer.tests_passed, 20)
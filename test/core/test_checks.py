@@ -0,0 +1,187 @@
+import math
+import struct
+import unittest
+from unittest.mock import MagicMock, patch
+import fixate.config
+from fixate.core import checks
+from fixate.core.exceptions import ParameterError
+from fixate.core.checks import CheckClass, chk_in_range, chk_log_value, chk_sequential_in_range, \
+    chk_sequential_in_tolerance, chk_array_in_range, chk_array_in_range_equal, chk_array_in_tolerance, \
+    chk_array_smaller_or_equal, chk_array_greater_or_equal, _t_critical
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestCheckClass(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = MagicMock()
+        self.sequencer.check.side_effect = lambda chk, result: result
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def test_fields(self):
+        self.assertFalse(chk_in_range(5, 0, 4, description="Rail"))
+        chk, result = self.sequencer.check.call_args[0]
+        self.assertFalse(result)
+        self.assertEqual((chk.test_val, chk._min, chk._max, chk.nominal, chk.tol, chk.description),
+                         (5, 0, 4, None, None, "Rail"))
+        self.assertEqual((chk.status, chk.exception, chk.test_index, chk.count, chk.attachment),
+                         (None, None, '', None, None))
+        self.assertEqual((chk.target.__name__, chk.check_type), ("_in_range", "in range"))
+
+    def test_slotted(self):
+        self.assertTrue(chk_log_value(1.5))
+        chk = self.sequencer.check.call_args[0][0]
+        self.assertFalse(hasattr(chk, "__dict__"))
+        self.assertEqual((chk.test_val, chk.description, chk.check_type), (1.5, '', "log value"))
+        with self.assertRaises(AttributeError):
+            chk.unknown = 1
+
+    def test_message_parse(self):
+        self.assertTrue(checks._message_parse(target=lambda chk: chk.test_val > 1, test_val=2, description="Custom"))
+        self.assertEqual(self.sequencer.check.call_args[0][0].description, "Custom")
+        self.assertEqual(CheckClass(checks._in_tolerance).check_type, "in tolerance")
+
+
+class TestSequentialChecks(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = MagicMock()
+        self.sequencer.check.side_effect = lambda chk, result: result
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def last_check(self):
+        return self.sequencer.check.call_args[0][0]
+
+    def test_stops_when_certain_to_pass(self):
+        # Two readings 0.6 apart are not enough to be certain from the t distribution with 1 degree of freedom
+        measure = MagicMock(side_effect=[5.3, 4.7, 5.1, 4.9, 5.0])
+        self.assertTrue(chk_sequential_in_range(measure, 4.0, 6.0, description="Rail"))
+        chk = self.last_check()
+        self.assertEqual((chk.samples, measure.call_count), (4, 4))
+        self.assertAlmostEqual(chk.test_val, 5.0)
+        self.assertEqual((chk._min, chk._max, chk.check_type), (4.0, 6.0, "sequential in range"))
+
+    def test_stops_when_certain_to_fail(self):
+        measure = MagicMock(side_effect=[7.0, 7.1, 6.9])
+        self.assertFalse(chk_sequential_in_range(measure, 4.0, 6.0))
+        self.assertEqual(self.last_check().samples, 3)
+
+    def test_max_samples(self):
+        readings = [5.9, 6.2] * 10
+        measure = MagicMock(side_effect=readings)
+        self.assertFalse(chk_sequential_in_range(measure, 4.0, 6.0, max_samples=6))
+        chk = self.last_check()
+        self.assertEqual((chk.samples, measure.call_count), (6, 6))
+        self.assertAlmostEqual(chk.test_val, 6.05)
+
+    def test_noisy_near_limit(self):
+        readings = iter([5.5, 5.9, 5.6, 5.8, 5.7, 5.7, 5.65, 5.75])
+        self.assertTrue(chk_sequential_in_range(lambda: next(readings), 4.0, 6.0, max_samples=8))
+        self.assertGreater(self.last_check().samples, 2)
+
+    def test_in_tolerance(self):
+        measure = MagicMock(side_effect=[-10.1, -9.9, -10.0, -10.05, -9.95])
+        self.assertTrue(chk_sequential_in_tolerance(measure, -10, 5, description="Negative rail"))
+        chk = self.last_check()
+        self.assertEqual((chk.nominal, chk.tol, chk.samples), (-10, 5, 4))
+
+    def test_invalid_samples(self):
+        with self.assertRaises(ParameterError):
+            chk_sequential_in_range(MagicMock(return_value=1.0), 0, 2, min_samples=1)
+        with self.assertRaises(ParameterError):
+            chk_sequential_in_range(MagicMock(return_value=1.0), 0, 2, confidence=0.9)
+
+    def test_t_critical(self):
+        self.assertEqual(_t_critical(0.99, 1), 63.657)
+        self.assertEqual(_t_critical(0.95, 10), 2.228)
+        self.assertEqual(_t_critical(0.999, 100), _t_critical(0.999, 30))
+
+
+class ArrayCheckTests:
+    """
+    Tests of the chk_array_* functions. Run with and without numpy
+    """
+
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = MagicMock()
+        self.sequencer.check.side_effect = lambda chk, result: result
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def last_check(self):
+        return self.sequencer.check.call_args[0][0]
+
+    def test_in_range(self):
+        self.assertTrue(chk_array_in_range([1, 2, 3.5, 2], 0, 4, description="Sweep"))
+        chk = self.last_check()
+        self.assertEqual(self.sequencer.check.call_count, 1)
+        self.assertEqual((chk.count, chk.pass_count, chk.worst_index, chk.test_val), (4, 4, 2, 3.5))
+        self.assertEqual((chk._min, chk._max, chk.target.__name__), (0, 4, "_array_in_range"))
+
+    def test_in_range_fails(self):
+        self.assertFalse(chk_array_in_range([1, 0, 5, 2], 0, 4))
+        chk = self.last_check()
+        self.assertEqual((chk.pass_count, chk.worst_index, chk.test_val), (2, 2, 5))
+        self.assertTrue(chk_array_in_range_equal([1, 0, 4, 2], 0, 4))
+
+    def test_limit_per_value(self):
+        self.assertFalse(chk_array_in_range_equal([1, 2, 3], [0, 0, 3.5], [2, 2.5, 4]))
+        chk = self.last_check()
+        self.assertEqual((chk.pass_count, chk.worst_index, chk._min, chk._max), (2, 2, 3.5, 4))
+
+    def test_tolerance(self):
+        self.assertTrue(chk_array_in_tolerance([9.5, 10, 10.4], 10, 5))
+        self.assertEqual(self.last_check().worst_index, 0)
+        self.assertTrue(chk_array_in_tolerance([-9.6, -10.5], -10, 5))
+        self.assertFalse(chk_array_in_tolerance([9.5, 10, 10.6], [10, 10, 10], 5))
+        chk = self.last_check()
+        self.assertEqual((chk.pass_count, chk.worst_index, chk.nominal, chk.tol), (2, 2, 10, 5))
+
+    def test_one_sided(self):
+        self.assertTrue(chk_array_smaller_or_equal([1, 3, 2], 3))
+        self.assertEqual(self.last_check().worst_index, 1)
+        self.assertFalse(chk_array_greater_or_equal([1, 3, 2], 2))
+        self.assertEqual(self.last_check().worst_index, 0)
+
+    def test_nan_fails(self):
+        self.assertFalse(chk_array_in_range([1, float("nan"), 2], 0, 4))
+        chk = self.last_check()
+        self.assertEqual((chk.pass_count, chk.worst_index), (2, 1))
+        self.assertTrue(math.isnan(chk.test_val))
+
+    def test_attachment(self):
+        chk_array_in_range([1, 2.5], 0, 4)
+        self.assertIsNone(self.last_check().attachment)
+        chk_array_in_range([1, 2.5], 0, 4, attach=True)
+        self.assertEqual(struct.unpack("<2d", self.last_check().attachment), (1.0, 2.5))
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            chk_array_in_range([], 0, 1)
+
+
+class TestArrayChecksPython(ArrayCheckTests, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(checks, "_numpy", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestArrayChecksNumpy(ArrayCheckTests, unittest.TestCase):
+    def test_numpy_arrays(self):
+        values = numpy.linspace(0, 1, 10000)
+        self.assertFalse(chk_array_in_range(values, -1, numpy.full(10000, 0.5)))
+        chk = self.last_check()
+        self.assertEqual((chk.count, chk.pass_count, chk.worst_index), (10000, 5000, 9999))
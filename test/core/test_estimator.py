@@ -0,0 +1,85 @@
+import unittest
+from pubsub import pub
+from fixate.core.common import TestList, TestClass, LazyTestList
+from fixate.core.estimator import DurationEstimator
+from fixate.core.ordering import FailureHistory
+from fixate.core.sampling import EveryNth
+from fixate.sequencer import Sequencer, TestPlan
+
+
+class FastTest(TestClass):
+    """
+    Fast test
+    """
+
+
+class SlowTest(TestClass):
+    """
+    Slow test
+    """
+
+
+class SampledTest(TestClass):
+    """
+    Sampled test
+    """
+    sampling_policy = EveryNth(2)
+
+
+def make_plan(tests):
+    # The sequencer indexes the loaded test list inside its root list
+    return TestPlan(TestList([TestList(tests)]))
+
+
+def make_history():
+    history = FailureHistory()
+    history.record("Fast test", "PASS", 1.0)
+    history.record("Slow test", "PASS", 8.0)
+    history.record("Slow test", "FAIL", 12.0)
+    history.record("Sampled test", "PASS", 20.0)
+    return history
+
+
+class TestDurationEstimator(unittest.TestCase):
+    def test_default_duration(self):
+        self.assertEqual(DurationEstimator(make_history()).default_duration, (1.0 + 10.0 + 20.0) / 3)
+        self.assertEqual(DurationEstimator(FailureHistory()).default_duration, 0.0)
+        self.assertEqual(DurationEstimator(make_history(), default_duration=3).test_duration("Unknown"), 3)
+
+    def test_remaining(self):
+        skipped = SlowTest(skip=True)
+        plan = make_plan([FastTest(), TestList([SlowTest(), skipped]), FastTest()])
+        estimator = DurationEstimator(make_history())
+        self.assertEqual(estimator.remaining(plan), 12.0)
+        self.assertEqual(estimator.remaining(plan, 1), 11.0)
+        self.assertEqual(estimator.remaining(plan, 2), 1.0)
+        self.assertEqual(estimator.plan(plan), [["1", "Fast test", 1.0], ["2.1", "Slow test", 10.0],
+                                                ["2.2", "Slow test", 0.0], ["3", "Fast test", 1.0]])
+
+    def test_lazy_list(self):
+        plan = make_plan([FastTest(), LazyTestList(iter([]), length_hint=4)])
+        estimator = DurationEstimator(make_history(), default_duration=2.0)
+        self.assertEqual(estimator.remaining(plan), 9.0)
+        self.assertEqual(estimator.remaining(plan, 3), 4.0)
+
+
+class TestSequencerEstimate(unittest.TestCase):
+    def setUp(self):
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_FAIL
+        self.sequencer.estimator = DurationEstimator(make_history())
+        self.estimates = []
+        pub.subscribe(self.on_estimate, "Sequence_Estimate")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_estimate, "Sequence_Estimate")
+
+    def on_estimate(self, remaining, total):
+        self.estimates.append((remaining, total))
+
+    def test_estimates(self):
+        self.sequencer.load(TestList([SlowTest(), SampledTest(), FastTest()]))
+        self.sequencer.run_loops(2)
+        self.assertEqual(self.estimates[:4], [(31.0, 31.0), (21.0, 31.0), (1.0, 31.0), (0.0, 31.0)])
+        # The sampled test is not run on the second unit
+        self.assertEqual(self.estimates[4:], [(11.0, 11.0), (1.0, 11.0), (1.0, 11.0), (0.0, 11.0)])
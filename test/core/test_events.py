@@ -0,0 +1,131 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from pubsub import pub
+from fixate.core import events
+from fixate.core.common import TestList, TestClass
+from fixate.core.checks import chk_true
+
+
+class CheckingTest(TestClass):
+    """
+    Makes a number of checks
+    """
+
+    def test(self):
+        for index in range(5):
+            chk_true(True, description=str(index))
+
+
+class TestEventDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        pub.subscribe(self.on_async, "Dispatch_Async")
+        pub.subscribe(self.on_sync, "Dispatch_Sync")
+        events.register_sync_topic("Dispatch_Sync")
+        events.start()
+
+    def tearDown(self):
+        events.stop()
+        events.unregister_sync_topic("Dispatch_Sync")
+        pub.unsubscribe(self.on_async, "Dispatch_Async")
+        pub.unsubscribe(self.on_sync, "Dispatch_Sync")
+
+    def on_async(self, value):
+        self.received.append(("async", value, threading.current_thread()))
+
+    def on_sync(self, value):
+        self.received.append(("sync", value, threading.current_thread()))
+
+    def test_async_delivered_on_dispatch_thread(self):
+        for value in range(3):
+            events.publish("Dispatch_Async", value=value)
+        events.flush()
+        self.assertEqual([(kind, value) for kind, value, _ in self.received],
+                         [("async", 0), ("async", 1), ("async", 2)])
+        self.assertTrue(all(thread is events.dispatcher.thread for _, _, thread in self.received))
+
+    def test_sync_delivered_in_order(self):
+        events.publish("Dispatch_Async", value=0)
+        events.publish("Dispatch_Sync", value=1)
+        self.assertEqual([(kind, value) for kind, value, _ in self.received], [("async", 0), ("sync", 1)])
+        self.assertIs(self.received[1][2], threading.current_thread())
+
+    def test_stop_delivers_queued(self):
+        for value in range(250):
+            events.publish("Dispatch_Async", value=value)
+        events.stop()
+        self.assertEqual([value for _, value, _ in self.received], list(range(250)))
+        # Not running, so delivered synchronously
+        events.publish("Dispatch_Async", value=250)
+        self.assertIs(self.received[-1][2], threading.current_thread())
+
+    def test_published_time(self):
+        def slow(value):
+            time.sleep(0.05)
+
+        def stamp(value):
+            self.received.append((value, events.published_time(), time.perf_counter()))
+
+        pub.subscribe(slow, "Dispatch_Slow")
+        pub.subscribe(stamp, "Dispatch_Stamp")
+        try:
+            events.publish("Dispatch_Slow", value=0)
+            published = time.perf_counter()
+            events.publish("Dispatch_Stamp", value=1)
+            events.flush()
+        finally:
+            pub.unsubscribe(slow, "Dispatch_Slow")
+            pub.unsubscribe(stamp, "Dispatch_Stamp")
+        _, stamped, delivered = self.received[0]
+        self.assertLess(abs(stamped - published), 0.01)
+        self.assertGreater(delivered - published, 0.02)
+        # Outside of a listener it is the current time
+        self.assertGreaterEqual(events.published_time(), delivered)
+
+    def test_listener_exception(self):
+        def broken(value):
+            raise ValueError("Listener failed")
+
+        pub.subscribe(broken, "Dispatch_Async")
+        try:
+            with self.assertLogs(events.logger, "ERROR"):
+                events.publish("Dispatch_Async", value=0)
+                events.flush()
+        finally:
+            pub.unsubscribe(broken, "Dispatch_Async")
+
+
+class TestSequencerEvents(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        import fixate.config
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        self.received = []
+        self.complete = MagicMock()
+        pub.subscribe(self.on_check, "Check")
+        pub.subscribe(self.on_test_complete, "Test_Complete")
+        events.start()
+
+    def tearDown(self):
+        import fixate.config
+        events.stop()
+        pub.unsubscribe(self.on_check, "Check")
+        pub.unsubscribe(self.on_test_complete, "Test_Complete")
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def on_check(self, passes, chk, chk_cnt, context):
+        self.received.append(chk.description)
+
+    def on_test_complete(self, data, test_index, status):
+        self.received.append(status)
+        self.complete(self.sequencer.chk_pass)
+
+    def test_checks_delivered_before_test_complete(self):
+        self.sequencer.load(TestList([CheckingTest(), CheckingTest()]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.received, ["0", "1", "2", "3", "4", "PASS"] * 2)
+        # Test_Complete is synchronous so listeners see the counters of the test
+        self.complete.assert_called_with(5)
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+import fixate.config
+from fixate.core.common import TestList, TestClass
+from fixate.core.checks import chk_limits, chk_array_limits
+from fixate.core.exceptions import MissingLimit, ParameterError
+from fixate.core.limits import LimitsTable, compile_limit
+from fixate.core.ordering import FailureHistory
+from fixate.core.selection import TestSelection
+
+YAML_LIMITS = """
+version: "1.2"
+limits:
+  "2.1":
+    5V rail: {min: 4.75, max: 5.25}
+    Oscillator: {check: in_tolerance_equal, nominal: 16e6, tol: 0.1}
+  "*":
+    Supply current: {max: 0.2}
+"""
+
+CSV_LIMITS = """# version: 7
+level,description,check,min,max,nominal,tol
+2.1,5V rail,,4.75,5.25,,
+*,Supply current,,,0.2,,
+3,Ripple,in_range_equal,0,0.05,,
+"""
+
+
+class RailTest(TestClass):
+    order_independent = True
+
+    def __init__(self, test_desc, value):
+        self.test_desc = test_desc
+        super().__init__()
+        self.value = value
+
+    def test(self):
+        chk_limits(self.value, "Rail")
+
+
+class TestLimitsTable(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_yaml(self):
+        table = LimitsTable.load(self.write("limits.yaml", YAML_LIMITS))
+        self.assertEqual(table.version, "1.2")
+        self.assertEqual(len(table), 3)
+        limit = table.lookup("2.1", "5V rail")
+        self.assertEqual((limit.check, limit.args), ("in_range", (4.75, 5.25)))
+        limit = table.lookup("2.1", "Oscillator")
+        self.assertEqual((limit.check, limit.args), ("in_tolerance_equal", (16e6, 0.1)))
+
+    def test_csv(self):
+        table = LimitsTable.load(self.write("limits.csv", CSV_LIMITS))
+        self.assertEqual(table.version, "7")
+        self.assertEqual(table.lookup("3", "Ripple").check, "in_range_equal")
+        limit = table.lookup("4.2", "Supply current")
+        self.assertEqual((limit.check, limit.args), ("smaller_or_equal", (0.2,)))
+        with self.assertRaises(MissingLimit):
+            table.lookup("4.2", "5V rail")
+
+    def test_version_from_content(self):
+        table = LimitsTable.load(self.write("limits.csv", CSV_LIMITS.split("\n", 1)[1]))
+        self.assertTrue(table.version.startswith("sha1:"))
+
+    def test_large_file(self):
+        rows = ["level,description,min,max"]
+        rows.extend("{}.{},Point {},0,{}".format(i // 100 + 1, i % 100 + 1, i, i + 1) for i in range(10000))
+        table = LimitsTable.load(self.write("limits.csv", "\n".join(rows)))
+        self.assertEqual(len(table), 10000)
+        self.assertEqual(table.lookup("100.100", "Point 9999").args, (0, 10000))
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ParameterError):
+            compile_limit({"min": "abc"})
+        with self.assertRaises(ParameterError):
+            compile_limit({"check": "in_range", "min": 1})
+        with self.assertRaises(ParameterError):
+            compile_limit({"check": "bogus", "min": 1})
+        with self.assertRaises(ParameterError):
+            compile_limit({})
+
+
+class TestLimitChecks(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = MagicMock()
+        self.sequencer.check.side_effect = lambda chk, result: result
+        self.sequencer.levels.return_value = "2.1"
+        self.sequencer.limits = LimitsTable({("2.1", "5V rail"): compile_limit({"min": 4.75, "max": 5.25}),
+                                             ("*", "Ripple"): compile_limit({"max": 0.05}),
+                                             ("*", "Id"): compile_limit({"nominal": 3})})
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def test_chk_limits(self):
+        self.assertTrue(chk_limits(5.0, "5V rail"))
+        chk = self.sequencer.check.call_args[0][0]
+        self.assertEqual((chk.target.__name__, chk._min, chk._max, chk.description), ("_in_range", 4.75, 5.25,
+                                                                                      "5V rail"))
+        self.assertFalse(chk_limits(0.1, "Ripple"))
+
+    def test_chk_array_limits(self):
+        self.assertTrue(chk_array_limits([0.01, 0.04], "Ripple"))
+        self.assertEqual(self.sequencer.check.call_args[0][0].count, 2)
+        with self.assertRaises(ParameterError):
+            chk_array_limits([3, 3], "Id")
+
+    def test_no_table(self):
+        self.sequencer.limits = None
+        with self.assertRaises(MissingLimit):
+            chk_limits(5.0, "5V rail")
+
+
+class TestLimitLevels(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_FAIL
+        self.sequencer.limits = LimitsTable({("1.1", "Rail"): compile_limit({"min": 0, "max": 1}),
+                                             ("2.1", "Rail"): compile_limit({"min": 4, "max": 6}),
+                                             ("2.2", "Rail"): compile_limit({"min": 10, "max": 12})})
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def build(self):
+        return TestList([TestList([RailTest("a", 0.5)]), TestList([RailTest("b", 5), RailTest("c", 11)])])
+
+    def test_selected_test_uses_its_own_limits(self):
+        self.sequencer.selection = TestSelection(["2.1"])
+        self.sequencer.load(self.build())
+        self.sequencer.run_sequence()
+        self.assertEqual((self.sequencer.tests_passed, self.sequencer.end_status), (1, "PASSED"))
+
+    def test_reordered_tests_use_their_own_limits(self):
+        history = FailureHistory()
+        for _ in range(5):
+            history.record("b", "PASS", 1)
+            history.record("c", "FAIL", 1)
+        self.sequencer.history = history
+        self.sequencer.load(self.build())
+        self.assertEqual(self.sequencer.get_tree()[3:], [["2.2", "c"], ["2.1", "b"]])
+        self.sequencer.run_sequence()
+        self.assertEqual((self.sequencer.tests_passed, self.sequencer.end_status), (3, "PASSED"))
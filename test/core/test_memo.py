@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from pubsub import pub
+import fixate.config
+from fixate.core.checks import chk_in_range
+from fixate.core.common import TestList, TestClass, LazyTestList
+from fixate.core.memo import Memoise, StepCache, step_cache
+from fixate.sequencer import Sequencer
+
+
+class ContinuityTest(TestClass):
+    """
+    Fixture continuity
+    """
+    memoise = Memoise(max_uses=2)
+
+    def __init__(self, mock_obj):
+        super().__init__()
+        self.mock = mock_obj
+
+    def set_up(self):
+        self.mock.set_up()
+
+    def test(self):
+        chk_in_range(self.mock.measure(), 0, 1, description="Continuity")
+
+
+class TestStepCache(unittest.TestCase):
+    def test_ttl(self):
+        cache = StepCache()
+        with patch("fixate.core.memo.time.monotonic", return_value=100.0):
+            cache.put("cal", 5)
+        with patch("fixate.core.memo.time.monotonic", return_value=109.0):
+            entry = cache.get("cal", ttl=10)
+            self.assertEqual((entry.value, entry.age, entry.uses), (5, 9.0, 1))
+        with patch("fixate.core.memo.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("cal", ttl=10))
+        self.assertNotIn("cal", cache.entries)
+
+    def test_max_uses(self):
+        cache = StepCache()
+        cache.put("cal", 5)
+        self.assertIsNotNone(cache.get("cal", max_uses=2))
+        self.assertIsNotNone(cache.get("cal", max_uses=2))
+        self.assertIsNone(cache.get("cal", max_uses=2))
+
+    def test_invalidate(self):
+        cache = StepCache()
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.invalidate("a")
+        self.assertEqual(list(cache.entries), ["b"])
+        cache.invalidate()
+        self.assertEqual(cache.entries, {})
+
+
+class TestMemoise(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_FAIL
+        fixate.config.RESOURCES.pop("STEP_CACHE", None)
+        self.cached = []
+        pub.subscribe(self.on_step_cached, "Step_Cached")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_step_cached, "Step_Cached")
+        fixate.config.RESOURCES.pop("STEP_CACHE", None)
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def on_step_cached(self, name, age, uses, test_index):
+        self.cached.append((name, uses))
+
+    def test_decorator(self):
+        calibrate = MagicMock(return_value=1.5)
+        calibrate.__qualname__ = "calibrate"
+        calibrate.__module__ = __name__
+        memoised = Memoise(max_uses=1)(calibrate)
+        self.assertEqual([memoised("dmm"), memoised("dmm"), memoised("dmm"), memoised("dso")], [1.5] * 4)
+        self.assertEqual(calibrate.call_args_list, [(("dmm",),), (("dmm",),), (("dso",),)])
+        self.assertEqual(self.cached, [("calibrate", 1)])
+        self.assertIs(fixate.config.RESOURCES["STEP_CACHE"], step_cache())
+
+    def test_memoised_test(self):
+        mock = MagicMock()
+        mock.measure.return_value = 0.5
+        self.sequencer.load(TestList([ContinuityTest(mock)]))
+        self.sequencer.run_loops(4)
+        self.assertEqual(mock.set_up.call_count, 2)
+        self.assertEqual(self.sequencer.chk_pass, 1)  # The cached check is reported again
+        self.assertEqual(self.cached, [("Fixture continuity", 1), ("Fixture continuity", 2)])
+        self.assertEqual(self.sequencer.tests_passed, 1)
+        self.assertEqual(self.sequencer.end_status, "PASSED")
+
+    def test_created_again(self):
+        mock = MagicMock()
+        mock.measure.return_value = 0.5
+        self.sequencer.load(TestList([LazyTestList(lambda: [ContinuityTest(mock), ContinuityTest(mock)])]))
+        self.sequencer.run_loops(2)
+        # Each level is cached once, and found again for the new tests created in the second loop
+        self.assertEqual(mock.set_up.call_count, 2)
+        self.assertEqual(self.cached, [("Fixture continuity", 1), ("Fixture continuity", 1)])
+
+    def test_failures_not_cached(self):
+        mock = MagicMock()
+        mock.measure.return_value = 5
+        self.sequencer.load(TestList([ContinuityTest(mock)]))
+        self.sequencer.run_loops(2)
+        self.assertEqual(mock.measure.call_count, 2)
+        self.assertEqual(self.cached, [])
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from fixate.core.common import TestList, TestClass
+from fixate.core.ordering import FailureHistory, order_tests
+
+
+class IndependentTest(TestClass):
+    order_independent = True
+
+    def __init__(self, test_desc):
+        self.test_desc = test_desc
+        super().__init__()
+
+
+class DependentTest(TestClass):
+    def __init__(self, test_desc):
+        self.test_desc = test_desc
+        super().__init__()
+
+
+def descriptions(test_list):
+    return [item.test_desc if isinstance(item, TestClass) else descriptions(item) for item in test_list]
+
+
+class TestFailureHistory(unittest.TestCase):
+    def test_probability(self):
+        history = FailureHistory()
+        self.assertEqual(history.failure_probability("new"), 0.5)
+        for status in ["PASS", "PASS", "FAIL", "SKIP"]:
+            history.record("a", status)
+        self.assertEqual(history.failure_probability("a"), 0.4)
+        self.assertIsNone(history.mean_duration("a"))
+
+    def test_score_uses_duration(self):
+        history = FailureHistory()
+        history.record("slow", "FAIL", 10)
+        history.record("quick", "PASS", 0.1)
+        history.record("quick", "FAIL", 0.1)
+        self.assertGreater(history.score("quick"), history.score("slow"))
+
+    def test_csv_and_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "report.csv")
+            with open(csv_path, "w") as f:
+                f.write("0,Sequence,started=20200101-000000\n"
+                        "0.10,Test 1,start,Power,\n"
+                        "0.50,Test 1,end,PASS,checks-passed=1,checks-failed=0\n"
+                        "0.50,Test 2,start,Comms,\n"
+                        "0.70,Test 2,exception,ValueError()\n"
+                        "1.50,Test 2,end,ERROR,checks-passed=0,checks-failed=0\n")
+            history = FailureHistory.from_csv([csv_path])
+            self.assertEqual(history.tests["Power"]["runs"], 1)
+            self.assertEqual(history.tests["Comms"]["failures"], 1)
+            self.assertAlmostEqual(history.mean_duration("Comms"), 1.0)
+            json_path = os.path.join(tmp, "history.json")
+            history.save(json_path)
+            history.add_json(json_path)
+            self.assertEqual(history.tests["Comms"]["runs"], 2)
+            self.assertEqual(FailureHistory.load(json_path).tests["Power"]["runs"], 1)
+
+
+class TestOrderTests(unittest.TestCase):
+    def setUp(self):
+        self.history = FailureHistory()
+        for _ in range(5):
+            self.history.record("a", "PASS", 1)
+            self.history.record("b", "FAIL", 1)
+            self.history.record("c", "PASS", 1)
+            self.history.record("d", "FAIL", 1)
+
+    def test_only_independent_runs_reordered(self):
+        test_list = TestList([IndependentTest("a"), IndependentTest("b"), DependentTest("c"),
+                              IndependentTest("c"), TestList([IndependentTest("a"), IndependentTest("d")]),
+                              IndependentTest("a"), IndependentTest("d")])
+        order_tests(test_list, self.history)
+        self.assertEqual(descriptions(test_list), ["b", "a", "c", "c", ["d", "a"], "d", "a"])
+
+    def test_sequencer_orders_on_load(self):
+        from fixate.sequencer import Sequencer
+        sequencer = Sequencer()
+        sequencer.history = self.history
+        sequencer.load(TestList([IndependentTest("a"), IndependentTest("b")]))
+        self.assertEqual([name for level, name in sequencer.get_tree()], ["b", "a"])
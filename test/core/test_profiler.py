@@ -0,0 +1,134 @@
+import time
+import unittest
+from pubsub import pub
+import fixate.config
+from fixate.core.common import TestList, TestClass
+from fixate.core.checks import chk_true
+from fixate.core.profiler import Profiler
+from fixate.core.ui import user_ok
+from fixate.sequencer import Sequencer
+
+
+class SlowList(TestList):
+    """
+    Test list with a slow set_up
+    """
+
+    def set_up(self):
+        time.sleep(0.02)
+
+
+class ListScopedSlowList(SlowList):
+    """
+    List scoped test list with a slow set_up and tear_down
+    """
+    scope = TestList.SCOPE_LIST
+
+    def tear_down(self):
+        time.sleep(0.02)
+
+
+class PhaseTest(TestClass):
+    """
+    Test with a slow test step that fails its first attempt
+    """
+    attempts = 2
+
+    def __init__(self):
+        super().__init__()
+        self.runs = 0
+
+    def set_up(self):
+        time.sleep(0.01)
+
+    def test(self):
+        self.runs += 1
+        time.sleep(0.03)
+        chk_true(self.runs > 1, description="Passes on retry")
+
+    def tear_down(self):
+        time.sleep(0.01)
+
+
+class PromptTest(TestClass):
+    """
+    Test that waits on the user
+    """
+
+    def test(self):
+        user_ok("Press enter")
+
+
+class TestProfiler(unittest.TestCase):
+    def test_summary(self):
+        profiler = Profiler()
+        profiler.start_attempt("1")
+        profiler.add("test", 2.0)
+        profiler.add("user", 1.5)
+        profiler.start_attempt("1")
+        profiler.add("test", 1.0)
+        profiler.start_attempt("2")
+        profiler.add("set_up", 0.5)
+        summary = profiler.summary(slowest=2)
+        self.assertEqual(summary["total"], 3.5)
+        self.assertEqual(summary["phases"]["test"], 3.0)
+        self.assertEqual(summary["phases"]["user"], 1.5)
+        self.assertEqual(summary["tests"]["1"], {"attempts": 2, "total": 3.0, "test": 3.0, "user": 1.5})
+        self.assertEqual(summary["slowest"], [{"level": "1", "attempt": 1, "phase": "test", "seconds": 2.0},
+                                              {"level": "1", "attempt": 1, "phase": "user", "seconds": 1.5}])
+
+    def test_add_without_attempt(self):
+        profiler = Profiler()
+        profiler.add("user", 1.0)
+        self.assertEqual(profiler.summary()["total"], 0)
+
+
+class TestSequencerProfile(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_RETRY
+        self.summaries = []
+        pub.subscribe(self.on_profile, "Sequence_Profile")
+        pub.subscribe(self.on_user_req, "UI_req")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_profile, "Sequence_Profile")
+        pub.unsubscribe(self.on_user_req, "UI_req")
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def on_profile(self, summary):
+        self.summaries.append(summary)
+
+    def on_user_req(self, msg, q):
+        time.sleep(0.02)
+        q.put("Result")
+
+    def test_phases(self):
+        self.sequencer.load(TestList([SlowList([PhaseTest()]), PromptTest()]))
+        self.sequencer.run_sequence()
+        self.assertEqual(len(self.summaries), 1)
+        tests = self.summaries[0]["tests"]
+        self.assertEqual(tests["1.1"]["attempts"], 2)
+        self.assertGreaterEqual(tests["1.1"]["list_set_up"], 0.04)
+        self.assertGreaterEqual(tests["1.1"]["set_up"], 0.02)
+        self.assertGreaterEqual(tests["1.1"]["test"], 0.06)
+        self.assertGreaterEqual(tests["1.1"]["tear_down"], 0.02)
+        self.assertIn("retry", tests["1.1"])
+        self.assertGreaterEqual(tests["2"]["user"], 0.02)
+        self.assertEqual(self.summaries[0]["slowest"][0]["level"], "1.1")
+
+    def test_list_scope(self):
+        self.sequencer.load(TestList([ListScopedSlowList([TestClass(), TestClass()])]))
+        self.sequencer.run_sequence()
+        tests = self.summaries[0]["tests"]
+        self.assertEqual(tests["1"]["attempts"], 1)
+        self.assertGreaterEqual(tests["1"]["list_set_up"], 0.02)
+        self.assertGreaterEqual(tests["1"]["tear_down"], 0.02)
+        self.assertLess(tests["1.1"]["list_set_up"], 0.02)
+        self.assertLess(tests["1.2"]["tear_down"], 0.02)
+
+    def test_loops(self):
+        self.sequencer.load(TestList([TestClass()]))
+        self.sequencer.run_loops(3)
+        self.assertEqual([summary["tests"]["1"]["attempts"] for summary in self.summaries], [1, 1, 1])
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from fixate.core.common import TestList, TestClass
+from fixate.core.checks import chk_true
+from fixate.core.exceptions import CheckFail
+from fixate.core.retry import RetryPolicy, FixedRetry, BackoffRetry, ExceptionRetry, RetryStatistics
+from fixate.sequencer import Sequencer
+
+
+class MarginalTest(TestClass):
+    """
+    Passes on the attempt given by pass_on
+    """
+
+    def __init__(self, pass_on, retry_policy=None, error=None):
+        super().__init__()
+        self.pass_on = pass_on
+        self.retry_policy = retry_policy
+        self.error = error
+        self.runs = 0
+
+    def test(self):
+        self.runs += 1
+        if self.error is not None and self.runs < self.pass_on:
+            raise self.error
+        chk_true(self.runs >= self.pass_on, description="Marginal")
+
+
+class TestRetryPolicies(unittest.TestCase):
+    def test_attempts(self):
+        test = MarginalTest(1)
+        test.attempts = 2
+        self.assertTrue(RetryPolicy().should_retry(test, 1, None))
+        self.assertFalse(RetryPolicy().should_retry(test, 2, None))
+        self.assertTrue(RetryPolicy(attempts=3).should_retry(test, 2, None))
+
+    def test_delays(self):
+        self.assertEqual(FixedRetry(delay=0.5).delay(3), 0.5)
+        backoff = BackoffRetry(delay=0.1, factor=2, max_delay=0.3)
+        self.assertEqual([backoff.delay(attempt) for attempt in (1, 2, 3)], [0.1, 0.2, 0.3])
+
+    def test_exception_types(self):
+        policy = ExceptionRetry([CheckFail], BackoffRetry(attempts=3, delay=1))
+        test = MarginalTest(1)
+        self.assertTrue(policy.should_retry(test, 1, CheckFail()))
+        self.assertFalse(policy.should_retry(test, 1, ValueError()))
+        self.assertEqual(policy.max_attempts(test), 3)
+        self.assertEqual(policy.delay(2), 2)
+
+    def test_min_recovery_rate(self):
+        test = MarginalTest(1)
+        statistics = RetryStatistics()
+        policy = RetryPolicy(attempts=3, min_recovery_rate=0.2, min_history=3)
+        for _ in range(2):
+            statistics.record(test.test_desc, 2, False)
+        self.assertTrue(policy.should_retry(test, 1, None, statistics))
+        statistics.record(test.test_desc, 2, False)
+        self.assertFalse(policy.should_retry(test, 1, None, statistics))
+
+
+class TestRetryStatistics(unittest.TestCase):
+    def test_record(self):
+        statistics = RetryStatistics()
+        statistics.record("a", 0, True)
+        statistics.record("a", 1, True)
+        statistics.record("a", 2, False)
+        self.assertEqual(statistics.tests["a"], {"runs": 2, "recovered": 1, "retries": 3})
+        self.assertEqual(statistics.recovery_rate("a"), 0.5)
+        self.assertIsNone(statistics.recovery_rate("a", min_history=3))
+        self.assertIsNone(statistics.recovery_rate("b"))
+
+    def test_save_load(self):
+        statistics = RetryStatistics()
+        statistics.record("a", 1, True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "retries.json")
+            statistics.save(path)
+            loaded = RetryStatistics.load(path)
+            loaded.add_json(path)
+        self.assertEqual(loaded.tests["a"], {"runs": 2, "recovered": 2, "retries": 2})
+
+
+class TestSequencerRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_RETRY
+        # Fail and continue when the sequencer prompts after a test fails
+        patcher = patch("fixate.sequencer.user_retry_abort_fail", return_value=("Result", "FAIL"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_backoff_until_pass(self):
+        test = MarginalTest(3, BackoffRetry(attempts=4, delay=0.5, factor=2))
+        self.sequencer.load(TestList([test]))
+        with patch("fixate.sequencer.time.sleep") as sleep:
+            self.sequencer.run_sequence()
+        self.assertEqual(test.runs, 3)
+        self.assertEqual([args[0] for args, _ in sleep.call_args_list], [0.5, 1.0])
+        self.assertEqual(self.sequencer.tests_passed, 1)
+        self.assertEqual(self.sequencer.retry_stats.tests[test.test_desc], {"runs": 1, "recovered": 1, "retries": 2})
+
+    def test_attempts_exhausted(self):
+        test = MarginalTest(5, FixedRetry(attempts=3))
+        self.sequencer.load(TestList([test]))
+        self.sequencer.run_sequence()
+        self.assertEqual(test.runs, 3)
+        self.assertEqual(self.sequencer.end_status, "FAILED")
+        self.assertEqual(self.sequencer.tests_failed, 1)
+
+    def test_refused_retry_counted_once(self):
+        test = MarginalTest(5, FixedRetry(attempts=2))
+        self.sequencer.load(TestList([test]))
+        self.sequencer.run_sequence()
+        self.assertEqual(test.runs, 2)
+        self.assertEqual((self.sequencer.tests_failed, self.sequencer.tests_errored), (1, 0))
+
+    def test_exception_not_retried(self):
+        test = MarginalTest(2, ExceptionRetry([CheckFail], RetryPolicy(attempts=3)), error=ValueError("Not retried"))
+        self.sequencer.load(TestList([test]))
+        self.sequencer.run_sequence()
+        self.assertEqual(test.runs, 1)
+        # Ends as if it had run out of attempts, counted once by the prompt after the test
+        self.assertEqual(self.sequencer.tests_errored + self.sequencer.tests_failed, 1)
+
+    def test_stops_retrying_unrecoverable_test(self):
+        test = MarginalTest(5, RetryPolicy(attempts=3, min_recovery_rate=0.5, min_history=1))
+        self.sequencer.retry_stats.record(test.test_desc, 2, False)
+        self.sequencer.load(TestList([test]))
+        self.sequencer.run_sequence()
+        self.assertEqual(test.runs, 1)
+
+    def test_sequencer_retry_type_overrides_policy(self):
+        self.sequencer.retry_type = TestClass.RT_FAIL
+        test = MarginalTest(2, RetryPolicy(attempts=3))
+        self.sequencer.load(TestList([test]))
+        self.sequencer.run_sequence()
+        self.assertEqual(test.runs, 1)
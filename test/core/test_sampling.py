@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+from pubsub import pub
+from fixate.core.common import TestList, TestClass
+from fixate.core.checks import chk_true
+from fixate.core.sampling import EveryNth, AdaptiveSampling, SamplingHistory, SAMPLED_OUT
+from fixate.sequencer import Sequencer
+
+
+class SweepTest(TestClass):
+    """
+    Frequency sweep
+    """
+    sampling_policy = EveryNth(3)
+
+    def __init__(self):
+        super().__init__()
+        self.runs = 0
+
+    def test(self):
+        self.runs += 1
+        chk_true(True, description="Sweep")
+
+
+class TestSamplingPolicies(unittest.TestCase):
+    def test_every_nth(self):
+        history = SamplingHistory()
+        policy = EveryNth(3)
+        decisions = []
+        for _ in range(7):
+            run = policy.should_run("sweep", history)
+            decisions.append(run)
+            history.record("sweep", "PASS" if run else SAMPLED_OUT)
+        self.assertEqual(decisions, [True, False, False, True, False, False, True])
+
+    def test_adaptive(self):
+        history = SamplingHistory()
+        policy = AdaptiveSampling(every=5, min_yield=0.9, window=10)
+        for _ in range(9):
+            history.record("sweep", "PASS")
+        self.assertTrue(policy.should_run("sweep", history))
+        history.record("sweep", "PASS")
+        self.assertFalse(policy.should_run("sweep", history))
+        history.record("sweep", "FAIL")
+        history.record("sweep", "FAIL")
+        self.assertTrue(policy.should_run("sweep", history))
+
+    def test_ignored_statuses(self):
+        history = SamplingHistory()
+        history.record("sweep", "SKIP")
+        self.assertIsNone(history.units_since_run("sweep"))
+        self.assertNotIn("sweep", history.tests)
+
+    def test_save_load(self):
+        history = SamplingHistory()
+        history.record("sweep", "PASS")
+        history.record("sweep", SAMPLED_OUT)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sampling.json")
+            history.save(path)
+            loaded = SamplingHistory.load(path)
+        self.assertEqual(loaded.tests, {"sweep": {"since_run": 1, "results": [True]}})
+
+
+class TestSequencerSampling(unittest.TestCase):
+    def setUp(self):
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = TestClass.RT_FAIL
+        self.statuses = []
+        pub.subscribe(self.on_test_complete, "Test_Complete")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_test_complete, "Test_Complete")
+
+    def on_test_complete(self, data, test_index, status):
+        self.statuses.append((test_index, status))
+
+    def test_sampled_out(self):
+        sweep = SweepTest()
+        self.sequencer.load(TestList([sweep]))
+        self.sequencer.run_loops(4)
+        self.assertEqual(sweep.runs, 2)
+        self.assertEqual([status for _, status in self.statuses], ["PASS", SAMPLED_OUT, SAMPLED_OUT, "PASS"])
+        self.assertEqual(self.sequencer.end_status, "PASSED")
+        self.assertEqual(self.sequencer.sampling_history.units_since_run(sweep.test_desc), 0)
+
+    def test_decided_at_plan_time(self):
+        sweep = SweepTest()
+        self.sequencer.sampling_history.record(sweep.test_desc, "PASS")
+        self.sequencer.load(TestList([sweep]))
+        self.sequencer.sample_tests()
+        self.assertTrue(self.sequencer.plan.levels["1"]["sampled_out"])
@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock, call
+from fixate.core.common import TestList, TestClass, LazyTestList
+from fixate.core.selection import TestSelection
+
+
+class NamedTest(TestClass):
+    def __init__(self, name, mock_obj=None, tags=()):
+        self.test_desc = name
+        super().__init__()
+        self.mock = mock_obj
+        self.tags = list(tags)
+
+    def test(self):
+        self.mock.test(self.test_desc)
+
+
+class PowerTest(NamedTest):
+    pass
+
+
+class TrackedList(TestList):
+    def __init__(self, seq, name, mock_obj):
+        super().__init__(seq)
+        self.name = name
+        self.mock = mock_obj
+
+    def enter(self):
+        self.mock.enter(self.name)
+
+    def set_up(self):
+        self.mock.set_up(self.name)
+
+
+def names(test_list):
+    return [item.test_desc if isinstance(item, TestClass) else names(item) for item in test_list]
+
+
+class TestTestSelection(unittest.TestCase):
+    def build(self, mock_obj=None):
+        if mock_obj is None:
+            mock_obj = MagicMock()
+        return TestList([NamedTest("a", mock_obj),
+                         TrackedList([NamedTest("b", mock_obj),
+                                      TrackedList([NamedTest("c", mock_obj), PowerTest("d", mock_obj)], "2.2",
+                                                  mock_obj),
+                                      NamedTest("e", mock_obj, tags=["rework"])], "2", mock_obj),
+                         [PowerTest("f", mock_obj), NamedTest("g", mock_obj)]])
+
+    def test_no_selection(self):
+        self.assertEqual(names(TestSelection().prune(self.build())), ["a", ["b", ["c", "d"], "e"], ["f", "g"]])
+
+    def test_levels(self):
+        self.assertEqual(names(TestSelection(["2.2.*"]).prune(self.build())), [[["c", "d"]]])
+        self.assertEqual(names(TestSelection(["2.2", "1"]).prune(self.build())), ["a", [["c", "d"]]])
+        self.assertEqual(names(TestSelection(["3.?"]).prune(self.build())), [["f", "g"]])
+
+    def test_class_names_and_tags(self):
+        self.assertEqual(names(TestSelection(["PowerTest"]).prune(self.build())), [[["d"]], ["f"]])
+        self.assertEqual(names(TestSelection(["tag:rework", "TrackedList"], ["2.2"]).prune(self.build())),
+                         [["b", "e"]])
+
+    def test_exclude_only(self):
+        self.assertEqual(names(TestSelection(exclude=["2", "3.2"]).prune(self.build())), ["a", ["f"]])
+
+    def test_nothing_selected(self):
+        self.assertEqual(names(TestSelection(["9"]).prune(self.build())), [])
+
+    def test_original_not_modified(self):
+        test_list = self.build()
+        TestSelection(["1"]).prune(test_list)
+        self.assertEqual(names(test_list), ["a", ["b", ["c", "d"], "e"], ["f", "g"]])
+
+    def test_lazy_list_kept_whole(self):
+        lazy = LazyTestList(lambda: iter([NamedTest("x"), NamedTest("y")]), length_hint=2)
+        pruned = TestSelection(["1", "NamedTest"]).prune(TestList([lazy, TestList([lazy])]))
+        self.assertEqual(len(pruned), 1)
+        self.assertIs(pruned[0], lazy)
+
+    def test_original_levels_kept(self):
+        from pubsub import pub
+        from fixate.sequencer import Sequencer
+        levels = []
+
+        def on_test_start(data, test_index):
+            levels.append(test_index)
+
+        sequencer = Sequencer()
+        sequencer.selection = TestSelection(["2.2.2", "3.2"])
+        sequencer.load(self.build())
+        self.assertEqual([level for level, name in sequencer.get_tree()], ["2", "2.2", "2.2.2", "3", "3.2"])
+        pub.subscribe(on_test_start, "Test_Start")
+        try:
+            sequencer.run_sequence()
+            self.assertEqual(levels, ["2.2.2", "3.2"])
+            levels.clear()
+            sequencer.status = "Idle"
+            sequencer.resume_from("3.2")
+            sequencer.run_sequence()
+        finally:
+            pub.unsubscribe(on_test_start, "Test_Start")
+        self.assertEqual(levels, ["3.2"])
+
+    def test_sequencer_runs_selected(self):
+        from fixate.sequencer import Sequencer
+        mock_obj = MagicMock()
+        sequencer = Sequencer()
+        sequencer.selection = TestSelection(["2.2.2"])
+        sequencer.skip_test("3")
+        sequencer.load(self.build(mock_obj))
+        self.assertEqual(sequencer.count_tests(), 1)
+        sequencer.run_sequence()
+        self.assertEqual(mock_obj.mock_calls, [call.enter("2"), call.enter("2.2"), call.set_up("2"),
+                                               call.set_up("2.2"), call.test("d")])
+        self.assertEqual(sequencer.tests_passed, 1)
@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import time
 import unittest
 from unittest.mock import MagicMock, call
@@ -225,3 +227,694 @@ class TestSequencerTests(unittest.TestCase):
         self.mock_master = None
         pub.unsubscribe(self.abort_on_error, "UI_req")
         self.test_cls.clear_tests()
+
+
+class ChecksTest(FixateTC):
+    """
+    Test that logs a pass and a fail check
+    """
+
+    def __init__(self, results):
+        super().__init__()
+        self.results = results
+
+    def test(self):
+        from fixate.core.checks import chk_true
+        for result in self.results:
+            chk_true(result, description="result")
+
+
+class TestMultiSlotSequencer(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import MultiSlotSequencer
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.multi_slot = MultiSlotSequencer(3)
+        for slot in self.multi_slot.slots:
+            slot.retry_type = FixateTC.RT_FAIL
+        fixate.config.RESOURCES["SEQUENCER"] = self.multi_slot
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def test_slots_have_independent_copies(self):
+        mock = MagicMock()
+        self.multi_slot.load(FixateTL([SubclassOfFixateTest(1, mock), SubclassOfFixateTest(2, mock)]))
+        tests = [slot.tests[0][0] for slot in self.multi_slot.slots]
+        self.assertEqual(len(set(id(test) for test in tests)), 3)
+        self.assertEqual(self.multi_slot.count_tests(), 6)
+
+    def test_slots_share_drivers(self):
+        from fixate.drivers import DriverManager
+        dm = DriverManager(dmm=MagicMock())
+        dm.locking = True
+        test = SubclassOfFixateTest(1, MagicMock())
+        test.dm = dm
+        self.multi_slot.load(FixateTL([test]))
+        for slot in self.multi_slot.slots:
+            self.assertIs(slot.tests[0][0].dm, dm)
+
+    def test_slot_counters_and_routing(self):
+        self.multi_slot.load(FixateTL([ChecksTest([True, True])]))
+        self.multi_slot.slots[1].tests[0][0].results = [True, False]
+        self.multi_slot.run_sequence()
+        self.assertEqual([slot.end_status for slot in self.multi_slot.slots], ["PASSED", "FAILED", "PASSED"])
+        self.assertEqual(self.multi_slot.tests_passed, 2)
+        self.assertEqual(self.multi_slot.tests_failed, self.multi_slot.slots[1].tests_failed)
+        self.assertEqual(self.multi_slot.end_status, "FAILED")
+
+    def test_slot_context_data(self):
+        self.multi_slot.context_data["index"] = "default"
+        self.multi_slot.load(FixateTL([]))
+        self.multi_slot.slots[0].context_data["serial_number"] = "1"
+        self.assertEqual(self.multi_slot.slots[2].context_data, {"index": "default"})
+        self.assertEqual(self.multi_slot.slots[0].context_data, {"index": "default", "serial_number": "1"})
+
+
+class TestSequencerPauseResume(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.sequencer = Sequencer()
+        self.mock = MagicMock()
+        self.sequencer.load(FixateTL([SubclassOfFixateTest(1, self.mock)]))
+        self.sequencer.status = "Paused"
+        self.runner = threading.Thread(target=self.sequencer.run_once)
+        self.runner.start()
+
+    def tearDown(self):
+        if self.runner.is_alive():
+            self.sequencer.status = "Aborted"
+            self.runner.join()
+
+    def test_paused_sequence_waits(self):
+        self.runner.join(0.2)
+        self.assertTrue(self.runner.is_alive())
+        self.mock.test_test.assert_not_called()
+
+    def test_resume_wakes_immediately(self):
+        self.runner.join(0.05)
+        start = time.perf_counter()
+        self.sequencer.status = "Running"
+        self.runner.join(1)
+        self.assertFalse(self.runner.is_alive())
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.mock.test_test.assert_called_once_with(1)
+        self.assertEqual(self.sequencer.status, "Finished")
+
+    def test_abort_wakes_immediately(self):
+        self.runner.join(0.05)
+        self.sequencer.status = "Aborted"
+        self.runner.join(1)
+        self.assertFalse(self.runner.is_alive())
+        self.mock.test_test.assert_not_called()
+
+
+class ProgressTest(FixateTC):
+    """
+    Records the progress reported by the sequencer while running
+    """
+
+    def __init__(self, sequencer, progress):
+        super().__init__()
+        self.sequencer = sequencer
+        self.progress = progress
+
+    def test(self):
+        self.progress.append(self.sequencer.tests_completed())
+
+
+class TestTestPlan(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.sequencer = Sequencer()
+        self.progress = []
+
+    def build(self):
+        return FixateTL([ProgressTest(self.sequencer, self.progress),
+                         [ProgressTest(self.sequencer, self.progress),
+                          FixateTL([ProgressTest(self.sequencer, self.progress)]),
+                          ProgressTest(self.sequencer, self.progress)],
+                         FixateTL([]),
+                         ProgressTest(self.sequencer, self.progress)])
+
+    def test_plan_matches_test_list_repr(self):
+        from fixate.sequencer import test_list_repr
+        self.sequencer.load(self.build())
+        expected = test_list_repr(self.sequencer.tests)
+        nodes = [{k: v for k, v in node.items() if k not in ("ordinal", "children")}
+                 for node in self.sequencer.plan.nodes]
+        self.assertEqual(nodes, expected)
+        self.assertEqual(self.sequencer.count_tests(), 5)
+        self.assertEqual(self.sequencer.get_tree(),
+                         [[test["level"], test["test_name"]] for test in expected if test["level"]])
+
+    def test_level_lookup(self):
+        self.sequencer.load(self.build())
+        self.assertEqual(self.sequencer.get_level("2.2.1")["ordinal"], 3)
+        self.assertEqual(self.sequencer.get_level("2.2")["test_type"], "list")
+        self.assertEqual(self.sequencer.get_level("2.2")["parent"], "2")
+        self.assertIsNone(self.sequencer.get_level("9"))
+
+    def test_progress_while_running(self):
+        self.sequencer.load(self.build())
+        self.sequencer.run_sequence()
+        self.assertEqual(self.progress, [1, 2, 3, 4, 5])
+        self.assertEqual(self.sequencer.count_tests(), 5)
+
+    def test_clear_tests(self):
+        self.sequencer.load(self.build())
+        self.sequencer.clear_tests()
+        self.assertEqual(self.sequencer.count_tests(), 0)
+        self.assertEqual(self.sequencer.get_tree(), [])
+
+
+class TestLazyTestList(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.sequencer = Sequencer()
+        self.progress = []
+        self.created = []
+
+    def factory(self):
+        for index in range(3):
+            self.created.append(index)
+            yield ProgressTest(self.sequencer, self.progress)
+
+    def test_tests_created_as_reached(self):
+        from fixate.core.common import LazyTestList
+        lazy = LazyTestList(self.factory, length_hint=3)
+        self.sequencer.load(FixateTL([lazy, ProgressTest(self.sequencer, self.progress)]))
+        self.assertEqual(self.created, [])
+        self.assertEqual(self.sequencer.count_tests(), 4)
+        self.assertEqual(self.sequencer.get_tree(),
+                         [["1", "LazyTestList"], ["2", "Records the progress reported by the sequencer while running"]])
+        self.sequencer.run_sequence()
+        self.assertEqual(self.created, [0, 1, 2])
+        self.assertEqual(self.progress, [1, 2, 3, 4])
+        self.assertEqual(self.sequencer.tests_passed, 4)
+        # Tests are released once run
+        self.assertLessEqual(len(lazy.tests), 1)
+
+    def test_length_hint_differs(self):
+        from fixate.core.common import LazyTestList
+        self.sequencer.load(FixateTL([LazyTestList(self.factory, length_hint=2)]))
+        self.assertEqual(self.sequencer.count_tests(), 2)
+        self.sequencer.run_sequence()
+        self.assertEqual(self.sequencer.tests_passed, 3)
+        self.assertEqual(self.progress, [1, 2, 2])
+        self.assertEqual(self.sequencer.status, "Finished")
+
+    def test_loops(self):
+        from fixate.core.common import LazyTestList
+        self.sequencer.load(FixateTL([LazyTestList(self.factory, length_hint=3)]))
+        self.sequencer.run_loops(2)
+        self.assertEqual(self.sequencer.loop_stats.end_statuses, {"PASSED": 2})
+        self.assertEqual(self.created, [0, 1, 2, 0, 1, 2])
+
+    def test_released_test(self):
+        from fixate.core.common import LazyTestList
+        lazy = LazyTestList(self.factory())
+        self.assertEqual(len(lazy), 0)
+        self.assertIsInstance(lazy[1], ProgressTest)
+        with self.assertRaises(IndexError):
+            lazy[0]
+        with self.assertRaises(IndexError):
+            lazy[3]
+        self.assertEqual(len(lazy), 3)
+
+    def test_copy(self):
+        import copy
+        from fixate.core.common import LazyTestList
+        lazy = LazyTestList(self.factory, length_hint=3)
+        lazy[2]
+        copied = copy.deepcopy(lazy)
+        self.assertIsInstance(copied[0], ProgressTest)
+        with self.assertRaises(TypeError):
+            copy.deepcopy(LazyTestList(self.factory()))
+
+
+class ListScopedLst(Lst):
+    """
+    Mock Test List with list scoped set_up and tear_down
+    """
+    scope = FixateTL.SCOPE_LIST
+
+
+class TestFixtureScope(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = FixateTC.RT_FAIL
+        self.mock = MagicMock()
+
+    def test_list_scope(self):
+        self.sequencer.load(FixateTL([ListScopedLst([SubclassOfFixateTest(2, self.mock),
+                                                     Lst([SubclassOfFixateTest(4, self.mock)], 3, self.mock),
+                                                     SubclassOfFixateTest(5, self.mock)], 1, self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.mock.mock_calls, [call.list_enter(1),
+                                                call.list_setup(1),
+                                                call.test_setup(2),
+                                                call.test_test(2),
+                                                call.test_tear_down(2),
+                                                call.list_enter(3),
+                                                call.list_setup(3),
+                                                call.test_setup(4),
+                                                call.test_test(4),
+                                                call.test_tear_down(4),
+                                                call.list_tear_down(3),
+                                                call.list_exit(3),
+                                                call.test_setup(5),
+                                                call.test_test(5),
+                                                call.test_tear_down(5),
+                                                call.list_tear_down(1),
+                                                call.list_exit(1)])
+
+    def test_list_scope_torn_down_on_abort(self):
+        self.sequencer.retry_type = FixateTC.RT_ABORT
+        self.sequencer.load(FixateTL([ListScopedLst([LstSetupFail([SubclassOfFixateTest(2, self.mock)],
+                                                                  2, self.mock)], 1, self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.sequencer.status, "Aborted")
+        self.mock.list_tear_down.assert_has_calls([call(2), call(1)])
+        self.mock.list_exit.assert_has_calls([call(2), call(1)])
+        self.mock.test_test.assert_not_called()
+
+    def test_list_set_up_fails(self):
+        self.sequencer.load(FixateTL([ListScopedSetupFail([SubclassOfFixateTest(2, self.mock),
+                                                           ListScopedLst([SubclassOfFixateTest(4, self.mock)],
+                                                                         3, self.mock)], 1, self.mock),
+                                      SubclassOfFixateTest(5, self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.sequencer.status, "Finished")
+        self.assertEqual((self.sequencer.tests_errored, self.sequencer.tests_passed), (2, 1))
+        self.assertEqual(self.mock.mock_calls, [call.list_enter(1),
+                                                call.list_setup(1),
+                                                call.list_tear_down(1),
+                                                call.list_enter(3),
+                                                call.list_exit(3),
+                                                call.list_exit(1),
+                                                call.test_setup(5),
+                                                call.test_test(5),
+                                                call.test_tear_down(5)])
+
+    def test_list_set_up_retried(self):
+        self.sequencer.retry_type = FixateTC.RT_RETRY
+        self.sequencer.load(FixateTL([ListScopedSetupFail([SubclassOfFixateTest(2, self.mock)], 1, self.mock)]))
+        with unittest.mock.patch("fixate.sequencer.user_retry_abort_fail",
+                                 side_effect=[("Result", "RETRY"), ("Result", "FAIL")]) as prompt:
+            self.sequencer.run_sequence()
+        self.assertEqual(prompt.call_count, 2)
+        self.assertEqual(self.mock.list_setup.call_count, 2)
+        self.assertEqual(self.sequencer.tests_errored, 1)
+        self.assertEqual(self.mock.list_tear_down.call_count, 2)
+
+
+class ListScopedSetupFail(LstSetupFail):
+    scope = FixateTL.SCOPE_LIST
+
+
+class FlakyTest(FixateTC):
+    """
+    Fails every second time it is run
+    """
+
+    def __init__(self, mock_obj):
+        super().__init__()
+        self.mock = mock_obj
+        self.runs = 0
+
+    def set_up(self):
+        self.mock.set_up()
+
+    def test(self):
+        from fixate.core.checks import chk_true
+        self.runs += 1
+        chk_true(self.runs % 2 == 1, description="Flaky")
+
+
+class TestLoopMode(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = FixateTC.RT_FAIL
+        self.mock = MagicMock()
+        self.loops = []
+        self.updates = []
+        pub.subscribe(self.on_loop_complete, "Loop_Complete")
+        pub.subscribe(self.on_sequence_update, "Sequence_Update")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_loop_complete, "Loop_Complete")
+        pub.unsubscribe(self.on_sequence_update, "Sequence_Update")
+
+    def on_loop_complete(self, iteration, statistics):
+        self.loops.append((iteration, statistics))
+
+    def on_sequence_update(self, status):
+        self.updates.append(status)
+
+    def test_loops_reuse_loaded_tests(self):
+        flaky = FlakyTest(self.mock)
+        self.sequencer.context_data["serial_number"] = "1234"
+        self.sequencer.load(FixateTL([flaky, SubclassOfFixateTest(2, self.mock)]))
+        self.sequencer.run_loops(4)
+        self.assertEqual(flaky.runs, 4)
+        self.assertEqual(self.mock.test_test.call_count, 4)
+        self.assertEqual([iteration for iteration, _ in self.loops], [1, 2, 3, 4])
+        statistics = self.loops[-1][1]
+        self.assertEqual(statistics["iterations"], 4)
+        self.assertEqual(statistics["end_statuses"], {"PASSED": 2, "FAILED": 2})
+        self.assertEqual(statistics["tests"], {"1": {"PASS": 2, "FAIL": 2}, "2": {"PASS": 4}})
+        self.assertEqual(statistics["duration"]["count"], 4)
+        # Counters are reset each loop, context data is kept
+        self.assertEqual(self.sequencer.tests_passed, 1)
+        self.assertEqual(self.sequencer.context_data["serial_number"], "1234")
+        self.assertEqual(self.sequencer.context_data["loop_iteration"], 4)
+        self.assertEqual(self.updates.count("Restart"), 3)
+
+    def test_abort_stops_loops(self):
+        self.sequencer.retry_type = FixateTC.RT_ABORT
+        self.sequencer.load(FixateTL([FlakyTest(self.mock)]))
+        self.sequencer.run_loops(-1)
+        self.assertEqual(len(self.loops), 2)
+        self.assertEqual(self.sequencer.status, "Aborted")
+
+
+class MultiCheckTest(FixateTC):
+    """
+    Test with several failing checks
+    """
+
+    def __init__(self, mock_obj, defer=False):
+        super().__init__()
+        self.mock = mock_obj
+        self.defer_check_failures = defer
+
+    def tear_down(self):
+        self.mock.tear_down()
+
+    def test(self):
+        from fixate.core.checks import chk_true
+        chk_true(False, description="First")
+        chk_true(True, description="Second")
+        chk_true(False, description="Third")
+        self.mock.test_end()
+
+
+class TestDeferredCheckFailures(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        self.sequencer.retry_type = FixateTC.RT_FAIL
+        self.mock = MagicMock()
+        self.checks = []
+        self.statuses = []
+        pub.subscribe(self.on_check, "Check")
+        pub.subscribe(self.on_test_complete, "Test_Complete")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_check, "Check")
+        pub.unsubscribe(self.on_test_complete, "Test_Complete")
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def on_check(self, passes, chk, chk_cnt, context):
+        self.checks.append((chk.description, passes))
+
+    def on_test_complete(self, data, test_index, status):
+        self.statuses.append(status)
+
+    def test_fails_on_first_check(self):
+        self.sequencer.load(FixateTL([MultiCheckTest(self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.checks, [("First", False)])
+        self.mock.test_end.assert_not_called()
+
+    def test_per_test(self):
+        self.sequencer.load(FixateTL([MultiCheckTest(self.mock, defer=True), MultiCheckTest(self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.checks, [("First", False), ("Second", True), ("Third", False), ("First", False)])
+        self.assertEqual(self.statuses, ["FAIL", "FAIL"])
+        self.assertEqual(self.mock.test_end.call_count, 1)
+        self.assertEqual(self.mock.tear_down.call_count, 2)
+        self.assertEqual(self.sequencer.end_status, "FAILED")
+
+    def test_per_sequence_with_retry(self):
+        self.sequencer.retry_type = FixateTC.RT_RETRY
+        self.sequencer.defer_check_failures = True
+        test = MultiCheckTest(self.mock)
+        test.attempts = 2
+        self.sequencer.load(FixateTL([test]))
+        with unittest.mock.patch("fixate.sequencer.user_retry_abort_fail", return_value=("Result", "FAIL")):
+            self.sequencer.run_sequence()
+        self.assertEqual(len(self.checks), 6)
+        self.assertEqual(self.mock.test_end.call_count, 2)
+        self.assertEqual(self.statuses, ["FAIL"])
+
+
+    def test_list_set_up(self):
+        self.sequencer.defer_check_failures = True
+        self.sequencer.load(FixateTL([CheckingSetupLst([MultiCheckTest(self.mock)], 1, self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.checks, [("Set up", False)])
+        self.assertEqual(self.statuses, ["ERROR"])
+        self.mock.test_end.assert_not_called()
+        self.mock.list_tear_down.assert_called_once_with(1)
+        self.assertEqual(self.sequencer.end_status, "ERROR")
+
+
+class CheckingSetupLst(ListScopedLst):
+    def set_up(self):
+        from fixate.core.checks import chk_true
+        super().set_up()
+        chk_true(False, description="Set up")
+
+
+class ResourceTest(FixateTC):
+    """
+    Test that holds its resources for a period of time
+    """
+
+    def __init__(self, name, duration, resources, log):
+        super().__init__()
+        self.name = name
+        self.duration = duration
+        self.resources = resources
+        self.log = log
+
+    def test(self):
+        from fixate.core.checks import chk_true
+        self.log.append(("start", self.name))
+        time.sleep(self.duration)
+        self.log.append(("end", self.name))
+        chk_true(True, description=self.name)
+
+
+class TestConcurrentTestList(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = Sequencer()
+        fixate.config.RESOURCES["SEQUENCER"] = self.sequencer
+        self.log = []
+        self.messages = []
+        pub.subscribe(self.on_test_start, "Test_Start")
+        pub.subscribe(self.on_check, "Check")
+        pub.subscribe(self.on_test_complete, "Test_Complete")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_test_start, "Test_Start")
+        pub.unsubscribe(self.on_check, "Check")
+        pub.unsubscribe(self.on_test_complete, "Test_Complete")
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def on_test_start(self, data, test_index):
+        self.messages.append(("start", test_index))
+
+    def on_check(self, passes, chk, chk_cnt, context):
+        self.messages.append(("check", context, chk.description))
+
+    def on_test_complete(self, data, test_index, status):
+        self.messages.append(("complete", test_index, status, self.sequencer.chk_pass))
+
+    def test_resources_are_not_shared(self):
+        from fixate.core.common import ConcurrentTestList
+        self.sequencer.load(ConcurrentTestList([ResourceTest("soak", 0.2, ["pps"], self.log),
+                                                ResourceTest("dmm1", 0.05, ["dmm"], self.log),
+                                                ResourceTest("dmm2", 0.05, ["dmm"], self.log)]))
+        start = time.perf_counter()
+        self.sequencer.run_sequence()
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual(self.log.index(("end", "dmm1")) + 1, self.log.index(("start", "dmm2")))
+        self.assertLess(self.log.index(("end", "dmm2")), self.log.index(("end", "soak")))
+        self.assertEqual(self.sequencer.tests_passed, 3)
+        self.assertEqual(self.sequencer.end_status, "PASSED")
+
+    def test_messages_in_test_order(self):
+        from fixate.core.common import ConcurrentTestList
+        self.sequencer.load(FixateTL([ConcurrentTestList([ResourceTest("slow", 0.1, [], self.log),
+                                                          ResourceTest("fast", 0.0, [], self.log)])]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.messages, [("start", "1.1"),
+                                         ("check", "1.1", "slow"),
+                                         ("complete", "1.1", "PASS", 1),
+                                         ("start", "1.2"),
+                                         ("check", "1.2", "fast"),
+                                         ("complete", "1.2", "PASS", 1)])
+
+
+class AsyncTest(FixateTC):
+    """
+    Test with coroutine hooks
+    """
+
+    def __init__(self, mock_obj):
+        super().__init__()
+        self.mock = mock_obj
+
+    async def set_up(self):
+        await asyncio.sleep(0)
+        self.mock.test_setup()
+
+    async def test(self):
+        from fixate.core.checks import chk_true
+        results = await asyncio.gather(asyncio.sleep(0.1, True), asyncio.sleep(0.1, True))
+        chk_true(all(results), description="gathered")
+        self.mock.test_test()
+
+    async def tear_down(self):
+        self.mock.test_tear_down()
+
+
+class TestAsyncTests(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.sequencer = Sequencer()
+        fixate.config.RESOURCES["SEQUENCER"] = self.sequencer
+        self.mock = MagicMock()
+        self.sequencer.load(FixateTL([AsyncTest(self.mock), SubclassOfFixateTest(2, self.mock)]))
+
+    def tearDown(self):
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+
+    def assert_ran(self):
+        self.mock.assert_has_calls([call.test_setup(), call.test_test(), call.test_tear_down(),
+                                    call.test_setup(2), call.test_test(2), call.test_tear_down(2)])
+        self.assertEqual(self.sequencer.tests_passed, 2)
+
+    def test_private_loop(self):
+        start = time.perf_counter()
+        self.sequencer.run_sequence()
+        self.assertLess(time.perf_counter() - start, 0.19)
+        self.assert_ran()
+
+    def test_running_loop(self):
+        loop = asyncio.new_event_loop()
+        self.sequencer.loop = loop
+        loop.run_until_complete(loop.run_in_executor(None, self.sequencer.run_sequence))
+        loop.close()
+        self.assert_ran()
+
+
+class HangingTest(FixateTC):
+    """
+    Test that hangs on its first attempt
+    """
+    timeout = 0.1
+    attempts = 2
+
+    def __init__(self, mock_obj):
+        super().__init__()
+        self.mock = mock_obj
+
+    def test(self):
+        self.mock.test_test()
+        while self.mock.test_test.call_count < 2:
+            time.sleep(0.01)
+
+    def tear_down(self):
+        self.mock.test_tear_down()
+
+
+class AsyncHangingTest(FixateTC):
+    """
+    Coroutine test that hangs
+    """
+    timeout = 0.2
+
+    def __init__(self, mock_obj):
+        super().__init__()
+        self.mock = mock_obj
+
+    async def test(self):
+        self.mock.test_test()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            self.mock.cancelled()
+            raise
+
+    def tear_down(self):
+        self.mock.test_tear_down()
+
+
+class TestTimeouts(unittest.TestCase):
+    def setUp(self):
+        from fixate.sequencer import Sequencer
+        self.sequencer = Sequencer()
+        self.sequencer.retry_type = FixateTC.RT_FAIL
+        self.mock = MagicMock()
+        self.statuses = []
+        pub.subscribe(self.on_test_complete, "Test_Complete")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_test_complete, "Test_Complete")
+
+    def on_test_complete(self, data, test_index, status):
+        self.statuses.append(status)
+
+    def test_timeout_status_and_tear_down(self):
+        self.sequencer.load(FixateTL([HangingTest(self.mock), SubclassOfFixateTest(2, self.mock)]))
+        start = time.perf_counter()
+        self.sequencer.run_sequence()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(self.statuses, ["TIMEOUT", "PASS"])
+        self.mock.test_tear_down.assert_has_calls([call(), call(2)])
+        self.mock.test_test.assert_has_calls([call(), call(2)])
+        self.assertEqual(self.sequencer.end_status, "ERROR")
+
+    def test_timeout_retry(self):
+        self.sequencer.retry_type = FixateTC.RT_RETRY
+        self.sequencer.load(FixateTL([HangingTest(self.mock)]))
+        self.sequencer.run_sequence()
+        self.assertEqual(self.statuses, ["PASS"])
+        self.assertEqual(self.mock.test_tear_down.call_count, 2)
+
+    def assert_async_timeout(self, run):
+        self.sequencer.load(FixateTL([AsyncHangingTest(self.mock), SubclassOfFixateTest(2, self.mock)]))
+        start = time.perf_counter()
+        run()
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual(self.statuses, ["TIMEOUT", "PASS"])
+        self.mock.cancelled.assert_called_once_with()
+        self.mock.test_tear_down.assert_has_calls([call(), call(2)])
+
+    def test_async_timeout_private_loop(self):
+        self.assert_async_timeout(self.sequencer.run_sequence)
+
+    def test_async_timeout_running_loop(self):
+        loop = asyncio.new_event_loop()
+        self.sequencer.loop = loop
+        try:
+            self.assert_async_timeout(
+                lambda: loop.run_until_complete(loop.run_in_executor(None, self.sequencer.run_sequence)))
+        finally:
+            loop.close()
+
+    def test_list_timeout(self):
+        test_list = FixateTL([HangingTest(self.mock)])
+        test_list.timeout = 0.05
+        self.sequencer.load(test_list)
+        self.sequencer.context.push(test_list)
+        self.assertEqual(self.sequencer.test_timeout(), 0.05)
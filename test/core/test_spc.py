@@ -0,0 +1,118 @@
+import os
+import statistics
+import tempfile
+import unittest
+from pubsub import pub
+import fixate.config
+from fixate.core.common import TestList, TestClass
+from fixate.core.checks import CheckClass, chk_in_range, chk_log_value, _in_tolerance, _smaller_or_equal, \
+    _outside_range
+from fixate.core.spc import SpcMonitor, CheckStatistics, capability, check_limits
+from fixate.core.statistics import RunningStatistics
+from fixate.sequencer import Sequencer
+
+
+class RailTest(TestClass):
+    """
+    Measures the rail
+    """
+
+    def __init__(self, values):
+        super().__init__()
+        self.values = values
+
+    def test(self):
+        chk_in_range(self.values.pop(0), 4.0, 6.0, description="5V rail")
+        chk_log_value("not a number", description="Label")
+
+
+class TestCheckStatistics(unittest.TestCase):
+    def test_cpk(self):
+        values = [4.9, 5.0, 5.1, 5.0, 4.95, 5.05]
+        stats = CheckStatistics()
+        for value in values:
+            stats.add(value, 4.0, 6.0)
+        expected = min(6.0 - statistics.mean(values), statistics.mean(values) - 4.0) / (3 * statistics.stdev(values))
+        self.assertAlmostEqual(stats.cpk, expected)
+
+    def test_capability(self):
+        self.assertIsNone(capability(5.0, 0.1))
+        self.assertIsNone(capability(5.0, 0.0, 4.0, 6.0))
+        self.assertAlmostEqual(capability(5.0, 0.1, upper=5.3), 1.0)
+        self.assertAlmostEqual(capability(5.0, 0.1, lower=4.4, upper=5.3), 1.0)
+
+    def test_check_limits(self):
+        self.assertEqual(check_limits(CheckClass(_in_tolerance, 5, nominal=10, tol=5)), (9.5, 10.5))
+        self.assertEqual(check_limits(CheckClass(_smaller_or_equal, 5, nominal=10)), (None, 10))
+        self.assertEqual(check_limits(CheckClass(_outside_range, 5, _min=1, _max=2)), (None, None))
+
+    def test_summary_round_trip(self):
+        stats = CheckStatistics()
+        for value in [1.0, 2.0, 4.0]:
+            stats.add(value, 0.0, 10.0)
+        restored = CheckStatistics.from_summary(stats.summary())
+        restored.add(3.0, 0.0, 10.0)
+        stats.add(3.0, 0.0, 10.0)
+        self.assertEqual(restored.summary(), stats.summary())
+        self.assertEqual(RunningStatistics.from_summary(stats.values.summary()).count, 4)
+
+
+class TestSpcMonitor(unittest.TestCase):
+    def setUp(self):
+        self.drifts = []
+        pub.subscribe(self.on_drift, "SPC_Drift")
+
+    def tearDown(self):
+        pub.unsubscribe(self.on_drift, "SPC_Drift")
+
+    def on_drift(self, test_index, description, cpk, mean, lower, upper):
+        self.drifts.append((test_index, description, cpk, mean))
+
+    def test_drift(self):
+        monitor = SpcMonitor(min_cpk=1.33, min_count=10)
+        for index in range(20):
+            self.assertFalse(monitor.record("1", "rail", 5.0 + (-0.01 if index % 2 else 0.01), 4.0, 6.0))
+        self.assertEqual(self.drifts, [])
+        # The measurement creeps towards the upper limit
+        value = 5.0
+        drifting = []
+        for index in range(40):
+            value += 0.025
+            drifting.append(monitor.record("1", "rail", value + (-0.01 if index % 2 else 0.01), 4.0, 6.0))
+        self.assertTrue(drifting[-1])
+        self.assertEqual(len(self.drifts), 1)
+        self.assertEqual(self.drifts[0][:2], ("1", "rail"))
+        self.assertLess(self.drifts[0][2], 1.33)
+
+    def test_min_count(self):
+        monitor = SpcMonitor(min_count=10)
+        for value in [5.9, 5.8, 5.95]:
+            self.assertFalse(monitor.record("1", "rail", value, 4.0, 6.0))
+
+    def test_listens_to_checks(self):
+        default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        monitor = SpcMonitor()
+        monitor.register()
+        try:
+            values = [5.0, 5.2, 4.9]
+            sequencer.load(TestList([RailTest(values), RailTest(values), RailTest(values)]))
+            sequencer.run_sequence()
+        finally:
+            monitor.unregister()
+            fixate.config.RESOURCES["SEQUENCER"] = default_sequencer
+        self.assertEqual(sorted(monitor.checks), [("1", "5V rail"), ("2", "5V rail"), ("3", "5V rail")])
+        stats = monitor.checks[("2", "5V rail")]
+        self.assertEqual((stats.values.count, stats.values.mean, stats.lower, stats.upper), (1, 5.2, 4.0, 6.0))
+
+    def test_save_load(self):
+        monitor = SpcMonitor()
+        for value in [5.0, 5.1, 4.9]:
+            monitor.record("2.1", "rail", value, 4.0, 6.0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spc.json")
+            monitor.save(path)
+            loaded = SpcMonitor.load(path)
+        stats = loaded.checks[("2.1", "rail")]
+        self.assertEqual(stats.values.count, 3)
+        self.assertAlmostEqual(stats.cpk, monitor.checks[("2.1", "rail")].cpk)
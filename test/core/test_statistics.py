@@ -0,0 +1,34 @@
+import statistics
+import unittest
+from fixate.core.statistics import RunningStatistics, LoopStatistics
+
+
+class TestRunningStatistics(unittest.TestCase):
+    def test_matches_batch(self):
+        values = [1.5, 2.0, -3.25, 8.0, 4.5]
+        stats = RunningStatistics()
+        for value in values:
+            stats.add(value)
+        self.assertEqual(stats.count, 5)
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.std_dev, statistics.stdev(values))
+        self.assertEqual((stats.min, stats.max), (-3.25, 8.0))
+
+    def test_single_value(self):
+        stats = RunningStatistics()
+        stats.add(3)
+        self.assertEqual(stats.summary(), {"count": 1, "mean": 3, "std_dev": 0.0, "min": 3, "max": 3})
+
+
+class TestLoopStatistics(unittest.TestCase):
+    def test_summary(self):
+        stats = LoopStatistics()
+        stats.add_test("1", "PASS")
+        stats.add_iteration("PASSED", 2.0)
+        stats.add_test("1", "FAIL")
+        stats.add_iteration("FAILED", 4.0)
+        summary = stats.summary()
+        self.assertEqual(summary["iterations"], 2)
+        self.assertEqual(summary["end_statuses"], {"PASSED": 1, "FAILED": 1})
+        self.assertEqual(summary["tests"], {"1": {"PASS": 1, "FAIL": 1}})
+        self.assertEqual(summary["duration"]["mean"], 3.0)
@@ -0,0 +1,122 @@
+import copy
+import threading
+import time
+import unittest
+from fixate.drivers import DriverManager, Driver
+from fixate.drivers.pps.helper import PPS, Channel, Measure
+
+
+class SlowDriver:
+    is_connected = True
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.value = None
+
+    def measure(self):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        self.active -= 1
+        return self.value
+
+    def disconnect(self):
+        self.is_connected = False
+
+
+class SlowMeasure(Measure):
+    def __init__(self, driver):
+        self.driver = driver
+
+    def voltage(self):
+        return self.driver.measure()
+
+
+class SlowChannel(Channel):
+    def __init__(self, driver):
+        super().__init__()
+        self.driver = driver
+        self.measure = SlowMeasure(driver)
+        self.output = None
+
+    def voltage(self, value):
+        self.driver.value = value
+        self.driver.measure()
+
+    def _call(self, value):
+        self.output = value
+        self.driver.measure()
+
+
+class SlowPPS(PPS):
+    def __init__(self):
+        super().__init__(None)
+        self.driver = SlowDriver()
+        self.channel1 = SlowChannel(self.driver)
+        self.is_connected = True
+
+
+class TestDriverManagerLocking(unittest.TestCase):
+    def setUp(self):
+        self.dm = DriverManager(dmm=SlowDriver(), pps=SlowDriver())
+
+    def run_threads(self, target, n=4):
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_unlocked_returns_driver(self):
+        self.assertIs(self.dm.dmm, self.dm.drivers["dmm"])
+
+    def test_locked_calls_are_serialised(self):
+        self.dm.locking = True
+        self.run_threads(self.dm.dmm.measure)
+        self.assertEqual(self.dm.drivers["dmm"].max_active, 1)
+
+    def test_locked_attribute_access(self):
+        self.dm.locking = True
+        self.dm.pps.value = 5
+        self.assertEqual(self.dm.pps.value, 5)
+        self.assertEqual(self.dm.pps.measure(), 5)
+
+    def test_locked_channels(self):
+        pps = SlowPPS()
+        self.dm.add_drivers(pps=pps)
+        self.dm.locking = True
+        self.dm.pps.channel1.voltage(5)
+        self.dm.pps.channel1(True)
+        self.assertEqual((pps.driver.value, pps.channel1.output), (5, True))
+        self.assertEqual(self.dm.pps.channel1.measure.voltage(), 5)
+        self.run_threads(lambda: self.dm.pps.channel1.voltage(6))
+        self.run_threads(self.dm.pps.channel1.measure.voltage)
+        self.run_threads(lambda: self.dm.pps.channel1(False))
+        self.assertEqual(pps.driver.max_active, 1)
+
+    def test_lock_context_manager(self):
+        self.dm.locking = True
+        with self.dm.lock("pps", "dmm"):
+            thread = threading.Thread(target=self.dm.dmm.measure)
+            thread.start()
+            thread.join(0.05)
+            self.assertTrue(thread.is_alive())
+        thread.join()
+        self.assertFalse(thread.is_alive())
+
+    def test_remove_driver_removes_lock(self):
+        self.dm.remove_drivers("dmm")
+        self.assertNotIn("dmm", self.dm._locks)
+
+
+class TestDriverManagerCopy(unittest.TestCase):
+    def test_deepcopy_shares_drivers(self):
+        dm = DriverManager(dmm=SlowDriver(), pps=Driver())
+        dm.locking = True
+        test = {"dm": dm, "pps": dm.drivers["pps"], "dmm": dm.dmm, "settings": [1, 2]}
+        copied = copy.deepcopy(test)
+        self.assertIs(copied["dm"], dm)
+        self.assertIs(copied["pps"], dm.drivers["pps"])
+        self.assertIs(copied["dmm"], test["dmm"])
+        self.assertIsNot(copied["settings"], test["settings"])
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, call, patch
+import fixate.config
+from fixate.core.common import TestClass, TestList, LazyTestList
+from fixate.core.checks import chk_fails
+from fixate.core.exceptions import SequenceAbort
+from fixate.reporting.checkpoint import register_checkpoint, unregister_checkpoint, resume_sequence, read_journal
+from fixate.sequencer import Sequencer
+
+
+class RecordTest(TestClass):
+    """
+    Records that it ran
+    """
+
+    def __init__(self, num, mock_obj, crash=False, fail=False):
+        super().__init__()
+        self.num = num
+        self.mock = mock_obj
+        self.crash = crash
+        self.fail = fail
+
+    def test(self):
+        self.mock.test(self.num)
+        if self.fail:
+            chk_fails("Out of range")
+        if self.crash:
+            raise SequenceAbort("USB glitch")
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.default_path = fixate.config.checkpoint_path
+        self.tmp = tempfile.TemporaryDirectory()
+        fixate.config.checkpoint_path = os.path.join(self.tmp.name, "checkpoint.jsonl")
+        register_checkpoint()
+
+    def tearDown(self):
+        unregister_checkpoint()
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+        fixate.config.checkpoint_path = self.default_path
+        self.tmp.cleanup()
+
+    def new_sequencer(self, mock_obj, crash=False):
+        sequencer = Sequencer()
+        sequencer.retry_type = TestClass.RT_ABORT
+        fixate.config.RESOURCES["SEQUENCER"] = sequencer
+        sequencer.context_data["index"] = "default"
+        sequencer.load(TestList([RecordTest(1, mock_obj),
+                                 TestList([RecordTest(2, mock_obj), RecordTest(3, mock_obj, crash)]),
+                                 RecordTest(4, mock_obj)]))
+        return sequencer
+
+    def test_resume_after_abort(self):
+        first_run = MagicMock()
+        sequencer = self.new_sequencer(first_run, crash=True)
+        sequencer.context_data["operator"] = "A"
+        sequencer.run_sequence()
+        self.assertEqual(sequencer.status, "Aborted")
+        self.assertEqual([entry["level"] for entry in read_journal(sequencer)], ["1", "2.1"])
+        self.assertEqual(set(read_journal(sequencer)[0]), {"level", "status", "context_data"})
+
+        second_run = MagicMock()
+        sequencer = self.new_sequencer(second_run)
+        self.assertTrue(resume_sequence(sequencer))
+        self.assertEqual(sequencer.levels(), "2.2")
+        self.assertEqual(sequencer.tests_passed, 2)
+        self.assertEqual(sequencer.context_data["operator"], "A")
+        sequencer.run_sequence()
+        second_run.assert_has_calls([call.test(3), call.test(4)])
+        self.assertEqual(second_run.test.call_count, 2)
+        self.assertEqual(sequencer.tests_passed, 4)
+        self.assertFalse(os.path.exists(fixate.config.checkpoint_path))
+
+    @patch("fixate.sequencer.user_retry_abort_fail")
+    def test_resume_after_failed_test(self, retry_prompt):
+        def new_sequencer(mock_obj, crash=False):
+            sequencer = Sequencer()
+            fixate.config.RESOURCES["SEQUENCER"] = sequencer
+            sequencer.load(TestList([RecordTest(1, mock_obj, fail=True),
+                                     RecordTest(2, mock_obj, crash),
+                                     RecordTest(3, mock_obj)]))
+            return sequencer
+
+        # Fail test 1 from the retry prompt, then abort on test 2
+        retry_prompt.side_effect = [("Result", "FAIL"), ("Result", "ABORT")]
+        sequencer = new_sequencer(MagicMock(), crash=True)
+        sequencer.run_sequence()
+        self.assertEqual(sequencer.status, "Aborted")
+        self.assertEqual([entry["status"] for entry in read_journal(sequencer)], ["FAIL"])
+
+        sequencer = new_sequencer(MagicMock())
+        self.assertTrue(resume_sequence(sequencer))
+        self.assertEqual((sequencer.tests_passed, sequencer.tests_failed), (0, 1))
+        sequencer.run_sequence()
+        self.assertEqual((sequencer.tests_passed, sequencer.tests_failed), (2, 1))
+        self.assertEqual(sequencer.end_status, "FAILED")
+
+    def test_no_journal(self):
+        sequencer = self.new_sequencer(MagicMock())
+        self.assertFalse(resume_sequence(sequencer))
+        self.assertFalse(sequencer.resumed)
+
+    def test_different_index(self):
+        sequencer = self.new_sequencer(MagicMock(), crash=True)
+        sequencer.run_sequence()
+        sequencer = self.new_sequencer(MagicMock())
+        sequencer.context_data["index"] = "other"
+        with self.assertRaises(ValueError):
+            resume_sequence(sequencer)
+
+    def test_resume_in_lazy_test_list(self):
+        def new_sequencer(mock_obj, crash=False):
+            sequencer = Sequencer()
+            sequencer.retry_type = TestClass.RT_ABORT
+            fixate.config.RESOURCES["SEQUENCER"] = sequencer
+            sequencer.load(TestList([RecordTest(1, mock_obj),
+                                     LazyTestList(lambda: (RecordTest(num, mock_obj, crash and num == 4)
+                                                           for num in range(2, 6)), length_hint=4),
+                                     RecordTest(6, mock_obj)]))
+            return sequencer
+
+        sequencer = new_sequencer(MagicMock(), crash=True)
+        sequencer.run_sequence()
+        self.assertEqual([entry["level"] for entry in read_journal(sequencer)], ["1", "2.1", "2.2"])
+
+        second_run = MagicMock()
+        sequencer = new_sequencer(second_run)
+        self.assertTrue(resume_sequence(sequencer))
+        self.assertEqual(sequencer.levels(), "2.3")
+        sequencer.run_sequence()
+        second_run.assert_has_calls([call.test(4), call.test(5), call.test(6)])
+        self.assertEqual(second_run.test.call_count, 3)
+        self.assertEqual(sequencer.tests_passed, 6)
@@ -0,0 +1,41 @@
+import json
+import os
+import tempfile
+import unittest
+import fixate.config
+from fixate.core.common import TestList, TestClass
+from fixate.reporting.profile import register_profile, unregister_profile
+from fixate.sequencer import Sequencer
+
+
+class QuickTest(TestClass):
+    """
+    Does nothing
+    """
+
+    def test(self):
+        pass
+
+
+class TestProfileReport(unittest.TestCase):
+    def setUp(self):
+        self.default_sequencer = fixate.config.RESOURCES["SEQUENCER"]
+        self.default_path = fixate.config.profile_path
+        self.tmp = tempfile.TemporaryDirectory()
+        fixate.config.profile_path = os.path.join(self.tmp.name, "profile.json")
+        register_profile()
+
+    def tearDown(self):
+        unregister_profile()
+        fixate.config.RESOURCES["SEQUENCER"] = self.default_sequencer
+        fixate.config.profile_path = self.default_path
+        self.tmp.cleanup()
+
+    def test_profile_written(self):
+        sequencer = fixate.config.RESOURCES["SEQUENCER"] = Sequencer()
+        sequencer.load(TestList([QuickTest(), QuickTest()]))
+        sequencer.run_sequence()
+        with open(fixate.config.profile_path) as f:
+            summary = json.load(f)
+        self.assertEqual(sorted(summary["tests"]), ["1", "2"])
+        self.assertEqual(summary["tests"]["1"]["attempts"], 1)